@@ -1,25 +1,54 @@
 """Analytics API routes for MineContext-v2."""
 
+import asyncio
+import threading
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Set
 
-from fastapi import APIRouter, HTTPException, Query
+import numpy as np
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from loguru import logger
-from pydantic import BaseModel
-
+from pydantic import BaseModel, ConfigDict, model_validator
+
+from backend.cache import (
+    CURRENT_TTL_SECONDS,
+    PAST_TTL_SECONDS,
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    make_etag,
+    response_cache,
+)
+from backend.database import db
 from backend.services.activity_analyzer import activity_analyzer
+from backend.utils.date_utils import parse_ymd
+
+router = APIRouter(default_response_class=ORJSONResponse)
 
-router = APIRouter()
+# Dates whose aggregation is currently scheduled or running
+_aggregations_in_progress: Set[str] = set()
+_aggregations_lock = threading.Lock()
 
 
 class TimeRangeRequest(BaseModel):
     """Request model for time range analysis."""
-    start_time: str
-    end_time: str
+    model_config = ConfigDict(frozen=True)
+
+    start_time: datetime
+    end_time: datetime
+
+    @model_validator(mode="after")
+    def _check_order(self) -> "TimeRangeRequest":
+        """Ensure the range is not empty."""
+        if self.start_time >= self.end_time:
+            raise ValueError("start_time must be before end_time")
+        return self
 
 
 class TimeRangeResponse(BaseModel):
     """Response model for time range analysis."""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     period: dict
     statistics: dict
     activity_breakdown: dict
@@ -31,6 +60,8 @@ class TimeRangeResponse(BaseModel):
 
 class WorkPatternsResponse(BaseModel):
     """Response model for work patterns."""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     analysis_period_days: int
     most_productive_hours: list
     most_used_apps: dict
@@ -50,25 +81,14 @@ async def analyze_time_range(request: TimeRangeRequest):
         Comprehensive activity statistics
     """
     try:
-        start_time = datetime.fromisoformat(request.start_time)
-        end_time = datetime.fromisoformat(request.end_time)
-
-        if start_time >= end_time:
-            raise HTTPException(
-                status_code=400,
-                detail="start_time must be before end_time"
-            )
-
-        # Analyze the time range
-        result = activity_analyzer.analyze_time_range(start_time, end_time)
+        # Parsing and ordering are validated by TimeRangeRequest
+        result = await asyncio.to_thread(
+            activity_analyzer.analyze_time_range, request.start_time, request.end_time
+        )
 
-        return TimeRangeResponse(**result)
+        # Analyzer output is trusted, so skip validation on construction
+        return TimeRangeResponse.model_construct(**result)
 
-    except ValueError as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid datetime format: {str(e)}"
-        )
     except Exception as e:
         logger.error(f"Error analyzing time range: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -76,23 +96,51 @@ async def analyze_time_range(request: TimeRangeRequest):
 
 @router.get("/analytics/daily")
 async def get_daily_analytics(
+    request: Request,
+    response: Response,
     date: Optional[str] = Query(default=None, description="Date in YYYY-MM-DD format")
 ):
     """Get analytics for a specific day.
 
+    Past days carry an ETag built from the day's current screenshot rows,
+    so repeated requests with If-None-Match get an empty 304 response
+    until screenshots of that day are analyzed or deleted.
+
     Args:
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for caching headers)
         date: Date string (YYYY-MM-DD). Defaults to today.
 
     Returns:
         Daily analytics summary
     """
     try:
-        if date:
-            target_date = datetime.strptime(date, "%Y-%m-%d")
-        else:
-            target_date = datetime.now()
-
-        result = activity_analyzer.get_daily_summary(target_date)
+        now = datetime.now()
+        target_date = parse_ymd(date) if date else now
+        date_iso = target_date.strftime("%Y-%m-%d")
+
+        # Past days rarely change, so they can be cached much longer
+        is_past = target_date.date() < now.date()
+
+        cache_key = f"analytics:daily:{date_iso}"
+        etag = None
+        if is_past:
+            # Key on the day's live row state, so analyzing or deleting its
+            # screenshots yields a new cache entry and ETag
+            fingerprint = await asyncio.to_thread(db.get_day_fingerprint, target_date)
+            cache_key += ":" + ":".join(str(part) for part in fingerprint)
+            etag = make_etag(cache_key)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
+        result = response_cache.get(cache_key)
+        if result is None:
+            result = await asyncio.to_thread(activity_analyzer.get_daily_summary_cached, target_date)
+            response_cache.set(cache_key, result, PAST_TTL_SECONDS if is_past else CURRENT_TTL_SECONDS)
+
+        if etag:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
 
         return result
 
@@ -119,14 +167,23 @@ async def get_weekly_analytics(
         Weekly analytics summary
     """
     try:
+        now = datetime.now()
         if start_date:
-            target_date = datetime.strptime(start_date, "%Y-%m-%d")
+            target_date = parse_ymd(start_date)
         else:
             # Default to start of current week (Monday)
-            today = datetime.now()
-            target_date = today - timedelta(days=today.weekday())
+            target_date = now - timedelta(days=now.weekday())
+
+        cache_key = f"analytics:weekly:{target_date.strftime('%Y-%m-%d')}"
+        result = response_cache.get(cache_key)
+        if result is not None:
+            return result
 
-        result = activity_analyzer.get_weekly_summary(target_date)
+        result = await asyncio.to_thread(activity_analyzer.get_weekly_summary, target_date)
+
+        week_end = (target_date + timedelta(days=7)).date()
+        ttl = PAST_TTL_SECONDS if week_end <= now.date() else CURRENT_TTL_SECONDS
+        response_cache.set(cache_key, result, ttl)
 
         return result
 
@@ -153,9 +210,13 @@ async def get_work_patterns(
         Work pattern insights
     """
     try:
-        result = activity_analyzer.identify_work_patterns(days)
+        cache_key = f"analytics:work-patterns:{days}"
+        result = response_cache.get(cache_key)
+        if result is None:
+            result = await asyncio.to_thread(activity_analyzer.identify_work_patterns, days)
+            response_cache.set(cache_key, result, CURRENT_TTL_SECONDS)
 
-        return WorkPatternsResponse(**result)
+        return WorkPatternsResponse.model_construct(**result)
 
     except Exception as e:
         logger.error(f"Error getting work patterns: {e}")
@@ -177,24 +238,33 @@ async def get_productivity_trend(
     try:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
+        dates = [(start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
 
-        daily_scores = []
-
-        for i in range(days):
-            date = start_date + timedelta(days=i)
-            summary = activity_analyzer.get_daily_summary(date)
+        # One batched fetch for the whole range instead of one per day
+        summaries = await asyncio.to_thread(
+            activity_analyzer.get_daily_summaries_range,
+            start_date,
+            start_date + timedelta(days=days - 1)
+        )
 
+        daily_scores = []
+        for date_str in dates:
+            summary = summaries.get(date_str)
             daily_scores.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "productivity_score": summary["productivity_score"],
-                "total_screenshots": summary["statistics"]["total_screenshots"],
-                "work_sessions": summary["statistics"]["work_sessions"]
+                "date": date_str,
+                "productivity_score": summary["productivity_score"] if summary else 0.0,
+                "total_screenshots": summary["statistics"]["total_screenshots"] if summary else 0,
+                "work_sessions": summary["statistics"]["work_sessions"] if summary else 0
             })
 
+        scores = np.fromiter(
+            (d["productivity_score"] for d in daily_scores), dtype=np.float64, count=days
+        )
+
         return {
             "period_days": days,
             "daily_scores": daily_scores,
-            "average_score": sum(d["productivity_score"] for d in daily_scores) / days if days > 0 else 0
+            "average_score": float(scores.mean()) if days > 0 else 0
         }
 
     except Exception as e:
@@ -202,32 +272,84 @@ async def get_productivity_trend(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analytics/aggregate-daily")
+def _invalidate_day(date: str) -> None:
+    """Drop every cached analytics result that covers a day.
+
+    Clears both the response cache and the analyzer's memoized daily
+    summary, which are keyed on the same normalized date.
+
+    Args:
+        date: Normalized date string (YYYY-MM-DD)
+    """
+    day = parse_ymd(date)
+    activity_analyzer.forget_daily_summary(date)
+    response_cache.delete(f"analytics:daily:{date}")
+    response_cache.delete_prefix(f"analytics:daily:{date}:")
+    # A week starting up to seven days earlier includes this day
+    for offset in range(8):
+        week_start = day - timedelta(days=offset)
+        response_cache.delete(f"analytics:weekly:{week_start.strftime('%Y-%m-%d')}")
+    response_cache.delete_prefix("analytics:work-patterns:")
+
+
+def _aggregate_in_background(date: str) -> None:
+    """Aggregate a day's activities and drop its cached analytics.
+
+    Args:
+        date: Normalized date string (YYYY-MM-DD)
+    """
+    try:
+        if activity_analyzer.aggregate_daily_activities(date):
+            _invalidate_day(date)
+        else:
+            logger.error(f"Failed to aggregate activities for {date}")
+    finally:
+        with _aggregations_lock:
+            _aggregations_in_progress.discard(date)
+
+
+@router.post("/analytics/aggregate-daily", status_code=202)
 async def aggregate_daily_activities(
+    background_tasks: BackgroundTasks,
     date: str = Query(..., description="Date to aggregate (YYYY-MM-DD)")
 ):
-    """Aggregate and store daily activity summaries.
+    """Schedule aggregation of daily activity summaries.
+
+    Aggregation runs as a background task after the response is sent.
+    Concurrent requests for a date that is already being aggregated
+    are not scheduled again.
 
     Args:
+        background_tasks: FastAPI background task queue
         date: Date string (YYYY-MM-DD)
 
     Returns:
-        Success status
+        Acceptance status
     """
     try:
-        success = activity_analyzer.aggregate_daily_activities(date)
+        # Cache keys and the in-progress set use the normalized form
+        date = parse_ymd(date).strftime("%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid date format. Use YYYY-MM-DD"
+        )
 
-        if success:
-            return {
-                "success": True,
-                "message": f"Activities aggregated for {date}"
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to aggregate activities"
-            )
+    with _aggregations_lock:
+        already_running = date in _aggregations_in_progress
+        _aggregations_in_progress.add(date)
 
-    except Exception as e:
-        logger.error(f"Error aggregating daily activities: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if already_running:
+        return {
+            "accepted": True,
+            "date": date,
+            "message": f"Aggregation already in progress for {date}"
+        }
+
+    background_tasks.add_task(_aggregate_in_background, date)
+
+    return {
+        "accepted": True,
+        "date": date,
+        "message": f"Aggregation scheduled for {date}"
+    }
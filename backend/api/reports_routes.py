@@ -1,16 +1,20 @@
 """Reports API routes for MineContext-v2."""
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 from pydantic import BaseModel
 
+from backend.cache import IMMUTABLE_CACHE_CONTROL, etag_matches, make_etag
 from backend.database import db
 from backend.services.report_generator import report_generator
+from backend.utils.date_utils import parse_ymd
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class ReportResponse(BaseModel):
@@ -21,15 +25,6 @@ class ReportResponse(BaseModel):
     cached: bool = False
 
 
-class ReportListItem(BaseModel):
-    """Report list item."""
-    id: int
-    report_type: str
-    period_start: str
-    period_end: str
-    generated_at: str
-
-
 @router.post("/reports/daily", response_model=ReportResponse)
 async def generate_daily_report(
     date: Optional[str] = Query(default=None, description="Date in YYYY-MM-DD format")
@@ -43,17 +38,15 @@ async def generate_daily_report(
         Generated report in Markdown format
     """
     try:
-        if date:
-            target_date = datetime.strptime(date, "%Y-%m-%d")
-        else:
-            target_date = datetime.now()
+        now = datetime.now()
+        target_date = parse_ymd(date) if date else now
 
         result = await report_generator.generate_daily_report(target_date)
 
         return ReportResponse(
             report_id=result.get("report_id"),
             content=result["content"],
-            generated_at=result.get("generated_at", datetime.now().isoformat()),
+            generated_at=result.get("generated_at") or now.isoformat(),
             cached=result.get("cached", False)
         )
 
@@ -80,19 +73,19 @@ async def generate_weekly_report(
         Generated report in Markdown format
     """
     try:
+        now = datetime.now()
         if start_date:
-            target_date = datetime.strptime(start_date, "%Y-%m-%d")
+            target_date = parse_ymd(start_date)
         else:
             # Default to start of current week (Monday)
-            today = datetime.now()
-            target_date = today - timedelta(days=today.weekday())
+            target_date = now - timedelta(days=now.weekday())
 
         result = await report_generator.generate_weekly_report(target_date)
 
         return ReportResponse(
             report_id=result.get("report_id"),
             content=result["content"],
-            generated_at=result.get("generated_at", datetime.now().isoformat()),
+            generated_at=result.get("generated_at") or now.isoformat(),
             cached=result.get("cached", False)
         )
 
@@ -123,17 +116,9 @@ async def list_reports(
     try:
         reports = db.get_reports(report_type=report_type, limit=limit)
 
+        # Rows are already shaped as list items by the query
         return {
-            "reports": [
-                ReportListItem(
-                    id=r["id"],
-                    report_type=r["report_type"],
-                    period_start=r["period_start"],
-                    period_end=r["period_end"],
-                    generated_at=r["generated_at"]
-                )
-                for r in reports
-            ],
+            "reports": reports,
             "total": len(reports)
         }
 
@@ -143,38 +128,42 @@ async def list_reports(
 
 
 @router.get("/reports/{report_id}")
-async def get_report(report_id: int):
+async def get_report(report_id: int, request: Request, response: Response):
     """Get a specific report by ID.
 
+    Reports never change once generated, so the response carries an ETag
+    and repeated requests with If-None-Match get an empty 304 response.
+
     Args:
         report_id: Report ID
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for caching headers)
 
     Returns:
         Report content and metadata
     """
     try:
-        # Query database directly for specific report
-        from backend.database import db
+        report = await asyncio.to_thread(db.get_report_by_id, report_id)
 
-        with db._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM generated_reports WHERE id = ?", (report_id,))
-            row = cursor.fetchone()
+        if not report:
+            raise HTTPException(status_code=404, detail="Report not found")
 
-            if not row:
-                raise HTTPException(status_code=404, detail="Report not found")
+        etag = make_etag(report["id"], report["generated_at"])
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
 
-            report = dict(row)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
 
-            return {
-                "id": report["id"],
-                "report_type": report["report_type"],
-                "period_start": report["period_start"],
-                "period_end": report["period_end"],
-                "content": report["content"],
-                "generated_at": report["generated_at"],
-                "metadata": report.get("metadata")
-            }
+        return {
+            "id": report["id"],
+            "report_type": report["report_type"],
+            "period_start": report["period_start"],
+            "period_end": report["period_end"],
+            "content": report["content"],
+            "generated_at": report["generated_at"],
+            "metadata": report["metadata"]
+        }
 
     except HTTPException:
         raise
@@ -194,18 +183,15 @@ async def delete_report(report_id: int):
         Success status
     """
     try:
-        with db._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM generated_reports WHERE id = ?", (report_id,))
-            conn.commit()
-
-            if cursor.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Report not found")
-
-            return {
-                "success": True,
-                "message": f"Report {report_id} deleted successfully"
-            }
+        deleted = await asyncio.to_thread(db.delete_report, report_id)
+
+        if not deleted:
+            raise HTTPException(status_code=404, detail="Report not found")
+
+        return {
+            "success": True,
+            "message": f"Report {report_id} deleted successfully"
+        }
 
     except HTTPException:
         raise
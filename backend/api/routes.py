@@ -1,12 +1,21 @@
 """API routes for MineContext-v2."""
 
+import asyncio
+import base64
+import binascii
+import json
 import os
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Query
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
+from pydantic import TypeAdapter
 
 from backend.api.schemas import (
     AnalyzeResponse,
@@ -30,56 +39,220 @@ from backend.api.schemas import (
     SimilarScreenshotResponse,
     TimelineResponse,
 )
+from backend.cache import etag_matches, make_etag
 from backend.capture import capture_service
 from backend.config import settings
-from backend.database import db
+from backend.database import TIMESTAMP_FORMAT, db
 from backend.models import ScreenshotUpdate
+from backend.services.context_resurfacing import context_resurfacing_service
+from backend.services.todo_extractor import todo_extractor
+from backend.utils.ai_utils import (
+    analyze_screenshot_async,
+    categorize_activity,
+    extract_tags_from_description,
+)
+from backend.utils.date_utils import parse_ymd
+from backend.utils.embedding_utils import embedding_service
+from backend.vector_store import vector_store
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Validate whole result lists in one pydantic-core call instead of per row
+_SCREENSHOT_LIST = TypeAdapter(List[ScreenshotResponse])
+_SIMILAR_LIST = TypeAdapter(List[SimilarScreenshotResponse])
+_TIMELINE_LIST = TypeAdapter(List[TimelineResponse])
+
+# Opt-in list representation: one array per ScreenshotResponse field instead of one object per row
+COLUMNAR_MEDIA_TYPE = "application/vnd.minecontext.columnar+json"
+_COLUMNAR_FIELDS = tuple(ScreenshotResponse.model_fields)
+
+# Serialized capture status with the capture_service.state_version it was built from
+_capture_status_cache: Optional[Tuple[int, bytes]] = None
+
+
+def _json_response(body, etag: Optional[str] = None) -> Response:
+    """Wrap JSON already serialized by pydantic-core, skipping FastAPI's re-encoding.
+
+    Args:
+        body: Serialized JSON (str or bytes)
+        etag: ETag to send with the response (optional)
+
+    Returns:
+        JSON response
+    """
+    headers = {"ETag": etag} if etag else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _wants_columnar(request: Request) -> bool:
+    """Check whether the client asked for the columnar screenshot list.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        True if the Accept header names the columnar media type
+    """
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _columnar_response(
+    screenshots: list,
+    total: int,
+    limit: int,
+    offset: int,
+    next_cursor: Optional[str],
+    etag: Optional[str] = None,
+) -> Response:
+    """Serialize a screenshot page as parallel per-field arrays.
+
+    Rows are trusted database models, so each column is read straight off
+    them and the whole page is encoded in one orjson call, with no
+    per-row response objects.
 
-router = APIRouter()
+    Args:
+        screenshots: Screenshots of the page
+        total: Total number of matching screenshots
+        limit: Page size
+        offset: Page offset
+        next_cursor: Cursor for the next page (optional)
+        etag: ETag to send with the response (optional)
+
+    Returns:
+        Columnar JSON response
+    """
+    body = {
+        "columns": {
+            field: [getattr(screenshot, field) for screenshot in screenshots]
+            for field in _COLUMNAR_FIELDS
+        },
+        "count": len(screenshots),
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }
+    headers = {"Vary": "Accept"}
+    if etag:
+        headers["ETag"] = etag
+    return Response(content=orjson.dumps(body), media_type=COLUMNAR_MEDIA_TYPE, headers=headers)
 
 
 # Screenshot endpoints
+def _encode_cursor(screenshot) -> str:
+    """Build an opaque keyset cursor pointing after a screenshot.
+
+    Args:
+        screenshot: Last screenshot of the current page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{screenshot.timestamp.strftime(TIMESTAMP_FORMAT)}|{screenshot.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a keyset cursor produced by _encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple of (timestamp, id)
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, screenshot_id = raw.rsplit("|", 1)
+        return datetime.strptime(timestamp, TIMESTAMP_FORMAT), int(screenshot_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
 @router.get("/screenshots", response_model=ScreenshotsListResponse)
-async def list_screenshots(
+def list_screenshots(
+    request: Request,
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
     start_date: Optional[str] = Query(default=None),
     end_date: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None, description="Cursor from a previous page"),
 ):
-    """List all screenshots with pagination."""
+    """List all screenshots with pagination.
+
+    Pass the ``next_cursor`` of a page as ``after`` to fetch the next one;
+    keyset pages stay fast however deep the listing goes, unlike ``offset``.
+    Responses carry an ETag, and an unchanged page is answered with 304.
+    Clients sending ``Accept: application/vnd.minecontext.columnar+json``
+    get the page as one array per field instead of one object per row.
+    """
+    after_key = _decode_cursor(after) if after else None
+    if offset and not after_key:
+        logger.warning("Offset pagination is deprecated, use the 'after' cursor instead")
+
+    columnar = _wants_columnar(request)
+    etag = make_etag(
+        "screenshots", db.get_screenshots_version(),
+        limit, offset, start_date, end_date, after, columnar,
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     try:
         # Parse dates if provided
         start_dt = datetime.fromisoformat(start_date) if start_date else None
         end_dt = datetime.fromisoformat(end_date) if end_date else None
 
-        screenshots = db.get_screenshots(
-            limit=limit, offset=offset, start_date=start_dt, end_date=end_dt
+        screenshots, total = db.get_screenshots_with_total(
+            limit=limit,
+            offset=offset,
+            start_date=start_dt,
+            end_date=end_dt,
+            after=after_key,
         )
-        total = db.get_total_screenshots()
 
-        return ScreenshotsListResponse(
-            screenshots=[ScreenshotResponse.model_validate(s) for s in screenshots],
+        next_cursor = _encode_cursor(screenshots[-1]) if len(screenshots) == limit else None
+        if columnar:
+            return _columnar_response(screenshots, total, limit, offset, next_cursor, etag)
+
+        page = ScreenshotsListResponse(
+            screenshots=_SCREENSHOT_LIST.validate_python(screenshots, from_attributes=True),
             total=total,
             limit=limit,
             offset=offset,
+            next_cursor=next_cursor,
         )
+        response = _json_response(page.model_dump_json(), etag)
+        response.headers["Vary"] = "Accept"
+        return response
     except Exception as e:
         logger.error(f"Error listing screenshots: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/screenshots/{screenshot_id}", response_model=ScreenshotResponse)
-async def get_screenshot(screenshot_id: int):
-    """Get a specific screenshot by ID."""
+def get_screenshot(screenshot_id: int, request: Request, response: Response):
+    """Get a specific screenshot by ID.
+
+    Responses carry an ETag, and an unchanged screenshot is answered with 304.
+    """
+    etag = make_etag("screenshot", screenshot_id, db.get_screenshots_version())
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     screenshot = db.get_screenshot(screenshot_id)
     if not screenshot:
         raise HTTPException(status_code=404, detail="Screenshot not found")
 
+    response.headers["ETag"] = etag
     return ScreenshotResponse.model_validate(screenshot)
 
 
 @router.patch("/screenshots/{screenshot_id}", response_model=ScreenshotResponse)
-async def update_screenshot(screenshot_id: int, update: ScreenshotUpdateRequest):
+def update_screenshot(screenshot_id: int, update: ScreenshotUpdateRequest):
     """Update screenshot metadata."""
     try:
         screenshot_update = ScreenshotUpdate(
@@ -99,21 +272,20 @@ async def update_screenshot(screenshot_id: int, update: ScreenshotUpdateRequest)
 
 
 @router.delete("/screenshots/{screenshot_id}", response_model=ScreenshotDeleteResponse)
-async def delete_screenshot(screenshot_id: int):
+def delete_screenshot(screenshot_id: int):
     """Delete a screenshot."""
     try:
-        # Get screenshot to find file path
-        screenshot = db.get_screenshot(screenshot_id)
-        if not screenshot:
+        # Delete from database, getting the file path back in the same statement
+        filepath = db.delete_screenshot_returning_path(screenshot_id)
+        if filepath is None:
             raise HTTPException(status_code=404, detail="Screenshot not found")
 
-        # Delete from database
-        db.delete_screenshot(screenshot_id)
-
-        # Delete file if it exists
-        if os.path.exists(screenshot.filepath):
-            os.remove(screenshot.filepath)
-            logger.info(f"Deleted screenshot file: {screenshot.filepath}")
+        # Delete file if it exists (no separate stat before the unlink)
+        try:
+            os.remove(filepath)
+            logger.info(f"Deleted screenshot file: {filepath}")
+        except FileNotFoundError:
+            pass
 
         return ScreenshotDeleteResponse(
             success=True, message=f"Screenshot {screenshot_id} deleted successfully"
@@ -126,15 +298,28 @@ async def delete_screenshot(screenshot_id: int):
 
 
 @router.post("/screenshots/search", response_model=ScreenshotsListResponse)
-async def search_screenshots(search_request: ScreenshotSearchRequest):
-    """Search screenshots by query, date range, or tags."""
+def search_screenshots(search_request: ScreenshotSearchRequest, request: Request):
+    """Search screenshots by query, date range, or tags.
+
+    Like the list endpoint, results come back columnar when the client
+    accepts ``application/vnd.minecontext.columnar+json``.
+    """
+    after_key = _decode_cursor(search_request.after) if search_request.after else None
+
     try:
-        if search_request.query:
-            # Text search in description/tags
+        query = search_request.query.strip() if search_request.query else None
+        tags = search_request.tags.strip() if search_request.tags else None
+
+        if query or tags:
+            # Text and tag search through the FTS and tag indexes
             screenshots = db.search_screenshots(
-                query=search_request.query,
+                query=query,
+                tag=tags,
+                start_date=search_request.start_date,
+                end_date=search_request.end_date,
                 limit=search_request.limit,
                 offset=search_request.offset,
+                after=after_key,
             )
         else:
             # Date range filter
@@ -143,79 +328,87 @@ async def search_screenshots(search_request: ScreenshotSearchRequest):
                 offset=search_request.offset,
                 start_date=search_request.start_date,
                 end_date=search_request.end_date,
+                after=after_key,
             )
 
-        # Additional filtering by tags if provided
-        if search_request.tags:
-            tag_filter = search_request.tags.lower()
-            screenshots = [
-                s
-                for s in screenshots
-                if s.tags and tag_filter in s.tags.lower()
-            ]
+        next_cursor = (
+            _encode_cursor(screenshots[-1])
+            if len(screenshots) == search_request.limit
+            else None
+        )
+
+        if _wants_columnar(request):
+            return _columnar_response(
+                screenshots,
+                len(screenshots),
+                search_request.limit,
+                search_request.offset,
+                next_cursor,
+            )
 
-        return ScreenshotsListResponse(
-            screenshots=[ScreenshotResponse.model_validate(s) for s in screenshots],
+        page = ScreenshotsListResponse(
+            screenshots=_SCREENSHOT_LIST.validate_python(screenshots, from_attributes=True),
             total=len(screenshots),
             limit=search_request.limit,
             offset=search_request.offset,
+            next_cursor=next_cursor,
         )
+        return _json_response(page.model_dump_json())
     except Exception as e:
         logger.error(f"Error searching screenshots: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/timeline", response_model=List[TimelineResponse])
-async def get_timeline(
+def get_timeline(
+    request: Request,
     date: Optional[str] = Query(default=None, description="Date in YYYY-MM-DD format"),
     limit: int = Query(default=100, ge=1, le=1000),
 ):
-    """Get timeline view of screenshots grouped by date."""
+    """Get timeline view of screenshots grouped by date.
+
+    Responses carry an ETag, and an unchanged timeline is answered with 304.
+    """
+    etag = make_etag("timeline", db.get_screenshots_version(), date, limit)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     try:
         if date:
             # Get screenshots for specific date
-            start_dt = datetime.fromisoformat(date)
-            end_dt = datetime.fromisoformat(date).replace(
-                hour=23, minute=59, second=59
-            )
-            screenshots = db.get_screenshots(
-                limit=limit, start_date=start_dt, end_date=end_dt
-            )
+            screenshots = db.get_screenshots_for_day(parse_ymd(date), limit=limit)
 
-            return [
+            timeline = [
                 TimelineResponse(
-                    screenshots=[
-                        ScreenshotResponse.model_validate(s) for s in screenshots
-                    ],
+                    screenshots=_SCREENSHOT_LIST.validate_python(screenshots, from_attributes=True),
                     date=date,
                     count=len(screenshots),
                 )
             ]
+            return _json_response(_TIMELINE_LIST.dump_json(timeline), etag)
         else:
-            # Get recent screenshots grouped by date
-            screenshots = db.get_screenshots(limit=limit)
-
-            # Group by date
-            timeline_dict = {}
-            for screenshot in screenshots:
-                date_str = screenshot.timestamp.strftime("%Y-%m-%d")
-                if date_str not in timeline_dict:
-                    timeline_dict[date_str] = []
-                timeline_dict[date_str].append(screenshot)
-
-            # Create timeline responses
-            timeline = [
-                TimelineResponse(
-                    screenshots=[
-                        ScreenshotResponse.model_validate(s) for s in screenshots_list
-                    ],
-                    date=date_str,
-                    count=len(screenshots_list),
+            # Rows arrive ordered by day, so each run of equal days is one group
+            rows = db.get_timeline_rows(limit=limit)
+
+            # Validate the flat list once, then slice it per day
+            validated = _SCREENSHOT_LIST.validate_python(
+                [screenshot for _, screenshot in rows], from_attributes=True
+            )
+
+            timeline = []
+            start = 0
+            for day, group in groupby(rows, key=itemgetter(0)):
+                count = sum(1 for _ in group)
+                timeline.append(
+                    TimelineResponse(
+                        screenshots=validated[start:start + count],
+                        date=day,
+                        count=count,
+                    )
                 )
-                for date_str, screenshots_list in timeline_dict.items()
-            ]
+                start += count
 
-            return timeline
+            return _json_response(_TIMELINE_LIST.dump_json(timeline), etag)
     except Exception as e:
         logger.error(f"Error getting timeline: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -234,7 +427,7 @@ async def start_capture(request: CaptureStartRequest = None):
             )
 
         # TODO: Support interval override if provided in request
-        capture_service.start()
+        await capture_service.start()
         logger.info("Screenshot capture started via API")
 
         return CaptureStartResponse(
@@ -259,7 +452,7 @@ async def stop_capture():
             )
 
         screenshots_captured = capture_service.screenshots_captured
-        capture_service.stop()
+        await capture_service.stop()
         logger.info("Screenshot capture stopped via API")
 
         return CaptureStopResponse(
@@ -273,10 +466,21 @@ async def stop_capture():
 
 
 @router.get("/capture/status", response_model=CaptureStatusResponse)
-async def get_capture_status():
-    """Get current capture service status."""
+def get_capture_status():
+    """Get current capture service status.
+
+    The serialized status is reused until the capture service reports a
+    state change, so frequent polling does not rebuild the response.
+    """
+    global _capture_status_cache
     try:
-        return CaptureStatusResponse(**capture_service.get_status())
+        # Read the version before the status so a concurrent change is never cached as current
+        version = capture_service.state_version
+        cached = _capture_status_cache
+        if cached is None or cached[0] != version:
+            body = CaptureStatusResponse(**capture_service.get_status()).model_dump_json()
+            cached = _capture_status_cache = (version, body.encode())
+        return _json_response(cached[1])
     except Exception as e:
         logger.error(f"Error getting capture status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -286,7 +490,7 @@ async def get_capture_status():
 async def capture_now():
     """Capture a screenshot immediately (manual capture)."""
     try:
-        screenshot_id = capture_service.capture_now()
+        screenshot_id = await capture_service.capture_now()
 
         if screenshot_id:
             return CaptureNowResponse(
@@ -335,13 +539,6 @@ async def analyze_screenshot(screenshot_id: int, force_reanalysis: bool = False)
                 error=None,
             )
 
-        # Import AI utilities
-        from backend.utils.ai_utils import (
-            analyze_screenshot_async,
-            categorize_activity,
-            extract_tags_from_description,
-        )
-
         # Perform AI analysis
         success, result, error = await analyze_screenshot_async(screenshot.filepath)
 
@@ -371,22 +568,9 @@ async def analyze_screenshot(screenshot_id: int, force_reanalysis: bool = False)
         if activity_category not in ai_tags.lower():
             ai_tags = f"{activity_category}, {ai_tags}" if ai_tags else activity_category
 
-        # Update screenshot in database
-        screenshot_update = ScreenshotUpdate(
-            description=description,
-            tags=ai_tags,
-            analyzed=True
-        )
-        updated_screenshot = db.update_screenshot(screenshot_id, screenshot_update)
-
-        # Create activity record
-        from backend.models import ActivityCreate
-        activity = ActivityCreate(
-            screenshot_id=screenshot_id,
-            activity_type=activity_category,
-            content=description
-        )
-        db.create_activity(activity)
+        # Update screenshot and create its activity record in one transaction,
+        # without re-reading either row
+        db.save_analysis_results([(screenshot_id, description, ai_tags, activity_category)])
 
         logger.info(f"Screenshot {screenshot_id} analyzed successfully")
 
@@ -404,9 +588,184 @@ async def analyze_screenshot(screenshot_id: int, force_reanalysis: bool = False)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Number of streamed batch results buffered before they are written to the database
+_ANALYSIS_FLUSH_SIZE = 16
+
+
+def _embed_analyses(analyses) -> Tuple[List[int], Optional[str]]:
+    """Add embeddings for analyzed screenshots (blocking; runs in a worker thread).
+
+    Args:
+        analyses: List of (screenshot, description, tags, activity category)
+
+    Returns:
+        Tuple of (IDs of screenshots whose embedding was stored, model name)
+    """
+    embedded_ids = []
+    model_name = None
+    try:
+        if not (embedding_service.is_available() and vector_store.is_available()):
+            return embedded_ids, model_name
+
+        model_name = embedding_service.model_name
+
+        for screenshot, description, ai_tags, _ in analyses:
+            embedding = embedding_service.generate_embedding(description)
+            if embedding is not None and vector_store.add_embedding(
+                screenshot_id=screenshot.id,
+                embedding=embedding,
+                description=description,
+                tags=ai_tags,
+                timestamp=screenshot.timestamp
+            ):
+                embedded_ids.append(screenshot.id)
+                logger.debug(f"Auto-generated embedding for screenshot {screenshot.id}")
+    except Exception as embed_error:
+        logger.error(f"Error auto-generating embedding: {embed_error}")
+
+    return embedded_ids, model_name
+
+
+async def _flush_analyses(analyses) -> None:
+    """Embed (if enabled) and store a group of analysis results in one transaction.
+
+    Args:
+        analyses: List of (screenshot, description, tags, activity category)
+    """
+    if not analyses:
+        return
+
+    # Auto-generate embeddings if enabled
+    embedded_ids, embedding_model = [], None
+    if settings.embeddings.enabled and settings.embeddings.auto_generate:
+        embedded_ids, embedding_model = await asyncio.to_thread(_embed_analyses, analyses)
+
+    await asyncio.to_thread(
+        db.save_analysis_results,
+        [
+            (screenshot.id, description, ai_tags, activity_category)
+            for screenshot, description, ai_tags, activity_category in analyses
+        ],
+        embedded_ids,
+        embedding_model,
+    )
+    logger.info(f"Batch analysis: {len(analyses)} screenshots analyzed")
+
+
+async def _analyze_for_batch(screenshot, semaphore: asyncio.Semaphore):
+    """Analyze one screenshot, bounded by the semaphore.
+
+    Args:
+        screenshot: Screenshot to analyze
+        semaphore: Semaphore limiting concurrent AI requests
+
+    Returns:
+        Tuple of (screenshot, description, tags, activity category), or None on failure
+    """
+    async with semaphore:
+        # Perform AI analysis
+        success, result, error = await analyze_screenshot_async(screenshot.filepath)
+
+    if not success:
+        logger.error(f"Batch analysis: Screenshot {screenshot.id} failed: {error}")
+        return None
+
+    # Extract information
+    description = result.get("description", "")
+    activity_type = result.get("activity", "")
+    ai_tags = result.get("tags", "")
+
+    # Categorize activity
+    activity_category = categorize_activity(description, activity_type)
+
+    # Generate tags if needed
+    if not ai_tags:
+        tag_list = extract_tags_from_description(description)
+        ai_tags = ", ".join(tag_list)
+
+    if activity_category not in ai_tags.lower():
+        ai_tags = f"{activity_category}, {ai_tags}" if ai_tags else activity_category
+
+    return screenshot, description, ai_tags, activity_category
+
+
+async def _analyze_stream(unanalyzed) -> AsyncIterator[str]:
+    """Analyze screenshots concurrently, yielding one SSE event per result.
+
+    Events arrive in completion order; a final event carries the totals.
+    Results are written in groups of _ANALYSIS_FLUSH_SIZE, and results
+    already reported are still written if the client disconnects.
+
+    Args:
+        unanalyzed: Screenshots to analyze
+
+    Yields:
+        Server-Sent Event strings
+    """
+    semaphore = asyncio.Semaphore(settings.ai.concurrency)
+
+    async def _analyze_tracked(screenshot):
+        """Analyze one screenshot, keeping it paired with its outcome."""
+        try:
+            return screenshot, await _analyze_for_batch(screenshot, semaphore), None
+        except Exception as e:
+            logger.error(f"Batch analysis: Error processing screenshot {screenshot.id}: {e}")
+            return screenshot, None, str(e)
+
+    tasks = [asyncio.ensure_future(_analyze_tracked(screenshot)) for screenshot in unanalyzed]
+    pending = []
+    analyzed_count = 0
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            screenshot, analysis, error = await next_done
+
+            event = {"screenshot_id": screenshot.id, "status": "ok"}
+            if analysis is None:
+                event["status"] = "failed"
+                if error:
+                    event["error"] = error
+            else:
+                pending.append(analysis)
+                analyzed_count += 1
+
+            if len(pending) >= _ANALYSIS_FLUSH_SIZE:
+                await _flush_analyses(pending)
+                pending = []
+
+            yield f"data: {json.dumps(event)}\n\n"
+
+        await _flush_analyses(pending)
+        pending = []
+
+        summary = {
+            "done": True,
+            "success": True,
+            "analyzed_count": analyzed_count,
+            "failed_count": len(unanalyzed) - analyzed_count,
+            "total_processed": len(unanalyzed),
+        }
+        yield f"data: {json.dumps(summary)}\n\n"
+    finally:
+        # Stops outstanding model calls if the client disconnects mid-stream
+        for task in tasks:
+            task.cancel()
+        if pending:
+            # These were already reported as "ok"; store them even if the stream is cancelled
+            await asyncio.shield(_flush_analyses(pending))
+
+
 @router.post("/screenshots/analyze-batch")
-async def analyze_screenshots_batch(limit: int = Query(default=10, ge=1, le=100)):
-    """Analyze multiple unanalyzed screenshots in batch."""
+async def analyze_screenshots_batch(
+    request: Request,
+    limit: int = Query(default=10, ge=1, le=100)
+):
+    """Analyze multiple unanalyzed screenshots in batch.
+
+    Clients sending ``Accept: text/event-stream`` get one Server-Sent Event
+    per screenshot as it completes, followed by a summary event; other
+    clients get a single JSON summary once the batch is done.
+    """
     try:
         # Check if AI is enabled
         if not settings.ai.enabled:
@@ -416,8 +775,14 @@ async def analyze_screenshots_batch(limit: int = Query(default=10, ge=1, le=100)
             )
 
         # Get unanalyzed screenshots
-        all_screenshots = db.get_screenshots(limit=limit)
-        unanalyzed = [s for s in all_screenshots if not s.analyzed]
+        unanalyzed = db.get_unanalyzed_screenshots(limit=limit)
+
+        if "text/event-stream" in request.headers.get("accept", ""):
+            return StreamingResponse(
+                _analyze_stream(unanalyzed),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"},
+            )
 
         if not unanalyzed:
             return {
@@ -427,89 +792,24 @@ async def analyze_screenshots_batch(limit: int = Query(default=10, ge=1, le=100)
                 "failed_count": 0,
             }
 
-        # Import AI utilities
-        from backend.utils.ai_utils import (
-            analyze_screenshot_async,
-            categorize_activity,
-            extract_tags_from_description,
+        semaphore = asyncio.Semaphore(settings.ai.concurrency)
+        results = await asyncio.gather(
+            *(_analyze_for_batch(screenshot, semaphore) for screenshot in unanalyzed),
+            return_exceptions=True
         )
 
-        analyzed_count = 0
-        failed_count = 0
-
-        for screenshot in unanalyzed:
-            try:
-                # Perform AI analysis
-                success, result, error = await analyze_screenshot_async(screenshot.filepath)
-
-                if success:
-                    # Extract information
-                    description = result.get("description", "")
-                    activity_type = result.get("activity", "")
-                    ai_tags = result.get("tags", "")
-
-                    # Categorize activity
-                    activity_category = categorize_activity(description, activity_type)
-
-                    # Generate tags if needed
-                    if not ai_tags:
-                        tag_list = extract_tags_from_description(description)
-                        ai_tags = ", ".join(tag_list)
+        analyses = []
+        for screenshot, outcome in zip(unanalyzed, results):
+            if isinstance(outcome, Exception):
+                logger.error(f"Batch analysis: Error processing screenshot {screenshot.id}: {outcome}")
+            elif outcome is not None:
+                analyses.append(outcome)
 
-                    if activity_category not in ai_tags.lower():
-                        ai_tags = f"{activity_category}, {ai_tags}" if ai_tags else activity_category
+        # Write every result in one transaction
+        await _flush_analyses(analyses)
 
-                    # Update screenshot
-                    screenshot_update = ScreenshotUpdate(
-                        description=description,
-                        tags=ai_tags,
-                        analyzed=True
-                    )
-                    db.update_screenshot(screenshot.id, screenshot_update)
-
-                    # Create activity record
-                    from backend.models import ActivityCreate
-                    activity = ActivityCreate(
-                        screenshot_id=screenshot.id,
-                        activity_type=activity_category,
-                        content=description
-                    )
-                    db.create_activity(activity)
-
-                    analyzed_count += 1
-                    logger.info(f"Batch analysis: Screenshot {screenshot.id} analyzed")
-
-                    # Auto-generate embedding if enabled
-                    if settings.embeddings.enabled and settings.embeddings.auto_generate:
-                        try:
-                            from backend.utils.embedding_utils import embedding_service
-                            from backend.vector_store import vector_store
-
-                            if embedding_service.is_available() and vector_store.is_available():
-                                embedding = embedding_service.generate_embedding(description)
-                                if embedding is not None:
-                                    vector_store.add_embedding(
-                                        screenshot_id=screenshot.id,
-                                        embedding=embedding,
-                                        description=description,
-                                        tags=ai_tags,
-                                        timestamp=screenshot.timestamp
-                                    )
-                                    db.mark_embedding_generated(
-                                        screenshot_id=screenshot.id,
-                                        model_name=embedding_service.model_name
-                                    )
-                                    logger.debug(f"Auto-generated embedding for screenshot {screenshot.id}")
-                        except Exception as embed_error:
-                            logger.error(f"Error auto-generating embedding: {embed_error}")
-
-                else:
-                    failed_count += 1
-                    logger.error(f"Batch analysis: Screenshot {screenshot.id} failed: {error}")
-
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Batch analysis: Error processing screenshot {screenshot.id}: {e}")
+        analyzed_count = len(analyses)
+        failed_count = len(unanalyzed) - analyzed_count
 
         return {
             "success": True,
@@ -531,8 +831,6 @@ async def analyze_screenshots_batch(limit: int = Query(default=10, ge=1, le=100)
 async def semantic_search(request: SemanticSearchRequest):
     """Search screenshots using semantic similarity."""
     try:
-        from backend.vector_store import vector_store
-
         # Check if vector store is available
         if not vector_store.is_available():
             raise HTTPException(
@@ -548,9 +846,7 @@ async def semantic_search(request: SemanticSearchRequest):
         )
 
         # Convert to response format
-        similar_screenshots = [
-            SimilarScreenshotResponse(**result) for result in results
-        ]
+        similar_screenshots = _SIMILAR_LIST.validate_python(results)
 
         return SemanticSearchResponse(
             query=request.query,
@@ -572,13 +868,6 @@ async def find_similar_screenshots(
 ):
     """Find screenshots similar to the given screenshot."""
     try:
-        from backend.vector_store import vector_store
-
-        # Check if screenshot exists
-        screenshot = db.get_screenshot(screenshot_id)
-        if not screenshot:
-            raise HTTPException(status_code=404, detail="Screenshot not found")
-
         # Check if vector store is available
         if not vector_store.is_available():
             raise HTTPException(
@@ -586,30 +875,24 @@ async def find_similar_screenshots(
                 detail="Semantic search is not available. Vector database may not be initialized."
             )
 
-        # Get the screenshot's embedding
+        # Get the screenshot's embedding (also tells us whether the screenshot exists)
         vector_data = vector_store.get_by_id(screenshot_id)
         if not vector_data:
             raise HTTPException(
                 status_code=404,
-                detail="No embedding found for this screenshot. Generate embeddings first."
+                detail="Screenshot not found or has no embedding. Generate embeddings first."
             )
 
         # Search for similar screenshots
         embedding = vector_data['embedding']
         similar_items = vector_store.search_similar(
             query_embedding=embedding,
-            top_k=top_k + 1,  # +1 to exclude self
-            min_similarity=settings.vector_db.similarity_threshold
+            top_k=top_k,
+            min_similarity=settings.vector_db.similarity_threshold,
+            exclude_ids={screenshot_id}
         )
 
-        # Filter out the screenshot itself
-        similar_screenshots = [
-            SimilarScreenshotResponse(**item)
-            for item in similar_items
-            if item['screenshot_id'] != screenshot_id
-        ]
-
-        return similar_screenshots[:top_k]
+        return _SIMILAR_LIST.validate_python(similar_items)
 
     except HTTPException:
         raise
@@ -625,8 +908,6 @@ async def get_related_contexts(
 ):
     """Get contextually related screenshots using the context resurfacing service."""
     try:
-        from backend.services.context_resurfacing import context_resurfacing_service
-
         # Check if screenshot exists
         screenshot = db.get_screenshot(screenshot_id)
         if not screenshot:
@@ -646,7 +927,7 @@ async def get_related_contexts(
         )
 
         # Convert to response format
-        return [SimilarScreenshotResponse(**r.model_dump()) for r in related]
+        return _SIMILAR_LIST.validate_python(related, from_attributes=True)
 
     except HTTPException:
         raise
@@ -659,9 +940,6 @@ async def get_related_contexts(
 async def generate_embeddings_batch(request: EmbeddingGenerationRequest):
     """Generate embeddings for screenshots in batch."""
     try:
-        from backend.utils.embedding_utils import embedding_service
-        from backend.vector_store import vector_store
-
         # Check if services are available
         if not embedding_service.is_available():
             raise HTTPException(
@@ -678,8 +956,7 @@ async def generate_embeddings_batch(request: EmbeddingGenerationRequest):
         # Determine which screenshots to process
         if request.screenshot_ids:
             # Process specific screenshot IDs
-            screenshots = [db.get_screenshot(sid) for sid in request.screenshot_ids]
-            screenshots = [s for s in screenshots if s is not None]
+            screenshots = db.get_screenshots_by_ids(request.screenshot_ids)
         elif request.all_unprocessed:
             # Process all unprocessed screenshots
             screenshots = db.get_screenshots_without_embeddings(limit=None)
@@ -720,38 +997,34 @@ async def generate_embeddings_batch(request: EmbeddingGenerationRequest):
             batch_size=batch_size
         )
 
-        # Store embeddings in vector store
+        # Embeddings are returned only for the texts that succeeded, in order
+        failed_set = set(failed_indices)
+        succeeded = [
+            screenshot
+            for i, screenshot in enumerate(valid_screenshots)
+            if i not in failed_set
+        ]
+        embedded = list(zip(succeeded, embeddings))
+
+        # Store all successful embeddings with one bulk vector store call
         processed_count = 0
-        failed_count = 0
-
-        for i, screenshot in enumerate(valid_screenshots):
-            if i in failed_indices:
-                failed_count += 1
-                continue
-
-            try:
-                # Add to vector store
-                success = vector_store.add_embedding(
-                    screenshot_id=screenshot.id,
-                    embedding=embeddings[i],
-                    description=screenshot.description,
-                    tags=screenshot.tags,
-                    timestamp=screenshot.timestamp
-                )
+        if embedded:
+            processed_count, _ = vector_store.add_embeddings_batch(
+                screenshot_ids=[screenshot.id for screenshot, _ in embedded],
+                embeddings=[embedding for _, embedding in embedded],
+                descriptions=[screenshot.description for screenshot, _ in embedded],
+                tags_list=[screenshot.tags for screenshot, _ in embedded],
+                timestamps=[screenshot.timestamp for screenshot, _ in embedded]
+            )
 
-                if success:
-                    # Mark in database
-                    db.mark_embedding_generated(
-                        screenshot_id=screenshot.id,
-                        model_name=embedding_service.model_name
-                    )
-                    processed_count += 1
-                else:
-                    failed_count += 1
+        if processed_count:
+            # Mark in database with a single statement
+            db.mark_embeddings_generated_batch(
+                [screenshot.id for screenshot, _ in embedded],
+                embedding_service.model_name
+            )
 
-            except Exception as e:
-                logger.error(f"Error storing embedding for screenshot {screenshot.id}: {e}")
-                failed_count += 1
+        failed_count = len(valid_screenshots) - processed_count
 
         return EmbeddingGenerationResponse(
             success=True,
@@ -768,7 +1041,7 @@ async def generate_embeddings_batch(request: EmbeddingGenerationRequest):
 
 
 @router.get("/embeddings/stats", response_model=EmbeddingStatsResponse)
-async def get_embedding_stats():
+def get_embedding_stats():
     """Get statistics about embedding generation."""
     try:
         stats = db.get_embedding_stats()
@@ -783,8 +1056,6 @@ async def get_embedding_stats():
 async def get_context_suggestions(request: ContextSuggestionsRequest):
     """Get proactive context suggestions based on current activity."""
     try:
-        from backend.services.context_resurfacing import context_resurfacing_service
-
         # Check if service is available
         if not context_resurfacing_service.is_available():
             raise HTTPException(
@@ -800,7 +1071,7 @@ async def get_context_suggestions(request: ContextSuggestionsRequest):
 
         # Convert to response format
         return ContextSuggestionsResponse(
-            suggestions=[SimilarScreenshotResponse(**s.model_dump()) for s in suggestions],
+            suggestions=_SIMILAR_LIST.validate_python(suggestions, from_attributes=True),
             count=len(suggestions)
         )
 
@@ -822,8 +1093,6 @@ async def extract_todos_from_screenshot(screenshot_id: int):
         Extraction results with found TODOs
     """
     try:
-        from backend.services.todo_extractor import todo_extractor
-
         # Check if screenshot exists
         screenshot = db.get_screenshot(screenshot_id)
         if not screenshot:
@@ -3,7 +3,10 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Response models are built from trusted data and never modified afterwards
+_RESPONSE_CONFIG = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
 
 
 # Request schemas
@@ -42,12 +45,15 @@ class ScreenshotSearchRequest(BaseModel):
     tags: Optional[str] = Field(None, description="Tag filter")
     limit: int = Field(default=100, ge=1, le=1000, description="Maximum results")
     offset: int = Field(default=0, ge=0, description="Pagination offset")
+    after: Optional[str] = Field(None, description="Keyset cursor from a previous page")
 
 
 # Response schemas
 class ScreenshotResponse(BaseModel):
     """Screenshot response."""
 
+    model_config = _RESPONSE_CONFIG
+
     id: int
     filepath: str
     timestamp: datetime
@@ -59,22 +65,24 @@ class ScreenshotResponse(BaseModel):
     analyzed: bool
     file_size: Optional[int]
 
-    class Config:
-        from_attributes = True
-
 
 class ScreenshotsListResponse(BaseModel):
     """List of screenshots response."""
 
+    model_config = _RESPONSE_CONFIG
+
     screenshots: List[ScreenshotResponse]
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class CaptureStatusResponse(BaseModel):
     """Capture service status response."""
 
+    model_config = _RESPONSE_CONFIG
+
     is_running: bool
     interval_seconds: int
     screenshots_captured: int
@@ -141,6 +149,8 @@ class HealthResponse(BaseModel):
 class TimelineResponse(BaseModel):
     """Timeline view response."""
 
+    model_config = _RESPONSE_CONFIG
+
     screenshots: List[ScreenshotResponse]
     date: str
     count: int
@@ -158,6 +168,8 @@ class SemanticSearchRequest(BaseModel):
 class SimilarScreenshotResponse(BaseModel):
     """Similar screenshot result."""
 
+    model_config = _RESPONSE_CONFIG
+
     screenshot_id: int
     similarity: float
     description: Optional[str]
@@ -168,6 +180,8 @@ class SimilarScreenshotResponse(BaseModel):
 class SemanticSearchResponse(BaseModel):
     """Response for semantic search."""
 
+    model_config = _RESPONSE_CONFIG
+
     query: str
     results: List[SimilarScreenshotResponse]
     count: int
@@ -209,5 +223,7 @@ class ContextSuggestionsRequest(BaseModel):
 class ContextSuggestionsResponse(BaseModel):
     """Response with context suggestions."""
 
+    model_config = _RESPONSE_CONFIG
+
     suggestions: List[SimilarScreenshotResponse]
     count: int
@@ -1,15 +1,36 @@
 """TODO management API routes."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Union
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import orjson
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 
 from backend.database import db
+from backend.utils.date_utils import parse_iso
 from loguru import logger
 
-router = APIRouter(prefix="/todos", tags=["TODOs"])
+router = APIRouter(prefix="/todos", tags=["TODOs"], default_response_class=ORJSONResponse)
+
+# Allowed priorities, checked by pydantic when the request body is parsed
+Priority = Literal["low", "medium", "high"]
+
+
+def _rows_response(rows: Union[Dict, List[Dict]]) -> Response:
+    """Serialize TODO rows straight to JSON, skipping response_model validation.
+
+    The database is the source of truth for TODO rows, so re-validating
+    them against TodoResponse on the way out is pure overhead.
+
+    Args:
+        rows: TODO dict or list of dicts as returned by the database
+
+    Returns:
+        JSON response
+    """
+    return Response(content=orjson.dumps(rows, default=str), media_type="application/json")
 
 
 # Pydantic models
@@ -17,7 +38,7 @@ class TodoCreate(BaseModel):
     """Model for creating a TODO."""
     title: Optional[str] = None
     todo_text: str
-    priority: str = "medium"
+    priority: Priority = "medium"
     due_date: Optional[str] = None
     screenshot_id: Optional[int] = None
     notes: Optional[str] = None
@@ -27,13 +48,15 @@ class TodoUpdate(BaseModel):
     """Model for updating a TODO."""
     title: Optional[str] = None
     todo_text: Optional[str] = None
-    priority: Optional[str] = None
+    priority: Optional[Priority] = None
     due_date: Optional[str] = None
     notes: Optional[str] = None
 
 
 class TodoResponse(BaseModel):
     """Model for TODO response."""
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
+
     id: int
     title: Optional[str] = None
     todo_text: str
@@ -58,14 +81,10 @@ async def create_todo(todo: TodoCreate):
         Created TODO item
     """
     try:
-        # Validate priority
-        if todo.priority not in ['low', 'medium', 'high']:
-            raise HTTPException(status_code=400, detail="Priority must be 'low', 'medium', or 'high'")
-
         # Validate due_date format if provided
         if todo.due_date:
             try:
-                datetime.fromisoformat(todo.due_date.replace('Z', '+00:00'))
+                parse_iso(todo.due_date)
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid due_date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)")
 
@@ -113,16 +132,11 @@ async def get_todos(
         List of TODO items
     """
     try:
-        # Get all TODOs with status filter
-        todos = db.get_todos(status=status, limit=limit)
-
-        # Apply additional filters
-        if priority:
-            todos = [t for t in todos if t.get('priority') == priority]
-        if created_by:
-            todos = [t for t in todos if t.get('created_by') == created_by]
+        todos = db.get_todos(
+            status=status, limit=limit, priority=priority, created_by=created_by
+        )
 
-        return todos
+        return _rows_response(todos)
 
     except Exception as e:
         logger.error(f"Error fetching TODOs: {e}")
@@ -144,7 +158,7 @@ async def get_todo(todo_id: int):
         if not todo:
             raise HTTPException(status_code=404, detail="TODO not found")
 
-        return todo
+        return _rows_response(todo)
 
     except HTTPException:
         raise
@@ -165,24 +179,15 @@ async def update_todo(todo_id: int, todo_update: TodoUpdate):
         Updated TODO item
     """
     try:
-        # Check if TODO exists
-        existing = db.get_todo(todo_id)
-        if not existing:
-            raise HTTPException(status_code=404, detail="TODO not found")
-
-        # Validate priority if provided
-        if todo_update.priority and todo_update.priority not in ['low', 'medium', 'high']:
-            raise HTTPException(status_code=400, detail="Priority must be 'low', 'medium', or 'high'")
-
         # Validate due_date format if provided
         if todo_update.due_date:
             try:
-                datetime.fromisoformat(todo_update.due_date.replace('Z', '+00:00'))
+                parse_iso(todo_update.due_date)
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid due_date format. Use ISO format")
 
-        # Update TODO
-        success = db.update_todo(
+        # Update TODO; the updated row comes back from the same statement
+        updated = db.update_todo(
             todo_id=todo_id,
             title=todo_update.title,
             todo_text=todo_update.todo_text,
@@ -191,12 +196,10 @@ async def update_todo(todo_id: int, todo_update: TodoUpdate):
             notes=todo_update.notes
         )
 
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to update TODO")
+        if not updated:
+            raise HTTPException(status_code=404, detail="TODO not found")
 
-        # Return updated TODO
-        updated = db.get_todo(todo_id)
-        return updated
+        return _rows_response(updated)
 
     except HTTPException:
         raise
@@ -213,16 +216,10 @@ async def delete_todo(todo_id: int):
         todo_id: TODO ID
     """
     try:
-        # Check if TODO exists
-        existing = db.get_todo(todo_id)
-        if not existing:
+        # Delete TODO; nothing deleted means it did not exist
+        if not db.delete_todo(todo_id):
             raise HTTPException(status_code=404, detail="TODO not found")
 
-        # Delete TODO
-        success = db.delete_todo(todo_id)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to delete TODO")
-
         return None
 
     except HTTPException:
@@ -243,19 +240,12 @@ async def complete_todo(todo_id: int):
         Updated TODO item
     """
     try:
-        # Check if TODO exists
-        existing = db.get_todo(todo_id)
-        if not existing:
+        # Update status; the updated row comes back from the same statement
+        updated = db.update_todo_status(todo_id, 'completed')
+        if not updated:
             raise HTTPException(status_code=404, detail="TODO not found")
 
-        # Update status
-        success = db.update_todo_status(todo_id, 'completed')
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to complete TODO")
-
-        # Return updated TODO
-        updated = db.get_todo(todo_id)
-        return updated
+        return _rows_response(updated)
 
     except HTTPException:
         raise
@@ -275,19 +265,12 @@ async def reopen_todo(todo_id: int):
         Updated TODO item
     """
     try:
-        # Check if TODO exists
-        existing = db.get_todo(todo_id)
-        if not existing:
+        # Update status; the updated row comes back from the same statement
+        updated = db.update_todo_status(todo_id, 'pending')
+        if not updated:
             raise HTTPException(status_code=404, detail="TODO not found")
 
-        # Update status
-        success = db.update_todo_status(todo_id, 'pending')
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to reopen TODO")
-
-        # Return updated TODO
-        updated = db.get_todo(todo_id)
-        return updated
+        return _rows_response(updated)
 
     except HTTPException:
         raise
@@ -318,7 +301,7 @@ async def get_upcoming_todos(days: int = 3):
             status='pending'
         )
 
-        return todos
+        return _rows_response(todos)
 
     except Exception as e:
         logger.error(f"Error fetching upcoming TODOs: {e}")
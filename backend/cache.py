@@ -0,0 +1,125 @@
+"""In-process TTL cache and HTTP caching helpers for MineContext-v2 API responses."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+# TTL for data covering periods that are entirely in the past
+PAST_TTL_SECONDS = 86400
+# TTL for data that still includes the current day
+CURRENT_TTL_SECONDS = 300
+# Cache-Control header for responses that never change once computed
+IMMUTABLE_CACHE_CONTROL = "public, max-age=86400, immutable"
+# Cache-Control header for responses clients may keep but must revalidate with their ETag
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-key TTL."""
+
+    def __init__(self, maxsize: int = 512):
+        """Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the oldest
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time to live in seconds
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a cached value if present.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove all cached values whose key starts with a prefix.
+
+        Args:
+            prefix: Key prefix
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._entries.clear()
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values identifying a response.
+
+    Args:
+        *parts: Values that change whenever the response changes
+
+    Returns:
+        Quoted ETag string
+    """
+    source = ":".join(str(part) for part in parts)
+    return f'"{hashlib.blake2b(source.encode(), digest_size=8).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check whether an If-None-Match header matches an ETag.
+
+    Args:
+        if_none_match: Raw If-None-Match header value (may be None)
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client already has the current representation
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+# Global response cache instance
+response_cache = TTLCache()
@@ -1,43 +1,81 @@
 """Screenshot capture service for MineContext-v2."""
 
+import asyncio
+import queue
 import random
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import mss
 from loguru import logger
+from PIL import Image
 
 from backend.config import settings
 from backend.database import db
 from backend.models import ScreenshotCreate
 from backend.utils.image_utils import (
-    calculate_perceptual_hash,
+    HashHistory,
     are_images_similar,
-    compress_image,
+    calculate_perceptual_hash,
+    save_compressed_image,
     ensure_screenshot_dir,
     generate_screenshot_filename,
     get_file_size,
     cleanup_screenshots,
 )
 
+# TODO activity matching (optional module)
+try:
+    from todolist.backend.services.activity_matcher import trigger_async_match
+except ImportError:
+    trigger_async_match = None
+
+# Number of recent screenshot hashes checked for near-duplicates
+DEDUP_HISTORY_SIZE = 1000
+# Captured frames waiting to be written; the oldest is dropped when full
+SAVE_QUEUE_SIZE = 8
+# Storage limits are enforced once per this many saved captures
+CLEANUP_EVERY_CAPTURES = 50
+
 
 class CaptureService:
-    """Screenshot capture service with background threading."""
+    """Screenshot capture service driven by an asyncio task on the app's event loop."""
 
     def __init__(self):
         """Initialize capture service."""
         self.is_running = False
-        self.capture_thread: Optional[threading.Thread] = None
         self.screenshots_captured = 0
         self.last_capture_time: Optional[datetime] = None
         self.last_hash: Optional[str] = None
-        self._stop_event = threading.Event()
-
-    def start(self):
-        """Start the screenshot capture service."""
+        self._recent_hashes = HashHistory(DEDUP_HISTORY_SIZE)
+        # Hashes of frames queued for saving but not stored yet; they join
+        # _recent_hashes only once stored. Both are shared with the save thread.
+        self._pending_hashes: List[str] = []
+        self._hash_lock = threading.Lock()
+        # Bumped whenever a field reported by get_status() changes
+        self.state_version = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        # Grabbing and hashing block, so they run on one dedicated worker thread,
+        # which also keeps a single mss instance alive between captures
+        self._capture_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        # Frames handed from the capture worker to the save thread (None stops it)
+        self._save_queue: "queue.Queue[Optional[Tuple[Image.Image, Path, str]]]" = queue.Queue(
+            maxsize=SAVE_QUEUE_SIZE
+        )
+        self._save_thread: Optional[threading.Thread] = None
+        self._captures_since_cleanup = 0
+        # Private generator for random intervals, independent of the module-level one
+        self._rng = random.Random()
+        # mss grabbers are not thread-safe, so each thread keeps its own
+        self._local = threading.local()
+
+    async def start(self):
+        """Start the screenshot capture service on the running event loop."""
         if self.is_running:
             logger.warning("Capture service is already running")
             return
@@ -52,25 +90,43 @@ class CaptureService:
             logger.info(f"Fixed interval mode: {settings.capture.interval_seconds} seconds")
 
         self.is_running = True
-        self._stop_event.clear()
+        self.state_version += 1
+        self._stop_event = asyncio.Event()
 
-        # Start capture in background thread
-        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
-        self.capture_thread.start()
+        # Encoding and persisting run on their own thread so slow disk writes
+        # never delay the next grab
+        self._save_thread = threading.Thread(target=self._save_loop, daemon=True)
+        self._save_thread.start()
 
-    def stop(self):
-        """Stop the screenshot capture service."""
+        self._task = asyncio.create_task(self._capture_loop())
+
+    async def stop(self):
+        """Stop the screenshot capture service and wait for pending frames to be saved."""
         if not self.is_running:
             logger.warning("Capture service is not running")
             return
 
         logger.info("Stopping screenshot capture service")
         self.is_running = False
+        self.state_version += 1
         self._stop_event.set()
 
-        # Wait for thread to finish
-        if self.capture_thread and self.capture_thread.is_alive():
-            self.capture_thread.join(timeout=5)
+        # Wait for the loop to finish its current capture
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning("Capture loop did not stop within 5 seconds")
+            self._task = None
+
+        # Let the save thread drain queued frames, then stop it
+        await asyncio.to_thread(self._stop_save_thread)
+
+    def _stop_save_thread(self):
+        """Queue the stop marker for the save thread and wait for it to exit."""
+        if self._save_thread and self._save_thread.is_alive():
+            self._save_queue.put(None)
+            self._save_thread.join(timeout=10)
 
     def get_status(self) -> dict:
         """Get current capture service status.
@@ -85,8 +141,21 @@ class CaptureService:
             "last_capture_time": self.last_capture_time,
         }
 
-    def _capture_loop(self):
-        """Main capture loop running in background thread."""
+    def _load_recent_hashes(self):
+        """Seed near-duplicate detection with the most recent stored screenshots."""
+        history = HashHistory(DEDUP_HISTORY_SIZE)
+        with self._hash_lock:
+            self._recent_hashes = history
+        if settings.capture.deduplicate:
+            try:
+                recent = db.get_recent_hashes(DEDUP_HISTORY_SIZE)
+                with self._hash_lock:
+                    history.extend(recent)
+            except Exception as e:
+                logger.error(f"Error loading recent screenshot hashes: {e}")
+
+    async def _capture_loop(self):
+        """Main capture loop; blocking work is handed to the capture worker thread."""
         if settings.capture.random_interval:
             logger.info(
                 f"Capture loop started with random interval "
@@ -97,30 +166,96 @@ class CaptureService:
                 f"Capture loop started with {settings.capture.interval_seconds}s interval"
             )
 
-        while not self._stop_event.is_set():
-            try:
-                self._capture_screenshot()
-            except Exception as e:
-                logger.error(f"Error in capture loop: {e}")
-
-            # Calculate next interval
-            if settings.capture.random_interval:
-                # Random interval between min and max
-                next_interval = random.randint(
-                    settings.capture.min_interval_seconds,
-                    settings.capture.max_interval_seconds
-                )
-                logger.debug(f"Next capture in {next_interval} seconds")
-            else:
-                next_interval = settings.capture.interval_seconds
-
-            # Wait for the interval or until stop event
-            self._stop_event.wait(timeout=next_interval)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._capture_pool, self._load_recent_hashes)
+
+        # Intervals are measured between capture starts, so capture time does not add drift
+        next_deadline = time.monotonic()
+
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    await loop.run_in_executor(self._capture_pool, self._capture_screenshot)
+                except Exception as e:
+                    logger.error(f"Error in capture loop: {e}")
+
+                # Calculate next interval
+                if settings.capture.random_interval:
+                    # Random interval between min and max
+                    next_interval = self._rng.randint(
+                        settings.capture.min_interval_seconds,
+                        settings.capture.max_interval_seconds
+                    )
+                    logger.debug(f"Next capture in {next_interval} seconds")
+                else:
+                    next_interval = settings.capture.interval_seconds
+
+                next_deadline += next_interval
+                remaining = next_deadline - time.monotonic()
+                if remaining < 0:
+                    # A capture overran its slot; start over instead of bursting to catch up
+                    next_deadline = time.monotonic()
+                    remaining = 0
+
+                # Wait until the deadline or until stop event
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await loop.run_in_executor(self._capture_pool, self._close_grabber)
 
         logger.info("Capture loop stopped")
 
+    def _grab_screen(self) -> Image.Image:
+        """Grab the primary monitor with the calling thread's mss instance.
+
+        The instance (and its display connection and buffers) is opened on
+        first use and reused for every later grab from the same thread.
+
+        Returns:
+            Screenshot as an in-memory RGB image
+        """
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = mss.mss()
+            # Primary monitor (index 1)
+            self._local.monitor = sct.monitors[1]
+
+        try:
+            screenshot = sct.grab(self._local.monitor)
+        except Exception:
+            # Reopen on the next grab in case the display setup changed
+            self._close_grabber()
+            raise
+
+        # Decode the raw BGRA buffer directly instead of via mss's RGB copy
+        return Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+
+    def _save_image(self, image: Image.Image, filepath: Path):
+        """Write a captured image to disk, compressing it if enabled.
+
+        Args:
+            image: Captured image
+            filepath: Destination path
+        """
+        if settings.storage.compression:
+            # Single baseline encode; the optimize pass costs more time than it saves bytes
+            save_compressed_image(
+                image, str(filepath), quality=settings.storage.quality, optimize=False
+            )
+        else:
+            image.save(str(filepath), "PNG")
+
+    def _close_grabber(self):
+        """Close the calling thread's mss instance, if it has one."""
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            self._local.sct = None
+            sct.close()
+
     def _capture_screenshot(self):
-        """Capture a single screenshot and save to database."""
+        """Capture a single screenshot and queue it for saving."""
         try:
             # Ensure screenshot directory exists
             screenshot_dir = ensure_screenshot_dir()
@@ -129,39 +264,104 @@ class CaptureService:
             filename = generate_screenshot_filename()
             filepath = screenshot_dir / filename
 
-            # Capture screenshot using mss
-            with mss.mss() as sct:
-                # Capture primary monitor (index 1)
-                monitor = sct.monitors[1]
-                screenshot = sct.grab(monitor)
-
-                # Save screenshot
-                mss.tools.to_png(screenshot.rgb, screenshot.size, output=str(filepath))
+            # Capture screenshot using this thread's mss instance
+            image = self._grab_screen()
 
-            # Compress if enabled
-            if settings.storage.compression:
-                compress_image(str(filepath), quality=settings.storage.quality)
+            # Hash the in-memory image so duplicates are dropped before any disk I/O
+            image_hash = calculate_perceptual_hash(image)
 
-            # Calculate perceptual hash
-            image_hash = calculate_perceptual_hash(str(filepath))
+            # Check recent and still-queued screenshots for near-duplicates if enabled
+            if settings.capture.deduplicate and self._is_recent_duplicate(image_hash):
+                logger.debug(f"Skipping duplicate screenshot: {filename}")
+                return
 
-            # Check for duplicates if enabled
-            if settings.capture.deduplicate and self.last_hash:
-                if are_images_similar(image_hash, self.last_hash):
-                    logger.debug(f"Skipping duplicate screenshot: {filename}")
-                    filepath.unlink()  # Delete the duplicate
-                    return
-
-            # Also check database for duplicates
+            # Also check older history for exact duplicates
             if settings.capture.deduplicate and image_hash:
                 existing = db.find_duplicate_hash(image_hash)
                 if existing:
                     logger.debug(
                         f"Screenshot {filename} is duplicate of ID {existing.id}"
                     )
-                    filepath.unlink()  # Delete the duplicate
                     return
 
+            # Mark the hash as pending so frames grabbed before this one is
+            # saved are still recognized as duplicates
+            with self._hash_lock:
+                self._pending_hashes.append(image_hash)
+            self._queue_save((image, filepath, image_hash))
+
+        except Exception as e:
+            logger.error(f"Error capturing screenshot: {e}")
+
+    def _is_recent_duplicate(self, image_hash: str) -> bool:
+        """Check a hash against stored and queued frames.
+
+        Args:
+            image_hash: Perceptual hash of the new frame
+
+        Returns:
+            True if a similar frame was stored recently or is waiting to be saved
+        """
+        with self._hash_lock:
+            if self._recent_hashes.has_similar(image_hash):
+                return True
+            return any(are_images_similar(image_hash, pending) for pending in self._pending_hashes)
+
+    def _settle_pending_hash(self, image_hash: str, stored: bool):
+        """Take a queued frame's hash out of the pending list.
+
+        Args:
+            image_hash: Perceptual hash of the frame
+            stored: Whether the frame was saved; only saved frames enter the history
+        """
+        with self._hash_lock:
+            try:
+                self._pending_hashes.remove(image_hash)
+            except ValueError:
+                pass
+            if stored:
+                self._recent_hashes.add(image_hash)
+
+    def _queue_save(self, item: Tuple[Image.Image, Path, str]):
+        """Hand a captured frame to the save thread without blocking.
+
+        Args:
+            item: Image, destination path and perceptual hash
+        """
+        try:
+            self._save_queue.put_nowait(item)
+        except queue.Full:
+            # Keep capture cadence: drop the oldest pending frame instead of waiting
+            try:
+                dropped = self._save_queue.get_nowait()
+                if dropped is not None:
+                    logger.warning(f"Save queue full, dropping screenshot {dropped[1].name}")
+                    self._settle_pending_hash(dropped[2], stored=False)
+            except queue.Empty:
+                pass
+            self._save_queue.put_nowait(item)
+
+    def _save_loop(self):
+        """Save queued frames until a stop marker is received."""
+        while True:
+            item = self._save_queue.get()
+            if item is None:
+                break
+            self._save_screenshot(*item)
+
+    def _save_screenshot(self, image: Image.Image, filepath: Path, image_hash: str):
+        """Write a captured frame to disk and record it in the database.
+
+        Args:
+            image: Captured image
+            filepath: Destination path
+            image_hash: Perceptual hash of the image
+        """
+        settled = False
+        try:
+            # Save screenshot (compressed if enabled)
+            self._save_image(image, filepath)
+
             # Get file size
             file_size = get_file_size(str(filepath))
 
@@ -172,38 +372,61 @@ class CaptureService:
                 file_size=file_size,
             )
             screenshot = db.create_screenshot(screenshot_data)
+            # Only a stored frame may suppress later identical ones
+            self._settle_pending_hash(image_hash, stored=True)
+            settled = True
 
             # Update service state
             self.screenshots_captured += 1
             self.last_capture_time = datetime.now()
             self.last_hash = image_hash
+            self.state_version += 1
 
             logger.info(
-                f"Screenshot captured: {filename} (ID: {screenshot.id}, Size: {file_size} bytes)"
+                f"Screenshot captured: {filepath.name} (ID: {screenshot.id}, Size: {file_size} bytes)"
             )
 
             # Trigger TODO activity matching (async, non-blocking)
-            try:
-                from todolist.backend.services.activity_matcher import trigger_async_match
+            if trigger_async_match is not None:
                 trigger_async_match(screenshot.id)
-            except ImportError:
-                pass  # TodoList module not installed
-
-            # Cleanup old screenshots if needed
-            total_screenshots = db.get_total_screenshots()
-            if total_screenshots > settings.capture.max_screenshots:
-                deleted_db = db.cleanup_old_screenshots(settings.capture.max_screenshots)
-                deleted_files = cleanup_screenshots(settings.capture.max_screenshots)
-                logger.info(
-                    f"Cleanup: {deleted_db} DB records, {deleted_files} files deleted"
-                )
+
+            # Cleanup old screenshots if needed, in batches rather than per capture
+            self._captures_since_cleanup += 1
+            if self._captures_since_cleanup >= CLEANUP_EVERY_CAPTURES:
+                self._captures_since_cleanup = 0
+                self._cleanup_if_needed()
 
         except Exception as e:
-            logger.error(f"Error capturing screenshot: {e}")
+            logger.error(f"Error saving screenshot {filepath.name}: {e}")
+            if not settled:
+                self._settle_pending_hash(image_hash, stored=False)
+
+    def _cleanup_if_needed(self):
+        """Delete the oldest screenshots once the configured maximum is exceeded."""
+        total_screenshots = db.get_total_screenshots()
+        if total_screenshots > settings.capture.max_screenshots:
+            deleted_db = db.cleanup_old_screenshots(settings.capture.max_screenshots)
+            deleted_files = cleanup_screenshots(settings.capture.max_screenshots)
+            logger.info(
+                f"Cleanup: {deleted_db} DB records, {deleted_files} files deleted"
+            )
 
-    def capture_now(self) -> Optional[int]:
+    async def capture_now(self) -> Optional[int]:
         """Capture a screenshot immediately (manual capture).
 
+        The capture runs on the capture worker thread, so it shares that
+        thread's single mss instance with the capture loop, and the grab,
+        encode and database write never block the event loop.
+
+        Returns:
+            Screenshot ID if successful, None otherwise
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._capture_pool, self._capture_now)
+
+    def _capture_now(self) -> Optional[int]:
+        """Capture, save and record a screenshot on the calling thread.
+
         Returns:
             Screenshot ID if successful, None otherwise
         """
@@ -215,21 +438,14 @@ class CaptureService:
             filename = generate_screenshot_filename()
             filepath = screenshot_dir / filename
 
-            # Capture screenshot using mss
-            with mss.mss() as sct:
-                # Capture primary monitor (index 1)
-                monitor = sct.monitors[1]
-                screenshot = sct.grab(monitor)
+            # Capture screenshot using this thread's mss instance
+            image = self._grab_screen()
 
-                # Save screenshot
-                mss.tools.to_png(screenshot.rgb, screenshot.size, output=str(filepath))
-
-            # Compress if enabled
-            if settings.storage.compression:
-                compress_image(str(filepath), quality=settings.storage.quality)
+            # Save screenshot (compressed if enabled)
+            self._save_image(image, filepath)
 
             # Calculate perceptual hash
-            image_hash = calculate_perceptual_hash(str(filepath))
+            image_hash = calculate_perceptual_hash(image)
 
             # Get file size
             file_size = get_file_size(str(filepath))
@@ -245,11 +461,8 @@ class CaptureService:
             logger.info(f"Manual screenshot captured: {filename} (ID: {screenshot.id})")
 
             # Trigger TODO activity matching (async, non-blocking)
-            try:
-                from todolist.backend.services.activity_matcher import trigger_async_match
+            if trigger_async_match is not None:
                 trigger_async_match(screenshot.id)
-            except ImportError:
-                pass  # TodoList module not installed
 
             return screenshot.id
 
@@ -1,73 +1,84 @@
 """Configuration management for MineContext-v2."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple, get_args
 
+import orjson
 import yaml
-from pydantic import Field
+from dotenv import dotenv_values
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
+# Prefer libyaml's C loader; fall back to the pure-Python one when it is unavailable
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-class CaptureConfig(BaseSettings):
+
+class CaptureConfig(BaseModel):
     """Screenshot capture configuration."""
 
-    interval_seconds: int = Field(default=40, description="Base screenshot capture interval")
-    auto_start: bool = Field(default=False, description="Auto-start capture on launch")
-    screenshot_dir: str = Field(default="./screenshots", description="Screenshot storage directory")
-    max_screenshots: int = Field(default=2000, description="Maximum screenshots to store")
-    deduplicate: bool = Field(default=True, description="Enable deduplication")
-    hash_threshold: int = Field(default=5, description="Perceptual hash difference threshold")
+    interval_seconds: int = 40  # Base screenshot capture interval
+    auto_start: bool = False  # Auto-start capture on launch
+    screenshot_dir: Path = Path("./screenshots")  # Screenshot storage directory
+    max_screenshots: int = 2000  # Maximum screenshots to store
+    deduplicate: bool = True  # Enable deduplication
+    hash_threshold: int = 5  # Perceptual hash difference threshold
     # Random interval configuration
-    random_interval: bool = Field(default=True, description="Enable random interval between captures")
-    min_interval_seconds: int = Field(default=20, description="Minimum interval for random capture")
-    max_interval_seconds: int = Field(default=60, description="Maximum interval for random capture")
+    random_interval: bool = True  # Enable random interval between captures
+    min_interval_seconds: int = 20  # Minimum interval for random capture
+    max_interval_seconds: int = 60  # Maximum interval for random capture
 
 
-class StorageConfig(BaseSettings):
+class StorageConfig(BaseModel):
     """Storage configuration."""
 
-    database_path: str = Field(default="./data/context.db", description="SQLite database path")
-    compression: bool = Field(default=True, description="Enable image compression")
-    quality: int = Field(default=85, description="JPEG compression quality (1-100)")
+    database_path: Path = Path("./data/context.db")  # SQLite database path
+    compression: bool = True  # Enable image compression
+    quality: int = 85  # JPEG compression quality (1-100)
+    shared_cache: bool = False  # Open SQLite connections in shared-cache mode
 
 
-class AIConfig(BaseSettings):
+class AIConfig(BaseModel):
     """AI integration configuration."""
 
-    enabled: bool = Field(default=False, description="Enable AI features")
-    provider: str = Field(default="openai", description="AI provider (openai/anthropic)")
-    model: str = Field(default="gpt-4-vision-preview", description="Model name")
-    auto_analyze: bool = Field(default=False, description="Auto-analyze screenshots")
-    analyze_on_demand: bool = Field(default=True, description="Allow on-demand analysis")
+    enabled: bool = False  # Enable AI features
+    provider: str = "openai"  # AI provider (openai/anthropic)
+    model: str = "gpt-4-vision-preview"  # Model name
+    auto_analyze: bool = False  # Auto-analyze screenshots
+    analyze_on_demand: bool = True  # Allow on-demand analysis
+    concurrency: int = Field(default=4, ge=1)  # Maximum concurrent analysis requests
 
 
-class EmbeddingsConfig(BaseSettings):
+class EmbeddingsConfig(BaseModel):
     """Embeddings configuration."""
 
-    enabled: bool = Field(default=True, description="Enable embedding generation")
-    model: str = Field(default="all-MiniLM-L6-v2", description="Sentence transformer model")
-    auto_generate: bool = Field(default=True, description="Auto-generate embeddings after analysis")
-    batch_size: int = Field(default=32, description="Batch size for embedding generation")
+    enabled: bool = True  # Enable embedding generation
+    model: str = "all-MiniLM-L6-v2"  # Sentence transformer model
+    auto_generate: bool = True  # Auto-generate embeddings after analysis
+    batch_size: int = 32  # Batch size for embedding generation
 
 
-class VectorDBConfig(BaseSettings):
+class VectorDBConfig(BaseModel):
     """Vector database configuration."""
 
-    enabled: bool = Field(default=True, description="Enable vector database")
-    path: str = Field(default="./data/chroma_db", description="ChromaDB storage path")
-    collection_name: str = Field(default="screenshot_contexts", description="Collection name")
-    similarity_threshold: float = Field(default=0.7, description="Similarity threshold (0-1)")
-    max_results: int = Field(default=10, description="Max results for similarity search")
+    enabled: bool = True  # Enable vector database
+    path: Path = Path("./data/chroma_db")  # ChromaDB storage path
+    collection_name: str = "screenshot_contexts"  # Collection name
+    similarity_threshold: float = 0.7  # Similarity threshold (0-1)
+    max_results: int = 10  # Max results for similarity search
 
 
-class ContextResurfacingConfig(BaseSettings):
+class ContextResurfacingConfig(BaseModel):
     """Context resurfacing configuration."""
 
-    enabled: bool = Field(default=True, description="Enable context resurfacing")
-    relevance_decay_days: int = Field(default=30, description="Relevance decay period in days")
-    min_similarity: float = Field(default=0.6, description="Minimum similarity for resurfacing")
-    max_suggestions: int = Field(default=5, description="Max proactive suggestions")
+    enabled: bool = True  # Enable context resurfacing
+    relevance_decay_days: int = 30  # Relevance decay period in days
+    min_similarity: float = 0.6  # Minimum similarity for resurfacing
+    max_suggestions: int = 5  # Max proactive suggestions
 
 
 class ServerConfig(BaseSettings):
@@ -102,46 +113,274 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
+# Settings fields that may be supplied through the .env file
+_DOTENV_FIELDS = ("openai_api_key", "anthropic_api_key", "openrouter_api_key")
+
+
+# YAML sections and the config model each one is loaded into (key = Settings attribute)
+_SECTIONS = (
+    ("capture", CaptureConfig),
+    ("storage", StorageConfig),
+    ("ai", AIConfig),
+    ("embeddings", EmbeddingsConfig),
+    ("vector_db", VectorDBConfig),
+    ("context_resurfacing", ContextResurfacingConfig),
+    ("server", ServerConfig),
+)
+
+
+def _build_section(section_cls, data: dict):
+    """Build a config section from its YAML mapping.
+
+    Setting ``CONFIG_SKIP_VALIDATION=1`` trusts the file and skips field
+    validation and coercion; by default every section is validated.
+    ``model_construct`` would also skip the environment overrides of
+    ``BaseSettings`` sections (``SERVER_*`` for ServerConfig), so those
+    are always validated.
+
+    Args:
+        section_cls: Config model for the section
+        data: Section mapping from the YAML file
+
+    Returns:
+        Config section instance
+    """
+    if os.environ.get("CONFIG_SKIP_VALIDATION") == "1" and not issubclass(
+        section_cls, BaseSettings
+    ):
+        # Path fields (including Optional[Path]) are still converted,
+        # since callers rely on Path methods
+        fields = section_cls.model_fields
+        data = {
+            key: Path(value)
+            if key in fields and value is not None and _is_path_field(fields[key].annotation)
+            else value
+            for key, value in data.items()
+        }
+        return section_cls.model_construct(**data)
+    return section_cls(**data)
+
+
+def _is_path_field(annotation) -> bool:
+    """Check whether a field annotation is Path or Optional[Path].
+
+    Args:
+        annotation: Field annotation
+
+    Returns:
+        True if values of the field should be Path objects
+    """
+    return annotation is Path or Path in get_args(annotation)
+
+
+# Directories already created by load_config in this process
+_ENSURED_DIRS: Set[str] = set()
+
+# Loaded settings keyed by (source path, mtime in ns, size); an edited file gets a new key
+_CONFIG_CACHE: Dict[Tuple[str, int, int], Settings] = {}
+
+
+@lru_cache(maxsize=None)
+def _dotenv_cached(env_path: str = ".env") -> Dict[str, str]:
+    """Read the .env file once per process.
+
+    Parsed by python-dotenv, as pydantic-settings does, so quoting,
+    escapes, multiline values and inline comments behave the same.
+
+    Args:
+        env_path: Path to the .env file
+
+    Returns:
+        Mapping of lower-cased keys to values (empty if the file is missing)
+    """
+    if not os.path.isfile(env_path):
+        return {}
+    return {
+        key.lower(): value
+        for key, value in dotenv_values(env_path, encoding="utf-8").items()
+        if value is not None
+    }
+
+
+def _build_settings(**sections) -> Settings:
+    """Construct Settings without letting pydantic-settings reopen .env.
+
+    Values from the cached .env are passed as explicit arguments; real
+    environment variables still take precedence over them.
+
+    Args:
+        **sections: Prebuilt config sections
+
+    Returns:
+        Settings instance
+    """
+    dotenv = _dotenv_cached()
+    environ_keys = {key.lower() for key in os.environ}
+    for field in _DOTENV_FIELDS:
+        if field in dotenv and field not in environ_keys:
+            sections[field] = dotenv[field]
+    return Settings(_env_file=None, **sections)
+
+
+@lru_cache(maxsize=None)
+def _default_settings() -> Settings:
+    """Build the all-defaults settings used when no config file exists.
+
+    Returns:
+        Shared default Settings instance
+    """
+    return _build_settings()
+
+
+def _leaf_dirs(directories) -> List[Path]:
+    """Drop directories that are ancestors of another one in the set.
+
+    ``mkdir(parents=True)`` on the deepest paths creates their ancestors
+    anyway, so e.g. ``./data`` is skipped next to ``./data/chroma_db``.
+
+    Args:
+        directories: Directories to create
+
+    Returns:
+        Unique directories, deepest first, with ancestors removed
+    """
+    leaves: List[Path] = []
+    for directory in sorted(set(directories), key=lambda d: len(d.parts), reverse=True):
+        if not any(directory in leaf.parents for leaf in leaves):
+            leaves.append(directory)
+    return leaves
+
+
+def compiled_config_path(config_path: str) -> str:
+    """Get the path of the JSON file compiled from a YAML config.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        Path of the compiled JSON next to it
+    """
+    return os.path.splitext(config_path)[0] + ".json"
+
+
+def compile_config(config_path: str = "config/config.yaml") -> str:
+    """Convert a YAML config to JSON so startup can skip YAML parsing.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        Path of the written JSON file
+    """
+    with open(config_path, "rb") as f:
+        config_data = yaml.load(f.read(), Loader=_YamlLoader)
+
+    json_path = compiled_config_path(config_path)
+    with open(json_path, "wb") as f:
+        f.write(orjson.dumps(config_data or {}, option=orjson.OPT_INDENT_2))
+    return json_path
+
+
+def _config_source(config_path: str) -> Optional[Tuple[str, os.stat_result]]:
+    """Pick the file to load: the compiled JSON if it is not older than the YAML.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        Tuple of (path, stat result), or None if the YAML file does not exist
+    """
+    try:
+        yaml_stat = os.stat(config_path)
+    except OSError:
+        return None
+
+    json_path = compiled_config_path(config_path)
+    try:
+        json_stat = os.stat(json_path)
+    except OSError:
+        return config_path, yaml_stat
+
+    if json_stat.st_mtime_ns >= yaml_stat.st_mtime_ns:
+        return json_path, json_stat
+    return config_path, yaml_stat
+
+
 def load_config(config_path: str = "config/config.yaml") -> Settings:
     """Load configuration from YAML file and environment variables.
 
+    Results are cached per config file version, so loading an unchanged
+    file again skips parsing and validation. A JSON file produced by
+    ``compile_config`` is read instead of the YAML while it is up to date.
+
     Args:
         config_path: Path to the YAML configuration file
 
     Returns:
         Settings object with loaded configuration
     """
-    settings = Settings()
-
-    # Load YAML config if it exists
-    if os.path.exists(config_path):
-        with open(config_path, "r") as f:
-            config_data = yaml.safe_load(f)
-
-        if config_data:
-            # Update settings from YAML
-            if "capture" in config_data:
-                settings.capture = CaptureConfig(**config_data["capture"])
-            if "storage" in config_data:
-                settings.storage = StorageConfig(**config_data["storage"])
-            if "ai" in config_data:
-                settings.ai = AIConfig(**config_data["ai"])
-            if "embeddings" in config_data:
-                settings.embeddings = EmbeddingsConfig(**config_data["embeddings"])
-            if "vector_db" in config_data:
-                settings.vector_db = VectorDBConfig(**config_data["vector_db"])
-            if "context_resurfacing" in config_data:
-                settings.context_resurfacing = ContextResurfacingConfig(**config_data["context_resurfacing"])
-            if "server" in config_data:
-                settings.server = ServerConfig(**config_data["server"])
-
-    # Ensure directories exist
-    Path(settings.storage.database_path).parent.mkdir(parents=True, exist_ok=True)
-    Path(settings.capture.screenshot_dir).mkdir(parents=True, exist_ok=True)
-    Path(settings.vector_db.path).mkdir(parents=True, exist_ok=True)
+    source = _config_source(config_path)
+    cache_key = None
+    if source is not None:
+        source_path, stat = source
+        cache_key = (source_path, stat.st_mtime_ns, stat.st_size)
+
+    if cache_key in _CONFIG_CACHE:
+        return _CONFIG_CACHE[cache_key]
+
+    # Load config file if it exists
+    config_data = None
+    if cache_key is not None:
+        # The stat above doubles as the existence check; just tolerate the file
+        # disappearing before it is opened
+        try:
+            # Hand the parser one UTF-8 buffer instead of streaming through a text wrapper
+            with open(source_path, "rb") as f:
+                buffer = f.read()
+            if source_path.endswith(".json"):
+                config_data = orjson.loads(buffer)
+            else:
+                config_data = yaml.load(buffer, Loader=_YamlLoader)
+        except FileNotFoundError:
+            cache_key = None
+
+    # Build each configured section once; Settings only defaults the missing ones
+    sections = {}
+    if config_data:
+        for key, section_cls in _SECTIONS:
+            section = config_data.get(key)
+            if section is not None:
+                sections[key] = _build_section(section_cls, section)
+
+    # Without any configured section, share one prebuilt default instance
+    settings = _build_settings(**sections) if sections else _default_settings()
+
+    # Ensure directories exist, once per path per process
+    for directory in _leaf_dirs((
+        settings.storage.database_path.parent,
+        settings.capture.screenshot_dir,
+        settings.vector_db.path,
+    )):
+        key = str(directory)
+        if key not in _ENSURED_DIRS:
+            directory.mkdir(parents=True, exist_ok=True)
+            _ENSURED_DIRS.add(key)
+
+    if cache_key is not None:
+        _CONFIG_CACHE[cache_key] = settings
 
     return settings
 
 
-# Global settings instance
-settings = load_config()
+def __getattr__(name: str):
+    """Load the global ``settings`` instance on first access (PEP 562).
+
+    Importing the module for its config classes or ``load_config`` no
+    longer parses the YAML; the first ``settings`` lookup does, and then
+    stores it as a plain module attribute for later lookups.
+    """
+    if name == "settings":
+        # Global settings instance
+        loaded = globals()["settings"] = load_config()
+        return loaded
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
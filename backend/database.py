@@ -1,11 +1,24 @@
 """Database operations for MineContext-v2."""
 
+import atexit
+import functools
+import json
+import queue
+import re
 import sqlite3
-from datetime import datetime
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
 
 from loguru import logger
+from pydantic import TypeAdapter
 
 from backend.config import settings
 from backend.models import (
@@ -16,262 +29,954 @@ from backend.models import (
     ScreenshotUpdate,
 )
 
+# Text format of timestamps written by SQLite's CURRENT_TIMESTAMP; range bounds are
+# bound in the same format so they compare like-for-like with stored values
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Seconds a filtered screenshot count may be reused before it is recomputed
+FILTERED_COUNT_TTL_SECONDS = 5
+
+# Activity content at least this long is stored zlib-compressed; shorter text
+# gains little and is kept as plain TEXT
+COMPRESS_MIN_CHARS = 256
+
+# Validate whole result sets in one call instead of constructing models row by row
+_SCREENSHOT_LIST = TypeAdapter(List[Screenshot])
+_ACTIVITY_LIST = TypeAdapter(List[Activity])
+
+
+def _split_tags(tags: Optional[str]) -> List[str]:
+    """Split a comma-separated tag string into unique, trimmed tags.
+
+    Args:
+        tags: Comma-separated tags (may be None)
+
+    Returns:
+        List of tags in their original order
+    """
+    if not tags:
+        return []
+
+    seen = set()
+    result = []
+    for tag in tags.split(","):
+        tag = tag.strip()
+        if tag and tag.lower() not in seen:
+            seen.add(tag.lower())
+            result.append(tag)
+    return result
+
+
+def _fts_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Args:
+        query: User search text
+
+    Returns:
+        FTS5 MATCH expression, or None if the text has no searchable words
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _trace_statement(statement: str) -> None:
+    """Log an executed SQL statement (installed only in debug mode).
+
+    Args:
+        statement: SQL text as executed
+    """
+    logger.debug(f"SQL: {statement}")
+
+
+def _json_ids(ids: List[int]) -> str:
+    """Encode IDs as one JSON array parameter for ``IN (SELECT value FROM json_each(?))``.
+
+    A single bound array keeps the statement text identical for any number
+    of IDs (so it stays in the statement cache) and is not subject to
+    SQLite's limit on host parameters per statement.
+
+    Args:
+        ids: Row IDs
+
+    Returns:
+        JSON array text
+    """
+    return json.dumps([int(i) for i in ids])
+
+
+@lru_cache(maxsize=128)
+def _update_by_id_sql(table: str, columns: Tuple[str, ...]) -> str:
+    """Build an ``UPDATE ... WHERE id = ?`` statement, cached per column set.
+
+    Reusing the exact same SQL text also lets the connection's statement
+    cache skip re-preparing it.
+
+    Args:
+        table: Table name
+        columns: Columns to set, in parameter order
+
+    Returns:
+        SQL statement
+    """
+    set_clause = ", ".join(f"{column} = ?" for column in columns)
+    return f"UPDATE {table} SET {set_clause} WHERE id = ?"
+
+
+def _iter_dicts(conn: sqlite3.Connection, query: str, params: List) -> Iterator[Dict]:
+    """Run a query and yield its rows as dicts one at a time.
+
+    The cursor is closed once the rows are exhausted or the caller stops
+    iterating.
+
+    Args:
+        conn: Database connection
+        query: SQL query
+        params: Bound parameters
+
+    Yields:
+        Row dicts
+    """
+    cursor = conn.execute(query, params)
+    try:
+        for row in cursor:
+            yield dict(row)
+    finally:
+        cursor.close()
+
+
+def _pack_text(text: Optional[str]) -> Union[str, bytes, None]:
+    """Compress long text for storage.
+
+    Args:
+        text: Text to store (may be None)
+
+    Returns:
+        zlib-compressed UTF-8 bytes for long text, otherwise the text unchanged
+    """
+    if text is None or len(text) < COMPRESS_MIN_CHARS:
+        return text
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def _unpack_text(value: Union[str, bytes, None]) -> Optional[str]:
+    """Reverse _pack_text; plain TEXT values pass through.
+
+    Args:
+        value: Stored column value
+
+    Returns:
+        Original text
+    """
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+def _activity_dict(row: sqlite3.Row) -> Dict:
+    """Convert an activities row to a dict with its content decompressed.
+
+    Args:
+        row: Row from the activities table
+
+    Returns:
+        Row dict ready for the Activity model
+    """
+    data = dict(row)
+    data["content"] = _unpack_text(data["content"])
+    return data
+
+
+def _serialized_write(method: Callable) -> Callable:
+    """Route a Database write method through the writer thread.
+
+    Args:
+        method: Write method to wrap
+
+    Returns:
+        Wrapped method that runs on the writer thread and returns its result
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._submit_write(method, self, *args, **kwargs)
+
+    return wrapper
+
+
+def _inserted_ids(cursor: sqlite3.Cursor, count: int) -> List[int]:
+    """Get the row IDs assigned by a multi-row insert.
+
+    Rows inserted by one executemany inside a single write transaction get
+    consecutive IDs, ending at ``last_insert_rowid()``.
+
+    Args:
+        cursor: Cursor that just ran the executemany
+        count: Number of rows inserted
+
+    Returns:
+        Row IDs in insertion order
+    """
+    last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - count + 1, last_id + 1))
+
+
+# Per-connection tuning: relaxed fsync under WAL, in-memory temp tables,
+# a 64 MB page cache, 256 MB of memory-mapped I/O and a 5 s lock wait
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Columns added after the first release: (table, column, definition).
+# Older databases get them through ALTER TABLE on startup.
+_ADDED_COLUMNS = (
+    ("screenshots", "embedding_generated", "BOOLEAN DEFAULT 0"),
+    ("screenshots", "embedding_model", "TEXT"),
+    ("screenshots", "embedding_generated_at", "DATETIME"),
+    ("screenshots", "session_id", "INTEGER"),
+    ("screenshots", "productivity_score", "FLOAT"),
+    ("activities", "duration_seconds", "INTEGER DEFAULT 0"),
+    ("activities", "app_category", "TEXT"),
+    ("extracted_todos", "due_date", "DATETIME"),
+    ("extracted_todos", "created_by", "TEXT DEFAULT 'ai_extracted'"),
+    ("extracted_todos", "title", "TEXT"),
+    ("extracted_todos", "notes", "TEXT"),
+)
+
+# Most queued writes the writer thread commits together in one transaction
+WRITE_BATCH_SIZE = 64
+
+# How often long-running processes refresh query planner statistics
+OPTIMIZE_INTERVAL_SECONDS = 3 * 3600
+
+# Session aggregates recomputed from the screenshots and activities linked to
+# each session. Apart from activity_count, an aggregate with no source rows
+# keeps its stored value.
+_WORK_SESSION_AGGREGATES = {
+    "activity_count": """(
+        SELECT COUNT(*) FROM screenshots s
+        JOIN activities a ON a.screenshot_id = s.id
+        WHERE s.session_id = work_sessions.id
+    )""",
+    "duration_seconds": """COALESCE((
+        SELECT SUM(a.duration_seconds) FROM screenshots s
+        JOIN activities a ON a.screenshot_id = s.id
+        WHERE s.session_id = work_sessions.id
+    ), duration_seconds)""",
+    "dominant_activity": """COALESCE((
+        SELECT a.activity_type FROM screenshots s
+        JOIN activities a ON a.screenshot_id = s.id
+        WHERE s.session_id = work_sessions.id
+        GROUP BY a.activity_type
+        ORDER BY COUNT(*) DESC, a.activity_type
+        LIMIT 1
+    ), dominant_activity)""",
+    "productivity_score": """COALESCE((
+        SELECT AVG(s.productivity_score) FROM screenshots s
+        WHERE s.session_id = work_sessions.id
+    ), productivity_score)""",
+}
+
+
+@lru_cache(maxsize=16)
+def _recompute_work_sessions_sql(
+    columns: Tuple[str, ...] = tuple(_WORK_SESSION_AGGREGATES),
+) -> str:
+    """Build an UPDATE recomputing some session aggregates in one statement.
+
+    Args:
+        columns: Aggregate columns to recompute (default: all of them)
+
+    Returns:
+        SQL statement without a WHERE clause
+    """
+    set_clause = ", ".join(f"{column} = {_WORK_SESSION_AGGREGATES[column]}" for column in columns)
+    return f"UPDATE work_sessions SET {set_clause}"
+
 
 class Database:
     """SQLite database manager."""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
         """Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path or settings.storage.database_path
+        # One long-lived connection per thread, handed out by _get_connection
+        self._local = threading.local()
+        self._pool: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._pool_lock = threading.Lock()
+        self._optimize_timer: Optional[threading.Timer] = None
+        # Writes from other threads are queued to one writer thread, started on first use
+        self._write_queue: "queue.Queue[Optional[Tuple[Future, Callable, tuple, dict]]]" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        # Held for the whole of every write transaction in this process
+        self._write_lock = threading.Lock()
+        self._fts_enabled = False
+        self._wal_enabled = False
+        # Total screenshot count, loaded lazily and kept current on insert/delete
+        self._count_cache: Optional[int] = None
+        self._count_lock = threading.Lock()
+        self._count_in_range_cached = lru_cache(maxsize=128)(self._count_in_range)
         self._ensure_db_exists()
         self._init_schema()
+        self._schedule_optimize()
+        atexit.register(self.close)
 
     def _ensure_db_exists(self):
         """Ensure database directory exists."""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection.
+        """Get the calling thread's database connection.
+
+        The connection is opened on a thread's first call and then kept, so
+        later calls skip reopening the file and keep SQLite's page cache.
+        Read through _read_connection() rather than ``with conn:``, which
+        would commit any transaction already open on this thread.
 
         Returns:
             SQLite connection object
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_pooled_connection()
         return conn
 
-    def _init_schema(self):
-        """Initialize database schema."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+    def _open_pooled_connection(self) -> sqlite3.Connection:
+        """Open a connection for the calling thread and add it to the pool.
 
-            # Create screenshots table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS screenshots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    filepath TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    image_hash TEXT,
-                    description TEXT,
-                    tags TEXT,
-                    app_name TEXT,
-                    window_title TEXT,
-                    analyzed BOOLEAN DEFAULT 0,
-                    file_size INTEGER,
-                    embedding_generated BOOLEAN DEFAULT 0,
-                    embedding_model TEXT,
-                    embedding_generated_at DATETIME,
-                    session_id INTEGER,
-                    productivity_score FLOAT
-                )
-                """
-            )
+        Returns:
+            SQLite connection object
+        """
+        # Pooled connections may be closed by close() or by pruning from another thread.
+        # Autocommit mode: writes group statements explicitly through transaction()
+        conn = self._connect(isolation_level=None)
 
-            # Create activities table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS activities (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    screenshot_id INTEGER NOT NULL,
-                    activity_type TEXT NOT NULL,
-                    content TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    duration_seconds INTEGER DEFAULT 0,
-                    app_category TEXT,
-                    FOREIGN KEY (screenshot_id) REFERENCES screenshots(id) ON DELETE CASCADE
-                )
-                """
-            )
+        with self._pool_lock:
+            # Release connections left behind by threads that have exited
+            for thread in [t for t in self._pool if not t.is_alive()]:
+                self._pool.pop(thread).close()
+            self._pool[threading.current_thread()] = conn
 
-            # Create work_sessions table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS work_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    start_time DATETIME NOT NULL,
-                    end_time DATETIME,
-                    duration_seconds INTEGER DEFAULT 0,
-                    activity_count INTEGER DEFAULT 0,
-                    dominant_activity TEXT,
-                    productivity_score FLOAT DEFAULT 0.0,
-                    notes TEXT
-                )
-                """
-            )
+        self._local.conn = conn
+        return conn
 
-            # Create activity_summaries table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS activity_summaries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date DATE NOT NULL,
-                    activity_type TEXT NOT NULL,
-                    total_seconds INTEGER DEFAULT 0,
-                    screenshot_count INTEGER DEFAULT 0,
-                    app_breakdown TEXT,
-                    UNIQUE(date, activity_type)
-                )
-                """
-            )
+    def _schedule_optimize(self):
+        """Run ``PRAGMA optimize`` periodically on a background timer."""
+        self._optimize_timer = threading.Timer(OPTIMIZE_INTERVAL_SECONDS, self._periodic_optimize)
+        self._optimize_timer.daemon = True
+        self._optimize_timer.start()
+
+    def _periodic_optimize(self):
+        """Refresh planner statistics, then schedule the next run."""
+        try:
+            # ANALYZE writes statistics tables, so it runs as a queued write
+            self._submit_write(self._run_optimize)
+        except sqlite3.Error as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
+        self._schedule_optimize()
+
+    def _run_optimize(self):
+        """Run ``PRAGMA optimize`` on the calling thread's connection."""
+        self._get_connection().execute("PRAGMA optimize")
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow the calling thread's connection for reads.
+
+        Leaving the block never commits, so a read made inside a write
+        transaction (such as the writer thread's batch) leaves it open.
+
+        Yields:
+            The calling thread's SQLite connection
+        """
+        yield self._get_connection()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed statements in one write transaction.
+
+        Pooled connections are in autocommit mode, so a statement outside a
+        transaction commits on its own. The transaction starts with
+        BEGIN IMMEDIATE, taking the write lock up front instead of failing
+        on lock upgrade. Nested calls on the same thread join the outermost
+        transaction, so several write methods can share one commit::
+
+            with db.transaction():
+                db.create_screenshot(...)
+                db.create_activity(...)
+
+        This is the one way to write from a thread other than the writer
+        thread: write methods called inside the block run on the calling
+        thread. The outermost block holds the process-wide write lock, also
+        taken by the writer thread's batches, so it waits for the writer
+        rather than contending with it for SQLite's lock.
+
+        Yields:
+            The calling thread's SQLite connection
+        """
+        conn = self._get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            pending: List[Callable[[], None]] = []
+            self._local.after_commit = pending
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._local.after_commit = None
 
-            # Create generated_reports table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS generated_reports (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    report_type TEXT NOT NULL,
-                    period_start DATE NOT NULL,
-                    period_end DATE NOT NULL,
-                    content TEXT NOT NULL,
-                    generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    metadata TEXT
-                )
-                """
-            )
+            # Still under the write lock, so a first COUNT taken under it
+            # (get_total_screenshots) never sees a commit without its delta
+            for callback in pending:
+                callback()
 
-            # Create extracted_todos table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS extracted_todos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    screenshot_id INTEGER,
-                    todo_text TEXT NOT NULL,
-                    priority TEXT DEFAULT 'medium',
-                    status TEXT DEFAULT 'pending',
-                    extracted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    completed_at DATETIME,
-                    FOREIGN KEY (screenshot_id) REFERENCES screenshots(id) ON DELETE CASCADE
+    def _after_commit(self, callback: Callable[[], None]):
+        """Run a callback once the calling thread's write transaction commits.
+
+        Outside a transaction the callback runs immediately; inside one it runs
+        after the commit but before the write lock is released. Callbacks of a
+        transaction that rolls back are dropped, so in-memory state never
+        reflects rows other connections cannot see yet.
+
+        Args:
+            callback: Function to call after the commit
+        """
+        pending = getattr(self._local, "after_commit", None)
+        if pending is None:
+            callback()
+        else:
+            pending.append(callback)
+
+    def _submit_write(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a write on the writer thread and wait for its result.
+
+        Calls made on the writer thread itself, or inside a transaction the
+        caller already opened with transaction(), run directly instead; that
+        caller already holds the write lock.
+
+        Args:
+            fn: Write function
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn; exceptions raised by fn are re-raised here
+        """
+        if (
+            threading.current_thread() is self._writer_thread
+            or self._get_connection().in_transaction
+        ):
+            return fn(*args, **kwargs)
+
+        self._ensure_writer_thread()
+        future: Future = Future()
+        self._write_queue.put((future, fn, args, kwargs))
+        return future.result()
+
+    def run_write(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run another module's write function on the writer thread.
+
+        For code that issues its own SQL, such as the TodoList module. fn is
+        called as ``fn(conn, *args, **kwargs)`` inside a write transaction
+        on the running thread's connection, and must not commit.
+
+        Args:
+            fn: Write function taking a connection as first argument
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn; exceptions raised by fn are re-raised here
+        """
+        return self._submit_write(self._call_in_transaction, fn, *args, **kwargs)
+
+    def _call_in_transaction(self, fn: Callable, *args, **kwargs) -> Any:
+        """Call ``fn(conn, *args, **kwargs)`` inside transaction().
+
+        Args:
+            fn: Write function taking a connection as first argument
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn
+        """
+        with self.transaction() as conn:
+            return fn(conn, *args, **kwargs)
+
+    def _ensure_writer_thread(self):
+        """Start the writer thread if it is not running."""
+        with self._writer_lock:
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="db-writer", daemon=True
                 )
-                """
-            )
+                self._writer_thread.start()
 
-            conn.commit()
+    def _writer_loop(self):
+        """Commit queued writes until a stop marker is received.
 
-            # Run migration to add new columns if they don't exist
-            self._migrate_schema(conn)
+        Writes that are already waiting when a transaction starts are
+        grouped into it, up to WRITE_BATCH_SIZE. Each runs in its own
+        savepoint, so a failing write is rolled back without affecting the
+        others. Results are delivered only after the commit.
+        """
+        while True:
+            job = self._write_queue.get()
+            if job is None:
+                break
+
+            batch = [job]
+            stop = False
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    job = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                batch.append(job)
+
+            self._run_write_batch(batch)
+            if stop:
+                break
+
+    def _run_write_batch(self, batch: List[Tuple[Future, Callable, tuple, dict]]):
+        """Run queued writes in one transaction and resolve their futures.
 
-            # Create indexes for better query performance (after migration)
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_screenshots_timestamp ON screenshots(timestamp DESC)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_screenshots_hash ON screenshots(image_hash)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_screenshots_embedding ON screenshots(embedding_generated)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_screenshots_session ON screenshots(session_id)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_activities_screenshot ON activities(screenshot_id)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_activities_timestamp ON activities(timestamp DESC)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_activities_type ON activities(activity_type)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_work_sessions_time ON work_sessions(start_time DESC)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_activity_summaries_date ON activity_summaries(date DESC)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_reports_type_date ON generated_reports(report_type, period_start DESC)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_todos_status ON extracted_todos(status)"
-            )
+        Args:
+            batch: Queued (future, fn, args, kwargs) jobs
+        """
+        outcomes = []
+        try:
+            with self.transaction() as conn:
+                pending = self._local.after_commit
+                for _, fn, args, kwargs in batch:
+                    conn.execute("SAVEPOINT queued_write")
+                    mark = len(pending)
+                    try:
+                        outcomes.append((True, fn(*args, **kwargs)))
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO queued_write")
+                        # Drop the after-commit callbacks of the rolled back write
+                        del pending[mark:]
+                        outcomes.append((False, e))
+                    conn.execute("RELEASE queued_write")
+        except BaseException as e:
+            # The whole transaction failed (e.g. COMMIT); no write took effect
+            for future, _, _, _ in batch:
+                future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for (future, _, _, _), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _stop_writer_thread(self):
+        """Let the writer thread finish queued writes and exit."""
+        with self._writer_lock:
+            writer = self._writer_thread
+            self._writer_thread = None
+        if writer is not None and writer.is_alive():
+            self._write_queue.put(None)
+            writer.join(timeout=10)
+
+    def close(self):
+        """Close the pooled connections.
+
+        Each connection runs ``PRAGMA optimize`` first, which lets SQLite
+        gather statistics for queries it found poorly planned. Registered
+        with atexit; a later call to _get_connection opens a new connection.
+        """
+        if self._optimize_timer is not None:
+            self._optimize_timer.cancel()
+            self._optimize_timer = None
 
-            conn.commit()
+        self._stop_writer_thread()
 
-            # Initialize TodoList module database
+        with self._pool_lock:
+            connections = list(self._pool.values())
+            self._pool.clear()
+            self._local = threading.local()
+
+        for conn in connections:
             try:
-                from todolist.backend.database import init_todolist_database
-                init_todolist_database(conn)
-                logger.info("TodoList module database initialized")
-            except ImportError:
-                logger.debug("TodoList module not found, skipping")
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed: {e}")
+            finally:
+                conn.close()
 
-            logger.info(f"Database initialized at {self.db_path}")
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        """Open and configure a new connection to the database file.
 
-    def _migrate_schema(self, conn: sqlite3.Connection):
-        """Migrate database schema to add new columns if they don't exist.
+        With ``storage.shared_cache`` enabled the file is opened through a
+        ``cache=shared`` URI, so connections in this process share one page
+        cache. With ``server.debug`` every executed statement is logged.
 
         Args:
-            conn: Database connection
+            **kwargs: Extra arguments for sqlite3.connect
+
+        Returns:
+            SQLite connection object
         """
-        cursor = conn.cursor()
+        if settings.storage.shared_cache:
+            path = quote(Path(self.db_path).resolve().as_posix())
+            conn = sqlite3.connect(
+                f"file:{path}?cache=shared&mode=rwc", uri=True,
+                check_same_thread=False, cached_statements=256, **kwargs
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=256, **kwargs
+            )
+        conn.row_factory = sqlite3.Row
+        if settings.server.debug:
+            conn.set_trace_callback(_trace_statement)
+        self._apply_pragmas(conn)
+        return conn
+
+    def _apply_pragmas(self, conn: sqlite3.Connection):
+        """Tune a freshly opened connection.
+
+        WAL lets readers run alongside a writer and, with synchronous=NORMAL,
+        only syncs at checkpoints instead of on every commit. The journal
+        mode is stored in the database file, so it is only set once per
+        process; the remaining pragmas are per-connection.
 
-        # Check if embedding columns exist in screenshots
-        cursor.execute("PRAGMA table_info(screenshots)")
-        screenshot_columns = [row[1] for row in cursor.fetchall()]
+        Args:
+            conn: Newly opened SQLite connection
+        """
+        if not self._wal_enabled:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._wal_enabled = True
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
 
-        # Add embedding-related columns
-        if "embedding_generated" not in screenshot_columns:
-            logger.info("Adding embedding_generated column to screenshots table")
-            cursor.execute("ALTER TABLE screenshots ADD COLUMN embedding_generated BOOLEAN DEFAULT 0")
+    def _init_schema(self):
+        """Initialize database schema.
 
-        if "embedding_model" not in screenshot_columns:
-            logger.info("Adding embedding_model column to screenshots table")
-            cursor.execute("ALTER TABLE screenshots ADD COLUMN embedding_model TEXT")
+        Tables, column migrations and indexes are applied as one script in a
+        single transaction, so startup commits once.
+        """
+        conn = self._get_connection()
+        # Read before the script runs so fresh tables are not migrated
+        alter_statements = self._migrate_schema(conn)
 
-        if "embedding_generated_at" not in screenshot_columns:
-            logger.info("Adding embedding_generated_at column to screenshots table")
-            cursor.execute("ALTER TABLE screenshots ADD COLUMN embedding_generated_at DATETIME")
+        conn.executescript(
+            """
+            BEGIN;
+
+            CREATE TABLE IF NOT EXISTS screenshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filepath TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                image_hash TEXT,
+                description TEXT,
+                tags TEXT,
+                app_name TEXT,
+                window_title TEXT,
+                analyzed BOOLEAN DEFAULT 0,
+                file_size INTEGER,
+                embedding_generated BOOLEAN DEFAULT 0,
+                embedding_model TEXT,
+                embedding_generated_at DATETIME,
+                session_id INTEGER,
+                productivity_score FLOAT
+            );
+
+            -- Per-table write counters, bumped by triggers; used to build response ETags.
+            -- Seeded at random so a recreated database does not repeat old versions.
+            CREATE TABLE IF NOT EXISTS table_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO table_versions (name, version)
+                VALUES ('screenshots', random() & 281474976710655);
+
+            CREATE TRIGGER IF NOT EXISTS screenshots_version_ai AFTER INSERT ON screenshots BEGIN
+                UPDATE table_versions SET version = version + 1 WHERE name = 'screenshots';
+            END;
+            CREATE TRIGGER IF NOT EXISTS screenshots_version_au AFTER UPDATE ON screenshots BEGIN
+                UPDATE table_versions SET version = version + 1 WHERE name = 'screenshots';
+            END;
+            CREATE TRIGGER IF NOT EXISTS screenshots_version_ad AFTER DELETE ON screenshots BEGIN
+                UPDATE table_versions SET version = version + 1 WHERE name = 'screenshots';
+            END;
+
+            CREATE TABLE IF NOT EXISTS activities (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                screenshot_id INTEGER NOT NULL,
+                activity_type TEXT NOT NULL,
+                content TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                duration_seconds INTEGER DEFAULT 0,
+                app_category TEXT,
+                FOREIGN KEY (screenshot_id) REFERENCES screenshots(id) ON DELETE CASCADE
+            );
+
+            CREATE TABLE IF NOT EXISTS work_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                start_time DATETIME NOT NULL,
+                end_time DATETIME,
+                duration_seconds INTEGER DEFAULT 0,
+                activity_count INTEGER DEFAULT 0,
+                dominant_activity TEXT,
+                productivity_score FLOAT DEFAULT 0.0,
+                notes TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS activity_summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date DATE NOT NULL,
+                activity_type TEXT NOT NULL,
+                total_seconds INTEGER DEFAULT 0,
+                screenshot_count INTEGER DEFAULT 0,
+                app_breakdown TEXT,
+                UNIQUE(date, activity_type)
+            );
+
+            CREATE TABLE IF NOT EXISTS generated_reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                report_type TEXT NOT NULL,
+                period_start DATE NOT NULL,
+                period_end DATE NOT NULL,
+                content TEXT NOT NULL,
+                generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                metadata TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS extracted_todos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                screenshot_id INTEGER,
+                todo_text TEXT NOT NULL,
+                priority TEXT DEFAULT 'medium',
+                status TEXT DEFAULT 'pending',
+                extracted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                completed_at DATETIME,
+                due_date DATETIME,
+                created_by TEXT DEFAULT 'ai_extracted',
+                title TEXT,
+                notes TEXT,
+                FOREIGN KEY (screenshot_id) REFERENCES screenshots(id) ON DELETE CASCADE
+            );
+            """
+            + "".join(f"{statement};\n" for statement in alter_statements)
+            + """
+            CREATE INDEX IF NOT EXISTS idx_screenshots_timestamp ON screenshots(timestamp DESC);
+            CREATE INDEX IF NOT EXISTS idx_screenshots_ts_id ON screenshots(timestamp DESC, id DESC);
+            -- Day lookups are range scans on the timestamp index now
+            DROP INDEX IF EXISTS idx_screenshots_day;
+            -- Duplicate lookups seek by hash and read the newest entry straight from the index
+            DROP INDEX IF EXISTS idx_screenshots_hash;
+            CREATE INDEX IF NOT EXISTS idx_screenshots_hash_ts ON screenshots(image_hash, timestamp DESC);
+            CREATE INDEX IF NOT EXISTS idx_screenshots_embedding ON screenshots(embedding_generated);
+            CREATE INDEX IF NOT EXISTS idx_screenshots_unanalyzed ON screenshots(timestamp DESC)
+                WHERE analyzed = 0;
+            -- Matches the pending-embedding predicate, which also treats NULL as not generated
+            DROP INDEX IF EXISTS idx_screenshots_needs_embedding;
+            CREATE INDEX IF NOT EXISTS idx_screenshots_pending_embed ON screenshots(timestamp DESC)
+                WHERE analyzed = 1 AND (embedding_generated IS NULL OR embedding_generated = 0);
+            -- Session lookups also read screenshots in time order, so cover both
+            DROP INDEX IF EXISTS idx_screenshots_session;
+            CREATE INDEX IF NOT EXISTS idx_screenshots_session_ts ON screenshots(session_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_activities_screenshot ON activities(screenshot_id);
+            CREATE INDEX IF NOT EXISTS idx_activities_timestamp ON activities(timestamp DESC);
+            CREATE INDEX IF NOT EXISTS idx_activities_type ON activities(activity_type);
+            CREATE INDEX IF NOT EXISTS idx_work_sessions_time ON work_sessions(start_time DESC);
+            CREATE INDEX IF NOT EXISTS idx_activity_summaries_date ON activity_summaries(date DESC);
+            CREATE INDEX IF NOT EXISTS idx_reports_type_date
+                ON generated_reports(report_type, period_start DESC);
+            -- Covers status-only lookups too, so the single-column index is redundant
+            DROP INDEX IF EXISTS idx_todos_status;
+            CREATE INDEX IF NOT EXISTS idx_todos_filters
+                ON extracted_todos(status, priority, created_by, extracted_at DESC);
+
+            COMMIT;
+            """
+        )
 
-        # Add Phase 5A columns
-        if "session_id" not in screenshot_columns:
-            logger.info("Adding session_id column to screenshots table")
-            cursor.execute("ALTER TABLE screenshots ADD COLUMN session_id INTEGER")
+        with self.transaction():
+            self._init_search_tables(conn)
 
-        if "productivity_score" not in screenshot_columns:
-            logger.info("Adding productivity_score column to screenshots table")
-            cursor.execute("ALTER TABLE screenshots ADD COLUMN productivity_score FLOAT")
+        # Initialize TodoList module database
+        try:
+            from todolist.backend.database import init_todolist_database
+            init_todolist_database(conn)
+            logger.info("TodoList module database initialized")
+        except ImportError:
+            logger.debug("TodoList module not found, skipping")
 
-        # Check activities table
-        cursor.execute("PRAGMA table_info(activities)")
-        activity_columns = [row[1] for row in cursor.fetchall()]
+        # Build statistics for indexes created above
+        conn.execute("PRAGMA optimize")
 
-        if "duration_seconds" not in activity_columns:
-            logger.info("Adding duration_seconds column to activities table")
-            cursor.execute("ALTER TABLE activities ADD COLUMN duration_seconds INTEGER DEFAULT 0")
+        logger.info(f"Database initialized at {self.db_path}")
 
-        if "app_category" not in activity_columns:
-            logger.info("Adding app_category column to activities table")
-            cursor.execute("ALTER TABLE activities ADD COLUMN app_category TEXT")
+    def _init_search_tables(self, conn: sqlite3.Connection):
+        """Create the tag index and full-text search tables, backfilling them once.
 
-        # Check extracted_todos table for new columns
-        cursor.execute("PRAGMA table_info(extracted_todos)")
-        todos_columns = [row[1] for row in cursor.fetchall()]
+        Args:
+            conn: Database connection
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'")
+        existing_tables = {row[0]: row[1] for row in cursor.fetchall()}
 
-        if "due_date" not in todos_columns:
-            logger.info("Adding due_date column to extracted_todos table")
-            cursor.execute("ALTER TABLE extracted_todos ADD COLUMN due_date DATETIME")
+        # Normalized tags, one row per (tag, screenshot)
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS screenshot_tags (
+                screenshot_id INTEGER NOT NULL,
+                tag TEXT NOT NULL COLLATE NOCASE,
+                PRIMARY KEY (tag, screenshot_id)
+            )
+            """
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_screenshot_tags_screenshot ON screenshot_tags(screenshot_id)"
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS screenshots_tags_ad AFTER DELETE ON screenshots BEGIN
+                DELETE FROM screenshot_tags WHERE screenshot_id = old.id;
+            END
+            """
+        )
+
+        if "screenshot_tags" not in existing_tables:
+            logger.info("Backfilling screenshot_tags table")
+            cursor.execute("SELECT id, tags FROM screenshots WHERE tags IS NOT NULL AND tags != ''")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO screenshot_tags (screenshot_id, tag) VALUES (?, ?)",
+                [(row[0], tag) for row in cursor.fetchall() for tag in _split_tags(row[1])],
+            )
 
-        if "created_by" not in todos_columns:
-            logger.info("Adding created_by column to extracted_todos table")
-            cursor.execute("ALTER TABLE extracted_todos ADD COLUMN created_by TEXT DEFAULT 'ai_extracted'")
+        # An index built with another tokenizer is dropped and rebuilt below
+        fts_sql = existing_tables.get("screenshots_fts")
+        if fts_sql is not None and "remove_diacritics 2" not in fts_sql:
+            logger.info("Recreating screenshots_fts with the current tokenizer")
+            cursor.execute("DROP TABLE screenshots_fts")
+            del existing_tables["screenshots_fts"]
 
-        if "title" not in todos_columns:
-            logger.info("Adding title column to extracted_todos table")
-            cursor.execute("ALTER TABLE extracted_todos ADD COLUMN title TEXT")
+        # External-content FTS5 index kept in sync with screenshots by triggers;
+        # remove_diacritics 2 makes accented and plain spellings match
+        try:
+            cursor.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS screenshots_fts USING fts5(
+                    description, tags, window_title,
+                    content='screenshots', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, falling back to LIKE search: {e}")
+            self._fts_enabled = False
+            return
+
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS screenshots_fts_ai AFTER INSERT ON screenshots BEGIN
+                INSERT INTO screenshots_fts(rowid, description, tags, window_title)
+                VALUES (new.id, new.description, new.tags, new.window_title);
+            END
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS screenshots_fts_ad AFTER DELETE ON screenshots BEGIN
+                INSERT INTO screenshots_fts(screenshots_fts, rowid, description, tags, window_title)
+                VALUES ('delete', old.id, old.description, old.tags, old.window_title);
+            END
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS screenshots_fts_au
+            AFTER UPDATE OF description, tags, window_title ON screenshots BEGIN
+                INSERT INTO screenshots_fts(screenshots_fts, rowid, description, tags, window_title)
+                VALUES ('delete', old.id, old.description, old.tags, old.window_title);
+                INSERT INTO screenshots_fts(rowid, description, tags, window_title)
+                VALUES (new.id, new.description, new.tags, new.window_title);
+            END
+            """
+        )
+
+        if "screenshots_fts" not in existing_tables:
+            logger.info("Building screenshots_fts index")
+            cursor.execute("INSERT INTO screenshots_fts(screenshots_fts) VALUES ('rebuild')")
+
+        self._fts_enabled = True
 
-        if "notes" not in todos_columns:
-            logger.info("Adding notes column to extracted_todos table")
-            cursor.execute("ALTER TABLE extracted_todos ADD COLUMN notes TEXT")
+    def _sync_tags(self, cursor: sqlite3.Cursor, screenshot_id: int, tags: Optional[str]):
+        """Replace the normalized tag rows of a screenshot.
 
-        conn.commit()
+        Args:
+            cursor: Cursor of the connection performing the write
+            screenshot_id: Screenshot ID
+            tags: Comma-separated tags (may be None)
+        """
+        cursor.execute("DELETE FROM screenshot_tags WHERE screenshot_id = ?", (screenshot_id,))
+        cursor.executemany(
+            "INSERT OR IGNORE INTO screenshot_tags (screenshot_id, tag) VALUES (?, ?)",
+            [(screenshot_id, tag) for tag in _split_tags(tags)],
+        )
+
+    def _migrate_schema(self, conn: sqlite3.Connection) -> List[str]:
+        """Work out which columns existing tables are missing.
+
+        Column names for every table come from a single query. Tables that
+        do not exist yet are skipped, because their CREATE TABLE statement
+        already has every column.
+
+        Args:
+            conn: Database connection
+
+        Returns:
+            ALTER TABLE statements to run, in order
+        """
+        cursor = conn.execute(
+            "SELECT m.name, p.name FROM sqlite_master AS m "
+            "JOIN pragma_table_info(m.name) AS p WHERE m.type = 'table'"
+        )
+        table_columns: Dict[str, set] = {}
+        for table, column in cursor.fetchall():
+            table_columns.setdefault(table, set()).add(column)
+
+        statements = []
+        for table, column, definition in _ADDED_COLUMNS:
+            columns = table_columns.get(table)
+            if columns is not None and column not in columns:
+                logger.info(f"Adding {column} column to {table} table")
+                statements.append(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return statements
 
     # Screenshot CRUD operations
 
+    @_serialized_write
     def create_screenshot(self, screenshot: ScreenshotCreate) -> Screenshot:
         """Create a new screenshot record.
 
@@ -281,7 +986,7 @@ class Database:
         Returns:
             Created screenshot with ID
         """
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -289,6 +994,7 @@ class Database:
                     filepath, image_hash, description, tags,
                     app_name, window_title, file_size
                 ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                RETURNING *
                 """,
                 (
                     screenshot.filepath,
@@ -300,10 +1006,56 @@ class Database:
                     screenshot.file_size,
                 ),
             )
-            conn.commit()
+            # RETURNING hands back the stored row, so no follow-up SELECT is needed
+            created = Screenshot(**dict(cursor.fetchone()))
+            if screenshot.tags:
+                self._sync_tags(cursor, created.id, screenshot.tags)
 
-            screenshot_id = cursor.lastrowid
-            return self.get_screenshot(screenshot_id)
+        self._adjust_count(1)
+        return created
+
+    @_serialized_write
+    def create_screenshots_bulk(self, screenshots: List[ScreenshotCreate]) -> List[int]:
+        """Create several screenshot records in one transaction.
+
+        Args:
+            screenshots: Screenshot data to create
+
+        Returns:
+            IDs of the created screenshots, in input order
+        """
+        if not screenshots:
+            return []
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT INTO screenshots (
+                    filepath, image_hash, description, tags,
+                    app_name, window_title, file_size
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        screenshot.filepath,
+                        screenshot.image_hash,
+                        screenshot.description,
+                        screenshot.tags,
+                        screenshot.app_name,
+                        screenshot.window_title,
+                        screenshot.file_size,
+                    )
+                    for screenshot in screenshots
+                ],
+            )
+            screenshot_ids = _inserted_ids(cursor, len(screenshots))
+            for screenshot_id, screenshot in zip(screenshot_ids, screenshots):
+                if screenshot.tags:
+                    self._sync_tags(cursor, screenshot_id, screenshot.tags)
+
+        self._adjust_count(len(screenshots))
+        return screenshot_ids
 
     def get_screenshot(self, screenshot_id: int) -> Optional[Screenshot]:
         """Get screenshot by ID.
@@ -314,7 +1066,7 @@ class Database:
         Returns:
             Screenshot if found, None otherwise
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM screenshots WHERE id = ?", (screenshot_id,))
             row = cursor.fetchone()
@@ -323,45 +1075,285 @@ class Database:
                 return Screenshot(**dict(row))
             return None
 
+    def get_screenshots_by_ids(self, screenshot_ids: List[int]) -> List[Screenshot]:
+        """Get several screenshots by ID with a single query.
+
+        Args:
+            screenshot_ids: Screenshot IDs
+
+        Returns:
+            Screenshots found, in the order of screenshot_ids (missing IDs are skipped)
+        """
+        if not screenshot_ids:
+            return []
+
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM screenshots WHERE id IN (SELECT value FROM json_each(?))",
+                (_json_ids(screenshot_ids),)
+            )
+            by_id = {
+                screenshot.id: screenshot
+                for screenshot in _SCREENSHOT_LIST.validate_python(
+                    [dict(row) for row in cursor.fetchall()]
+                )
+            }
+
+        return [by_id[sid] for sid in screenshot_ids if sid in by_id]
+
     def get_screenshots(
         self,
         limit: int = 100,
         offset: int = 0,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
     ) -> List[Screenshot]:
         """Get list of screenshots with optional filters.
 
         Args:
             limit: Maximum number of results
-            offset: Offset for pagination
+            offset: Offset for pagination (ignored when ``after`` is set)
             start_date: Filter screenshots after this date
             end_date: Filter screenshots before this date
+            after: Keyset cursor (timestamp, id) of the last row of the previous page
 
         Returns:
             List of screenshots
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
 
-            query = "SELECT * FROM screenshots WHERE 1=1"
-            params = []
+            query = "SELECT * FROM screenshots WHERE 1=1"
+            params = []
+
+            if start_date:
+                query += " AND timestamp >= ?"
+                params.append(start_date.strftime(TIMESTAMP_FORMAT))
+            if end_date:
+                query += " AND timestamp <= ?"
+                params.append(end_date.strftime(TIMESTAMP_FORMAT))
+
+            if after:
+                query += " AND (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT ?"
+                params.extend([after[0].strftime(TIMESTAMP_FORMAT), after[1], limit])
+            else:
+                query += " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
+
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+            return _SCREENSHOT_LIST.validate_python([dict(row) for row in rows])
+
+    def get_screenshots_with_total(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> Tuple[List[Screenshot], int]:
+        """Get a page of screenshots together with the total matching count.
+
+        The total comes from the cached counters, so a page load runs only
+        the page query.
+
+        Args:
+            limit: Maximum number of results
+            offset: Offset for pagination (ignored when ``after`` is set)
+            start_date: Filter screenshots after this date
+            end_date: Filter screenshots before this date
+            after: Keyset cursor (timestamp, id) of the last row of the previous page
+
+        Returns:
+            Tuple of (screenshots, total number of matching screenshots)
+        """
+        screenshots = self.get_screenshots(
+            limit=limit,
+            offset=offset,
+            start_date=start_date,
+            end_date=end_date,
+            after=after,
+        )
+        return screenshots, self.count_screenshots(start_date, end_date)
+
+    def count_screenshots(
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> int:
+        """Count screenshots, optionally within a date range.
+
+        The unfiltered total is served from the incremental counter; filtered
+        totals are cached for FILTERED_COUNT_TTL_SECONDS.
+
+        Args:
+            start_date: Count screenshots after this date
+            end_date: Count screenshots before this date
+
+        Returns:
+            Number of matching screenshots
+        """
+        if not start_date and not end_date:
+            return self.get_total_screenshots()
+
+        bucket = int(time.monotonic() // FILTERED_COUNT_TTL_SECONDS)
+        return self._count_in_range_cached(
+            start_date.strftime(TIMESTAMP_FORMAT) if start_date else None,
+            end_date.strftime(TIMESTAMP_FORMAT) if end_date else None,
+            bucket,
+        )
+
+    def _count_in_range(self, start: Optional[str], end: Optional[str], bucket: int) -> int:
+        """Run a filtered COUNT query.
+
+        Args:
+            start: Lower timestamp bound (ISO format), or None
+            end: Upper timestamp bound (ISO format), or None
+            bucket: Time bucket; only part of the cache key so entries expire
+
+        Returns:
+            Number of matching screenshots
+        """
+        query = "SELECT COUNT(*) FROM screenshots WHERE 1=1"
+        params = []
+
+        if start:
+            query += " AND timestamp >= ?"
+            params.append(start)
+        if end:
+            query += " AND timestamp <= ?"
+            params.append(end)
+
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+
+    def _adjust_count(self, delta: int):
+        """Apply an insert/delete to the cached counts once it is committed.
+
+        Args:
+            delta: Change in the number of screenshots
+        """
+        self._after_commit(functools.partial(self._apply_count_delta, delta))
+
+    def _apply_count_delta(self, delta: int):
+        """Update the cached counts for committed inserts/deletes.
+
+        Args:
+            delta: Change in the number of screenshots
+        """
+        with self._count_lock:
+            if self._count_cache is not None:
+                self._count_cache += delta
+        self._count_in_range_cached.cache_clear()
+
+    def get_screenshots_version(self) -> int:
+        """Get the persisted version of the screenshots table.
+
+        Triggers bump it in the same transaction as every insert, update and
+        delete, so it only changes once the rows are committed. It lives in
+        the database file, so it is the same for every process and keeps
+        counting up across restarts.
+
+        Returns:
+            Current version number
+        """
+        with self._read_connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM table_versions WHERE name = 'screenshots'"
+            ).fetchone()
+            return row[0] if row else 0
+
+    def get_screenshots_for_day(self, day: datetime, limit: int = 100) -> List[Screenshot]:
+        """Get screenshots captured on a single day.
+
+        Uses a half-open [day, next day) range, so the timestamp index serves
+        both the filter and the ordering.
+
+        Args:
+            day: Day to fetch (time of day is ignored)
+            limit: Maximum number of results
+
+        Returns:
+            List of screenshots, newest first
+        """
+        next_day = day + timedelta(days=1)
+
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT * FROM screenshots
+                WHERE timestamp >= ? AND timestamp < ?
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+                """,
+                (day.strftime("%Y-%m-%d"), next_day.strftime("%Y-%m-%d"), limit),
+            )
+            rows = cursor.fetchall()
+
+            return _SCREENSHOT_LIST.validate_python([dict(row) for row in rows])
+
+    def get_day_fingerprint(self, day: datetime) -> Tuple[int, int, int]:
+        """Summarize the current state of one day's screenshot rows.
+
+        The result changes when screenshots of the day are added, deleted
+        or analyzed, so it can key caches and ETags of per-day analytics.
+
+        Args:
+            day: Day to summarize (time of day is ignored)
+
+        Returns:
+            Tuple of (row count, analyzed count, sum of IDs)
+        """
+        next_day = day + timedelta(days=1)
+
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(analyzed = 1), 0), COALESCE(SUM(id), 0)
+                FROM screenshots
+                WHERE timestamp >= ? AND timestamp < ?
+                """,
+                (day.strftime("%Y-%m-%d"), next_day.strftime("%Y-%m-%d")),
+            )
+            return tuple(cursor.fetchone())
+
+    def get_timeline_rows(self, limit: int = 100) -> List[Tuple[str, Screenshot]]:
+        """Get the most recent screenshots tagged with their capture day.
 
-            if start_date:
-                query += " AND timestamp >= ?"
-                params.append(start_date.isoformat())
-            if end_date:
-                query += " AND timestamp <= ?"
-                params.append(end_date.isoformat())
+        Rows come back ordered by day, so consecutive rows with the same
+        day form one timeline group.
 
-            query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
+        Args:
+            limit: Maximum number of results
 
-            cursor.execute(query, params)
+        Returns:
+            List of (YYYY-MM-DD day, screenshot) tuples, newest first
+        """
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT date(timestamp) AS day, * FROM screenshots
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+                """,
+                (limit,),
+            )
             rows = cursor.fetchall()
 
-            return [Screenshot(**dict(row)) for row in rows]
+            timeline = []
+            for row in rows:
+                data = dict(row)
+                day = data.pop("day")
+                timeline.append((day, Screenshot(**data)))
+            return timeline
 
+    @_serialized_write
     def update_screenshot(
         self, screenshot_id: int, update: ScreenshotUpdate
     ) -> Optional[Screenshot]:
@@ -378,18 +1370,22 @@ class Database:
         if not update_data:
             return self.get_screenshot(screenshot_id)
 
-        set_clause = ", ".join([f"{key} = ?" for key in update_data.keys()])
         values = list(update_data.values())
         values.append(screenshot_id)
 
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
+            # RETURNING reads the updated row back inside the write transaction
             cursor.execute(
-                f"UPDATE screenshots SET {set_clause} WHERE id = ?", values
+                _update_by_id_sql("screenshots", tuple(update_data)) + " RETURNING *", values
             )
-            conn.commit()
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            if "tags" in update_data:
+                self._sync_tags(cursor, screenshot_id, update_data["tags"])
 
-        return self.get_screenshot(screenshot_id)
+        return Screenshot(**dict(row))
 
     def delete_screenshot(self, screenshot_id: int) -> bool:
         """Delete screenshot by ID.
@@ -400,41 +1396,111 @@ class Database:
         Returns:
             True if deleted, False if not found
         """
-        with self._get_connection() as conn:
+        return self.delete_screenshot_returning_path(screenshot_id) is not None
+
+    @_serialized_write
+    def delete_screenshot_returning_path(self, screenshot_id: int) -> Optional[str]:
+        """Delete screenshot by ID and return its file path in the same statement.
+
+        Args:
+            screenshot_id: Screenshot ID
+
+        Returns:
+            File path of the deleted screenshot, or None if not found
+        """
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM screenshots WHERE id = ?", (screenshot_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+            cursor.execute(
+                "DELETE FROM screenshots WHERE id = ? RETURNING filepath", (screenshot_id,)
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        self._adjust_count(-1)
+        return row["filepath"]
 
     def search_screenshots(
-        self, query: str, limit: int = 100, offset: int = 0
+        self,
+        query: Optional[str] = None,
+        tag: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, int]] = None,
     ) -> List[Screenshot]:
-        """Search screenshots by description or tags.
+        """Search screenshots by text, tag and date range.
+
+        Text is matched against description, tags and window title through
+        the FTS5 index; the tag filter is an exact, case-insensitive match
+        on the normalized tag table.
 
         Args:
-            query: Search query
+            query: Free-text search query
+            tag: Tag that matching screenshots must carry
+            start_date: Filter screenshots after this date
+            end_date: Filter screenshots before this date
             limit: Maximum number of results
-            offset: Offset for pagination
+            offset: Offset for pagination (ignored when ``after`` is set)
+            after: Keyset cursor (timestamp, id) of the last row of the previous page
 
         Returns:
             List of matching screenshots
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            search_pattern = f"%{query}%"
+        sql = "SELECT s.* FROM screenshots s"
+        where = []
+        params = []
 
-            cursor.execute(
-                """
-                SELECT * FROM screenshots
-                WHERE description LIKE ? OR tags LIKE ? OR window_title LIKE ?
-                ORDER BY timestamp DESC
-                LIMIT ? OFFSET ?
-                """,
-                (search_pattern, search_pattern, search_pattern, limit, offset),
-            )
+        # Blank filters are treated as absent rather than matching nothing
+        tag = tag.strip() if tag else None
+        query = query.strip() if query else None
+
+        if tag:
+            # NOCASE collation on the tag column makes this a case-insensitive
+            # covering-index lookup, with no lower() per row
+            sql += " JOIN screenshot_tags t ON t.screenshot_id = s.id"
+            where.append("t.tag = ?")
+            params.append(tag)
+
+        if query:
+            if self._fts_enabled:
+                match = _fts_query(query)
+                if match is None:
+                    return []
+                where.append("s.id IN (SELECT rowid FROM screenshots_fts WHERE screenshots_fts MATCH ?)")
+                params.append(match)
+            else:
+                search_pattern = f"%{query}%"
+                where.append("(s.description LIKE ? OR s.tags LIKE ? OR s.window_title LIKE ?)")
+                params.extend([search_pattern, search_pattern, search_pattern])
+
+        if start_date:
+            where.append("s.timestamp >= ?")
+            params.append(start_date.strftime(TIMESTAMP_FORMAT))
+        if end_date:
+            where.append("s.timestamp <= ?")
+            params.append(end_date.strftime(TIMESTAMP_FORMAT))
+        if after:
+            where.append("(s.timestamp, s.id) < (?, ?)")
+            params.extend([after[0].strftime(TIMESTAMP_FORMAT), after[1]])
+
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+
+        sql += " ORDER BY s.timestamp DESC, s.id DESC LIMIT ?"
+        params.append(limit)
+        if not after:
+            sql += " OFFSET ?"
+            params.append(offset)
+
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
             rows = cursor.fetchall()
 
-            return [Screenshot(**dict(row)) for row in rows]
+            return _SCREENSHOT_LIST.validate_python([dict(row) for row in rows])
 
     def find_duplicate_hash(self, image_hash: str) -> Optional[Screenshot]:
         """Find screenshot with matching hash.
@@ -445,7 +1511,7 @@ class Database:
         Returns:
             Screenshot if found, None otherwise
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM screenshots WHERE image_hash = ? ORDER BY timestamp DESC LIMIT 1",
@@ -457,8 +1523,27 @@ class Database:
                 return Screenshot(**dict(row))
             return None
 
+    def get_recent_hashes(self, limit: int) -> List[str]:
+        """Get perceptual hashes of the most recent screenshots.
+
+        Args:
+            limit: Maximum number of hashes
+
+        Returns:
+            Hashes ordered oldest to newest
+        """
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT image_hash FROM screenshots WHERE image_hash IS NOT NULL AND image_hash != '' "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (limit,),
+            )
+            return [row[0] for row in reversed(cursor.fetchall())]
+
     # Activity CRUD operations
 
+    @_serialized_write
     def create_activity(self, activity: ActivityCreate) -> Activity:
         """Create a new activity record.
 
@@ -468,19 +1553,48 @@ class Database:
         Returns:
             Created activity with ID
         """
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
+                """
+                INSERT INTO activities (screenshot_id, activity_type, content)
+                VALUES (?, ?, ?)
+                RETURNING *
+                """,
+                (activity.screenshot_id, activity.activity_type, _pack_text(activity.content)),
+            )
+            created = Activity(**_activity_dict(cursor.fetchone()))
+
+            return created
+
+    @_serialized_write
+    def create_activities_bulk(self, activities: List[ActivityCreate]) -> List[int]:
+        """Create several activity records in one transaction.
+
+        Args:
+            activities: Activity data to create
+
+        Returns:
+            IDs of the created activities, in input order
+        """
+        if not activities:
+            return []
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
                 """
                 INSERT INTO activities (screenshot_id, activity_type, content)
                 VALUES (?, ?, ?)
                 """,
-                (activity.screenshot_id, activity.activity_type, activity.content),
+                [
+                    (activity.screenshot_id, activity.activity_type, _pack_text(activity.content))
+                    for activity in activities
+                ],
             )
-            conn.commit()
+            activity_ids = _inserted_ids(cursor, len(activities))
 
-            activity_id = cursor.lastrowid
-            return self.get_activity(activity_id)
+            return activity_ids
 
     def get_activity(self, activity_id: int) -> Optional[Activity]:
         """Get activity by ID.
@@ -491,13 +1605,13 @@ class Database:
         Returns:
             Activity if found, None otherwise
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM activities WHERE id = ?", (activity_id,))
             row = cursor.fetchone()
 
             if row:
-                return Activity(**dict(row))
+                return Activity(**_activity_dict(row))
             return None
 
     def get_activities_by_screenshot(self, screenshot_id: int) -> List[Activity]:
@@ -509,7 +1623,7 @@ class Database:
         Returns:
             List of activities
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM activities WHERE screenshot_id = ? ORDER BY timestamp DESC",
@@ -517,21 +1631,71 @@ class Database:
             )
             rows = cursor.fetchall()
 
-            return [Activity(**dict(row)) for row in rows]
+            return _ACTIVITY_LIST.validate_python([_activity_dict(row) for row in rows])
+
+    def get_activities_in_range(self, start_date: datetime, end_date: datetime) -> List[Activity]:
+        """Get activities of all screenshots captured within a time range.
+
+        Args:
+            start_date: Include screenshots captured at or after this date
+            end_date: Include screenshots captured at or before this date
+
+        Returns:
+            List of activities
+        """
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT a.* FROM activities a
+                JOIN screenshots s ON s.id = a.screenshot_id
+                WHERE s.timestamp >= ? AND s.timestamp <= ?
+                ORDER BY a.timestamp DESC
+                """,
+                (start_date.strftime(TIMESTAMP_FORMAT), end_date.strftime(TIMESTAMP_FORMAT)),
+            )
+            rows = cursor.fetchall()
+
+            return _ACTIVITY_LIST.validate_python([_activity_dict(row) for row in rows])
 
     # Utility methods
 
     def get_total_screenshots(self) -> int:
         """Get total number of screenshots.
 
+        Counts once, then serves the counter maintained by inserts and deletes.
+
         Returns:
             Total screenshot count
         """
-        with self._get_connection() as conn:
+        with self._count_lock:
+            if self._count_cache is not None:
+                return self._count_cache
+
+        if self._get_connection().in_transaction:
+            # Rows written by this open transaction are counted, but their
+            # deltas are still pending, so the result must not seed the counter
+            return self._count_all()
+
+        # Deltas are applied under the write lock, so counting under it
+        # too keeps every commit either in the count or in a later delta
+        with self._write_lock, self._count_lock:
+            if self._count_cache is None:
+                self._count_cache = self._count_all()
+            return self._count_cache
+
+    def _count_all(self) -> int:
+        """Count every screenshot row.
+
+        Returns:
+            Number of screenshots
+        """
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM screenshots")
             return cursor.fetchone()[0]
 
+    @_serialized_write
     def cleanup_old_screenshots(self, max_count: int) -> int:
         """Delete oldest screenshots if exceeding max_count.
 
@@ -541,34 +1705,47 @@ class Database:
         Returns:
             Number of screenshots deleted
         """
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
 
-            # Get IDs of screenshots to delete
+            # Select and delete in one statement; no IDs round-trip through Python
             cursor.execute(
                 """
-                SELECT id FROM screenshots
-                ORDER BY timestamp DESC
-                LIMIT -1 OFFSET ?
+                DELETE FROM screenshots WHERE id IN (
+                    SELECT id FROM screenshots
+                    ORDER BY timestamp DESC
+                    LIMIT -1 OFFSET ?
+                )
                 """,
                 (max_count,),
             )
-            ids_to_delete = [row[0] for row in cursor.fetchall()]
-
-            if ids_to_delete:
-                placeholders = ",".join("?" * len(ids_to_delete))
-                cursor.execute(
-                    f"DELETE FROM screenshots WHERE id IN ({placeholders})",
-                    ids_to_delete,
-                )
-                conn.commit()
-                logger.info(f"Deleted {len(ids_to_delete)} old screenshots")
-                return len(ids_to_delete)
+            deleted = cursor.rowcount
 
-            return 0
+        if deleted > 0:
+            self._adjust_count(-deleted)
+            logger.info(f"Deleted {deleted} old screenshots")
+        return deleted
 
     # Embedding management methods
 
+    def get_unanalyzed_screenshots(self, limit: int = 10) -> List[Screenshot]:
+        """Get the most recent screenshots that have not been analyzed yet.
+
+        Args:
+            limit: Maximum number of screenshots to return
+
+        Returns:
+            List of unanalyzed screenshots, newest first
+        """
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM screenshots WHERE analyzed = 0 ORDER BY timestamp DESC LIMIT ?",
+                (limit,),
+            )
+            rows = cursor.fetchall()
+            return _SCREENSHOT_LIST.validate_python([dict(row) for row in rows])
+
     def get_screenshots_without_embeddings(self, limit: Optional[int] = None) -> List[Screenshot]:
         """Get screenshots that don't have embeddings generated yet.
 
@@ -578,25 +1755,29 @@ class Database:
         Returns:
             List of screenshots without embeddings
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
 
+            # Predicate matches idx_screenshots_pending_embed so the partial index is used
             query = """
                 SELECT * FROM screenshots
-                WHERE (embedding_generated IS NULL OR embedding_generated = 0)
-                AND analyzed = 1
+                WHERE analyzed = 1
+                AND (embedding_generated IS NULL OR embedding_generated = 0)
                 AND description IS NOT NULL
                 AND description != ''
                 ORDER BY timestamp DESC
             """
+            params = []
 
             if limit:
-                query += f" LIMIT {limit}"
+                query += " LIMIT ?"
+                params.append(limit)
 
-            cursor.execute(query)
+            cursor.execute(query, params)
             rows = cursor.fetchall()
-            return [Screenshot(**dict(row)) for row in rows]
+            return _SCREENSHOT_LIST.validate_python([dict(row) for row in rows])
 
+    @_serialized_write
     def mark_embedding_generated(
         self,
         screenshot_id: int,
@@ -615,7 +1796,7 @@ class Database:
         """
         timestamp = timestamp or datetime.now()
 
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -627,9 +1808,9 @@ class Database:
                 """,
                 (model_name, timestamp, screenshot_id)
             )
-            conn.commit()
             return cursor.rowcount > 0
 
+    @_serialized_write
     def mark_embeddings_generated_batch(
         self,
         screenshot_ids: List[int],
@@ -649,60 +1830,112 @@ class Database:
 
         timestamp = datetime.now()
 
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            placeholders = ",".join("?" * len(screenshot_ids))
             cursor.execute(
-                f"""
+                """
                 UPDATE screenshots
                 SET embedding_generated = 1,
                     embedding_model = ?,
                     embedding_generated_at = ?
-                WHERE id IN ({placeholders})
+                WHERE id IN (SELECT value FROM json_each(?))
                 """,
-                [model_name, timestamp] + screenshot_ids
+                (model_name, timestamp, _json_ids(screenshot_ids))
             )
-            conn.commit()
             return cursor.rowcount
 
-    def get_embedding_stats(self) -> Dict[str, int]:
-        """Get statistics about embedding generation.
+    @_serialized_write
+    def save_analysis_results(
+        self,
+        analyses: List[Tuple[int, str, str, str]],
+        embedded_ids: Optional[List[int]] = None,
+        embedding_model: Optional[str] = None,
+    ) -> int:
+        """Store a batch of AI analysis results in a single transaction.
+
+        Args:
+            analyses: List of (screenshot_id, description, tags, activity_type)
+            embedded_ids: IDs of screenshots whose embeddings were stored
+            embedding_model: Name of embedding model used for embedded_ids
 
         Returns:
-            Dictionary with embedding statistics
+            Number of screenshots updated
         """
-        with self._get_connection() as conn:
+        if not analyses:
+            return 0
+
+        screenshot_ids = [analysis[0] for analysis in analyses]
+
+        with self.transaction() as conn:
             cursor = conn.cursor()
+            cursor.executemany(
+                "UPDATE screenshots SET description = ?, tags = ?, analyzed = 1 WHERE id = ?",
+                [(description, tags, sid) for sid, description, tags, _ in analyses],
+            )
+            updated = cursor.rowcount
 
-            # Total screenshots
-            cursor.execute("SELECT COUNT(*) FROM screenshots")
-            total = cursor.fetchone()[0]
+            cursor.executemany(
+                "DELETE FROM screenshot_tags WHERE screenshot_id = ?",
+                [(sid,) for sid in screenshot_ids],
+            )
+            cursor.executemany(
+                "INSERT OR IGNORE INTO screenshot_tags (screenshot_id, tag) VALUES (?, ?)",
+                [(sid, tag) for sid, _, tags, _ in analyses for tag in _split_tags(tags)],
+            )
+
+            cursor.executemany(
+                "INSERT INTO activities (screenshot_id, activity_type, content) VALUES (?, ?, ?)",
+                [
+                    (sid, activity_type, _pack_text(description))
+                    for sid, description, _, activity_type in analyses
+                ],
+            )
+
+            if embedded_ids:
+                cursor.execute(
+                    """
+                    UPDATE screenshots
+                    SET embedding_generated = 1,
+                        embedding_model = ?,
+                        embedding_generated_at = ?
+                    WHERE id IN (SELECT value FROM json_each(?))
+                    """,
+                    (embedding_model, datetime.now(), _json_ids(embedded_ids)),
+                )
+
+        return updated
 
-            # Analyzed screenshots
-            cursor.execute("SELECT COUNT(*) FROM screenshots WHERE analyzed = 1")
-            analyzed = cursor.fetchone()[0]
+    def get_embedding_stats(self) -> Dict[str, int]:
+        """Get statistics about embedding generation.
 
-            # Screenshots with embeddings
-            cursor.execute("SELECT COUNT(*) FROM screenshots WHERE embedding_generated = 1")
-            with_embeddings = cursor.fetchone()[0]
+        Returns:
+            Dictionary with embedding statistics
+        """
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
 
-            # Screenshots pending embedding
+            # All four counts from a single pass over the table
             cursor.execute("""
-                SELECT COUNT(*) FROM screenshots
-                WHERE analyzed = 1
-                AND (embedding_generated IS NULL OR embedding_generated = 0)
+                SELECT
+                    COUNT(*),
+                    SUM(analyzed = 1),
+                    SUM(embedding_generated = 1),
+                    SUM(analyzed = 1 AND (embedding_generated IS NULL OR embedding_generated = 0))
+                FROM screenshots
             """)
-            pending = cursor.fetchone()[0]
+            total, analyzed, with_embeddings, pending = cursor.fetchone()
 
+            # SUM over an empty table is NULL
             return {
                 "total_screenshots": total,
-                "analyzed_screenshots": analyzed,
-                "with_embeddings": with_embeddings,
-                "pending_embeddings": pending
+                "analyzed_screenshots": analyzed or 0,
+                "with_embeddings": with_embeddings or 0,
+                "pending_embeddings": pending or 0
             }
 
     # Work session methods
 
+    @_serialized_write
     def create_work_session(self, start_time: datetime, end_time: Optional[datetime] = None) -> int:
         """Create a new work session.
 
@@ -713,18 +1946,22 @@ class Database:
         Returns:
             Created session ID
         """
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO work_sessions (start_time, end_time) VALUES (?, ?)",
                 (start_time, end_time)
             )
-            conn.commit()
             return cursor.lastrowid
 
+    @_serialized_write
     def update_work_session(self, session_id: int, **kwargs) -> bool:
         """Update work session fields.
 
+        Setting end_time closes the session; aggregates not passed by the
+        caller are then recomputed from the linked screenshots in the same
+        transaction. Passed values are stored as given.
+
         Args:
             session_id: Session ID
             **kwargs: Fields to update
@@ -735,18 +1972,50 @@ class Database:
         if not kwargs:
             return False
 
-        set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
         values = list(kwargs.values()) + [session_id]
 
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                f"UPDATE work_sessions SET {set_clause} WHERE id = ?",
-                values
-            )
-            conn.commit()
+            cursor.execute(_update_by_id_sql("work_sessions", tuple(kwargs)), values)
+            if cursor.rowcount == 0:
+                return False
+            missing = tuple(column for column in _WORK_SESSION_AGGREGATES if column not in kwargs)
+            if kwargs.get("end_time") is not None and missing:
+                cursor.execute(
+                    _recompute_work_sessions_sql(missing) + " WHERE id = ?", (session_id,)
+                )
+            return True
+
+    @_serialized_write
+    def recompute_work_session(self, session_id: int) -> bool:
+        """Recompute a session's aggregates from its screenshots and activities.
+
+        activity_count, duration_seconds, dominant_activity and
+        productivity_score are computed by SQLite in one UPDATE.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            True if the session exists
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_recompute_work_sessions_sql() + " WHERE id = ?", (session_id,))
             return cursor.rowcount > 0
 
+    @_serialized_write
+    def recompute_open_work_sessions(self) -> int:
+        """Recompute the aggregates of every session that has no end time yet.
+
+        Returns:
+            Number of sessions updated
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_recompute_work_sessions_sql() + " WHERE end_time IS NULL")
+            return cursor.rowcount
+
     def get_work_sessions(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Dict]:
         """Get work sessions within date range.
 
@@ -757,6 +2026,23 @@ class Database:
         Returns:
             List of work sessions
         """
+        return list(self.iter_work_sessions(start_date, end_date))
+
+    def iter_work_sessions(
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> Iterator[Dict]:
+        """Stream work sessions within date range without building a list.
+
+        Rows are read as the caller iterates, on the calling thread's
+        connection, so consume the iterator on the thread that created it.
+
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+
+        Yields:
+            Work session dicts, newest first
+        """
         query = "SELECT * FROM work_sessions WHERE 1=1"
         params = []
 
@@ -769,13 +2055,11 @@ class Database:
 
         query += " ORDER BY start_time DESC"
 
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        yield from _iter_dicts(self._get_connection(), query, params)
 
     # Activity summary methods
 
+    @_serialized_write
     def upsert_activity_summary(self, date: str, activity_type: str, total_seconds: int,
                                  screenshot_count: int, app_breakdown: str) -> bool:
         """Insert or update activity summary for a date.
@@ -790,7 +2074,7 @@ class Database:
         Returns:
             True if successful
         """
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -803,7 +2087,6 @@ class Database:
                 """,
                 (date, activity_type, total_seconds, screenshot_count, app_breakdown)
             )
-            conn.commit()
             return True
 
     def get_activity_summaries(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict]:
@@ -816,6 +2099,23 @@ class Database:
         Returns:
             List of activity summaries
         """
+        return list(self.iter_activity_summaries(start_date, end_date))
+
+    def iter_activity_summaries(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """Stream activity summaries within date range without building a list.
+
+        Rows are read as the caller iterates, on the calling thread's
+        connection, so consume the iterator on the thread that created it.
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+
+        Yields:
+            Activity summary dicts, newest date first
+        """
         query = "SELECT * FROM activity_summaries WHERE 1=1"
         params = []
 
@@ -828,13 +2128,11 @@ class Database:
 
         query += " ORDER BY date DESC, activity_type"
 
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        yield from _iter_dicts(self._get_connection(), query, params)
 
     # Report methods
 
+    @_serialized_write
     def save_report(self, report_type: str, period_start: str, period_end: str, content: str, metadata: Optional[str] = None) -> int:
         """Save a generated report.
 
@@ -848,7 +2146,7 @@ class Database:
         Returns:
             Report ID
         """
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -857,7 +2155,6 @@ class Database:
                 """,
                 (report_type, period_start, period_end, content, metadata)
             )
-            conn.commit()
             return cursor.lastrowid
 
     def get_report(self, report_type: str, period_start: str) -> Optional[Dict]:
@@ -870,7 +2167,7 @@ class Database:
         Returns:
             Report dictionary or None
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM generated_reports WHERE report_type = ? AND period_start = ? ORDER BY generated_at DESC LIMIT 1",
@@ -887,9 +2184,12 @@ class Database:
             limit: Maximum number of reports
 
         Returns:
-            List of reports
+            List of report summaries (without content or metadata)
         """
-        query = "SELECT * FROM generated_reports WHERE 1=1"
+        query = (
+            "SELECT id, report_type, period_start, period_end, generated_at "
+            "FROM generated_reports WHERE 1=1"
+        )
         params = []
 
         if report_type:
@@ -899,13 +2199,48 @@ class Database:
         query += " ORDER BY period_start DESC LIMIT ?"
         params.append(limit)
 
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_report_by_id(self, report_id: int) -> Optional[Dict]:
+        """Get a report by ID.
+
+        Args:
+            report_id: Report ID
+
+        Returns:
+            Report dictionary or None
+        """
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id, report_type, period_start, period_end, content, generated_at, metadata "
+                "FROM generated_reports WHERE id = ?",
+                (report_id,)
+            )
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    @_serialized_write
+    def delete_report(self, report_id: int) -> bool:
+        """Delete a report by ID.
+
+        Args:
+            report_id: Report ID
+
+        Returns:
+            True if deleted, False if not found
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM generated_reports WHERE id = ?", (report_id,))
+            return cursor.rowcount > 0
+
     # TODO methods
 
+    @_serialized_write
     def create_todo(
         self,
         screenshot_id: Optional[int],
@@ -930,7 +2265,7 @@ class Database:
         Returns:
             TODO ID
         """
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """INSERT INTO extracted_todos
@@ -938,15 +2273,58 @@ class Database:
                 VALUES (?, ?, ?, ?, ?, ?, ?)""",
                 (screenshot_id, todo_text, priority, title, due_date, created_by, notes)
             )
-            conn.commit()
             return cursor.lastrowid
 
-    def get_todos(self, status: str = "pending", limit: int = 100) -> List[Dict]:
+    @_serialized_write
+    def create_todos_bulk(self, todos: List[Dict]) -> List[int]:
+        """Create several TODO items in one transaction.
+
+        Args:
+            todos: Dicts with the keyword arguments of ``create_todo``
+                (``screenshot_id`` and ``todo_text`` are required)
+
+        Returns:
+            IDs of the created TODOs, in input order
+        """
+        if not todos:
+            return []
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """INSERT INTO extracted_todos
+                (screenshot_id, todo_text, priority, title, due_date, created_by, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (
+                        todo["screenshot_id"],
+                        todo["todo_text"],
+                        todo.get("priority", "medium"),
+                        todo.get("title"),
+                        todo.get("due_date"),
+                        todo.get("created_by", "ai_extracted"),
+                        todo.get("notes"),
+                    )
+                    for todo in todos
+                ],
+            )
+            todo_ids = _inserted_ids(cursor, len(todos))
+            return todo_ids
+
+    def get_todos(
+        self,
+        status: str = "pending",
+        limit: int = 100,
+        priority: Optional[str] = None,
+        created_by: Optional[str] = None
+    ) -> List[Dict]:
         """Get TODO items.
 
         Args:
             status: Filter by status (pending/completed/all)
             limit: Maximum number of results
+            priority: Filter by priority (low/medium/high, optional)
+            created_by: Filter by creation method (manual/ai_extracted, optional)
 
         Returns:
             List of TODO items
@@ -957,16 +2335,23 @@ class Database:
         if status != "all":
             query += " AND status = ?"
             params.append(status)
+        if priority:
+            query += " AND priority = ?"
+            params.append(priority)
+        if created_by:
+            query += " AND created_by = ?"
+            params.append(created_by)
 
         query += " ORDER BY extracted_at DESC LIMIT ?"
         params.append(limit)
 
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
-    def update_todo_status(self, todo_id: int, status: str) -> bool:
+    @_serialized_write
+    def update_todo_status(self, todo_id: int, status: str) -> Optional[Dict]:
         """Update TODO status.
 
         Args:
@@ -974,18 +2359,18 @@ class Database:
             status: New status (pending/completed)
 
         Returns:
-            True if successful
+            Updated TODO dict, or None if not found
         """
         completed_at = datetime.now() if status == "completed" else None
 
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "UPDATE extracted_todos SET status = ?, completed_at = ? WHERE id = ?",
+                "UPDATE extracted_todos SET status = ?, completed_at = ? WHERE id = ? RETURNING *",
                 (status, completed_at, todo_id)
             )
-            conn.commit()
-            return cursor.rowcount > 0
+            row = cursor.fetchone()
+            return dict(row) if row else None
 
     def get_todo(self, todo_id: int) -> Optional[Dict]:
         """Get a single TODO item by ID.
@@ -996,7 +2381,7 @@ class Database:
         Returns:
             TODO dict or None if not found
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM extracted_todos WHERE id = ?", (todo_id,))
             row = cursor.fetchone()
@@ -1010,9 +2395,12 @@ class Database:
         priority: Optional[str] = None,
         due_date: Optional[str] = None,
         notes: Optional[str] = None
-    ) -> bool:
+    ) -> Optional[Dict]:
         """Update a TODO item.
 
+        An update with no fields is a plain read and never goes through
+        the writer queue.
+
         Args:
             todo_id: TODO ID
             title: New title (optional)
@@ -1022,39 +2410,46 @@ class Database:
             notes: New notes (optional)
 
         Returns:
-            True if successful
+            Updated TODO dict (unchanged if no fields were given), or None if not found
         """
-        updates = []
-        params = []
+        fields = {
+            column: value
+            for column, value in (
+                ("title", title),
+                ("todo_text", todo_text),
+                ("priority", priority),
+                ("due_date", due_date),
+                ("notes", notes),
+            )
+            if value is not None
+        }
 
-        if title is not None:
-            updates.append("title = ?")
-            params.append(title)
-        if todo_text is not None:
-            updates.append("todo_text = ?")
-            params.append(todo_text)
-        if priority is not None:
-            updates.append("priority = ?")
-            params.append(priority)
-        if due_date is not None:
-            updates.append("due_date = ?")
-            params.append(due_date)
-        if notes is not None:
-            updates.append("notes = ?")
-            params.append(notes)
-
-        if not updates:
-            return False
+        if not fields:
+            return self.get_todo(todo_id)
 
-        params.append(todo_id)
-        query = f"UPDATE extracted_todos SET {', '.join(updates)} WHERE id = ?"
+        return self._update_todo_fields(todo_id, fields)
+
+    @_serialized_write
+    def _update_todo_fields(self, todo_id: int, fields: Dict[str, Any]) -> Optional[Dict]:
+        """Write TODO fields and return the updated row.
+
+        Args:
+            todo_id: TODO ID
+            fields: Column values to set
 
-        with self._get_connection() as conn:
+        Returns:
+            Updated TODO dict, or None if not found
+        """
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor.rowcount > 0
+            cursor.execute(
+                _update_by_id_sql("extracted_todos", tuple(fields)) + " RETURNING *",
+                list(fields.values()) + [todo_id]
+            )
+            row = cursor.fetchone()
+            return dict(row) if row else None
 
+    @_serialized_write
     def delete_todo(self, todo_id: int) -> bool:
         """Delete a TODO item.
 
@@ -1064,10 +2459,9 @@ class Database:
         Returns:
             True if successful
         """
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM extracted_todos WHERE id = ?", (todo_id,))
-            conn.commit()
             return cursor.rowcount > 0
 
     def get_todos_by_date_range(
@@ -1104,7 +2498,7 @@ class Database:
         query += " ORDER BY due_date ASC, priority DESC LIMIT ?"
         params.append(limit)
 
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
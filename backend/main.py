@@ -1,10 +1,15 @@
 """FastAPI application entry point for MineContext-v2."""
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from loguru import logger
 
@@ -31,13 +36,20 @@ async def lifespan(app: FastAPI):
     logger.info(f"Database: {settings.storage.database_path}")
     logger.info(f"Screenshot directory: {settings.capture.screenshot_dir}")
 
+    # Cap the worker threads used by asyncio.to_thread for blocking DB work
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+    )
+    # Sync routes run in anyio's threadpool; raise its default limit of 40
+    to_thread.current_default_thread_limiter().total_tokens = 100
+
     # Ensure directories exist
-    Path(settings.capture.screenshot_dir).mkdir(parents=True, exist_ok=True)
+    settings.capture.screenshot_dir.mkdir(parents=True, exist_ok=True)
 
     # Auto-start capture if configured
     if settings.capture.auto_start:
         from backend.capture import capture_service
-        capture_service.start()
+        await capture_service.start()
         logger.info("Screenshot capture auto-started")
 
     yield
@@ -46,7 +58,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down MineContext-v2 server")
     from backend.capture import capture_service
     if capture_service.is_running:
-        capture_service.stop()
+        await capture_service.stop()
         logger.info("Screenshot capture stopped")
 
 
@@ -67,6 +79,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (report markdown, screenshot lists)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include API routes
 app.include_router(router, prefix="/api")
 app.include_router(analytics_router, prefix="/api", tags=["Analytics"])
@@ -86,7 +101,7 @@ if TODOLIST_AVAILABLE:
 
 # Mount static directories
 # Serve screenshots
-screenshots_dir = Path(settings.capture.screenshot_dir)
+screenshots_dir = settings.capture.screenshot_dir
 if screenshots_dir.exists():
     app.mount("/screenshots", StaticFiles(directory=str(screenshots_dir)), name="screenshots")
 
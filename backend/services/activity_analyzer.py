@@ -14,7 +14,13 @@ from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 
+from backend.cache import PAST_TTL_SECONDS, TTLCache
 from backend.database import db
+from backend.utils.date_utils import parse_ymd
+
+
+# Summaries of past days, keyed by YYYY-MM-DD and the day's row fingerprint
+_past_daily_summaries = TTLCache(maxsize=512)
 
 
 class ActivityAnalyzer:
@@ -49,81 +55,170 @@ class ActivityAnalyzer:
             if not screenshots:
                 return self._empty_stats()
 
-            # Calculate basic metrics
-            total_screenshots = len(screenshots)
-            analyzed_count = sum(1 for s in screenshots if s.analyzed)
+            activities_by_screenshot = self._group_activities(
+                db.get_activities_in_range(start_time, end_time)
+            )
 
-            # Activity breakdown
-            activity_breakdown = Counter()
-            app_usage = Counter()
-            hourly_distribution = defaultdict(int)
-            app_switching_count = 0
-            previous_app = None
+            return self._summarize_screenshots(
+                screenshots, activities_by_screenshot, start_time, end_time
+            )
 
-            for screenshot in screenshots:
-                # Get activities for this screenshot
-                activities = db.get_activities_by_screenshot(screenshot.id)
+        except Exception as e:
+            logger.error(f"Error analyzing time range: {e}")
+            return self._empty_stats()
 
-                for activity in activities:
-                    activity_breakdown[activity.activity_type] += 1
+    def get_daily_summaries_range(self, start_date: datetime, end_date: datetime) -> Dict[str, Dict]:
+        """Get daily summaries for every day in a range.
 
-                # Track app usage
-                if screenshot.app_name:
-                    app_usage[screenshot.app_name] += 1
+        Screenshots and activities are fetched once for the whole range and
+        grouped by day in memory, instead of querying once per day.
 
-                    # Count app switches
-                    if previous_app and previous_app != screenshot.app_name:
-                        app_switching_count += 1
-                    previous_app = screenshot.app_name
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range (inclusive)
 
-                # Hourly distribution
-                hour = screenshot.timestamp.hour
-                hourly_distribution[hour] += 1
+        Returns:
+            Dictionary mapping date strings (YYYY-MM-DD) to daily summaries.
+            Days without screenshots are omitted.
+        """
+        range_start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        range_end = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        days = (range_end - range_start).days + 1
 
-            # Calculate productivity score
-            productivity_score = self._calculate_productivity_score(
-                screenshots,
-                activity_breakdown,
-                app_switching_count
+        try:
+            screenshots = db.get_screenshots(
+                start_date=range_start,
+                end_date=range_end,
+                limit=10000 * days
+            )
+            activities_by_screenshot = self._group_activities(
+                db.get_activities_in_range(range_start, range_end)
             )
 
-            # Detect work sessions
-            sessions = self._detect_work_sessions(screenshots)
-
-            # Calculate duration
-            duration_seconds = int((end_time - start_time).total_seconds())
-
-            return {
-                "period": {
-                    "start": start_time.isoformat(),
-                    "end": end_time.isoformat(),
-                    "duration_seconds": duration_seconds
-                },
-                "statistics": {
-                    "total_screenshots": total_screenshots,
-                    "analyzed_screenshots": analyzed_count,
-                    "analysis_rate": analyzed_count / total_screenshots if total_screenshots > 0 else 0,
-                    "app_switches": app_switching_count,
-                    "work_sessions": len(sessions)
-                },
-                "activity_breakdown": dict(activity_breakdown),
-                "app_usage": dict(app_usage.most_common(10)),
-                "hourly_distribution": dict(hourly_distribution),
-                "productivity_score": productivity_score,
-                "sessions": sessions
-            }
+            screenshots_by_day = defaultdict(list)
+            for screenshot in screenshots:
+                screenshots_by_day[screenshot.timestamp.strftime("%Y-%m-%d")].append(screenshot)
+
+            summaries = {}
+            for day, day_screenshots in screenshots_by_day.items():
+                day_start = parse_ymd(day)
+                day_end = day_start.replace(hour=23, minute=59, second=59, microsecond=999999)
+                summaries[day] = self._summarize_screenshots(
+                    day_screenshots, activities_by_screenshot, day_start, day_end
+                )
+
+            return summaries
 
         except Exception as e:
-            logger.error(f"Error analyzing time range: {e}")
-            return self._empty_stats()
+            logger.error(f"Error analyzing daily summaries: {e}")
+            return {}
+
+    def _group_activities(self, activities: List) -> Dict[int, List]:
+        """Group activities by their screenshot ID.
+
+        Args:
+            activities: List of activity objects
+
+        Returns:
+            Dictionary mapping screenshot IDs to their activities
+        """
+        activities_by_screenshot = defaultdict(list)
+        for activity in activities:
+            activities_by_screenshot[activity.screenshot_id].append(activity)
+        return activities_by_screenshot
+
+    def _summarize_screenshots(
+        self,
+        screenshots: List,
+        activities_by_screenshot: Dict[int, List],
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict:
+        """Build statistics for screenshots captured within a period.
+
+        Args:
+            screenshots: List of screenshot objects in the period
+            activities_by_screenshot: Activities keyed by screenshot ID
+            start_time: Start of the period
+            end_time: End of the period
+
+        Returns:
+            Dictionary containing comprehensive statistics
+        """
+        # Calculate basic metrics
+        total_screenshots = len(screenshots)
+        analyzed_count = sum(1 for s in screenshots if s.analyzed)
+
+        # Activity breakdown
+        activity_breakdown = Counter()
+        app_usage = Counter()
+        hourly_distribution = defaultdict(int)
+        app_switching_count = 0
+        previous_app = None
+
+        for screenshot in screenshots:
+            for activity in activities_by_screenshot.get(screenshot.id, []):
+                activity_breakdown[activity.activity_type] += 1
+
+            # Track app usage
+            if screenshot.app_name:
+                app_usage[screenshot.app_name] += 1
+
+                # Count app switches
+                if previous_app and previous_app != screenshot.app_name:
+                    app_switching_count += 1
+                previous_app = screenshot.app_name
+
+            # Hourly distribution
+            hour = screenshot.timestamp.hour
+            hourly_distribution[hour] += 1
+
+        # Calculate productivity score
+        productivity_score = self._calculate_productivity_score(
+            screenshots,
+            activity_breakdown,
+            app_switching_count
+        )
+
+        # Detect work sessions
+        sessions = self._detect_work_sessions(screenshots, activities_by_screenshot)
 
-    def _detect_work_sessions(self, screenshots: List) -> List[Dict]:
+        # Calculate duration
+        duration_seconds = int((end_time - start_time).total_seconds())
+
+        return {
+            "period": {
+                "start": start_time.isoformat(),
+                "end": end_time.isoformat(),
+                "duration_seconds": duration_seconds
+            },
+            "statistics": {
+                "total_screenshots": total_screenshots,
+                "analyzed_screenshots": analyzed_count,
+                "analysis_rate": analyzed_count / total_screenshots if total_screenshots > 0 else 0,
+                "app_switches": app_switching_count,
+                "work_sessions": len(sessions)
+            },
+            "activity_breakdown": dict(activity_breakdown),
+            "app_usage": dict(app_usage.most_common(10)),
+            "hourly_distribution": dict(hourly_distribution),
+            "productivity_score": productivity_score,
+            "sessions": sessions
+        }
+
+    def _detect_work_sessions(
+        self,
+        screenshots: List,
+        activities_by_screenshot: Optional[Dict[int, List]] = None
+    ) -> List[Dict]:
         """Detect work sessions from screenshots.
 
         Sessions are periods of continuous activity (gaps < threshold).
 
         Args:
             screenshots: List of screenshot objects
+            activities_by_screenshot: Prefetched activities keyed by screenshot ID
+                (queried per screenshot if omitted)
 
         Returns:
             List of session dictionaries
@@ -148,20 +243,26 @@ class ActivityAnalyzer:
             else:
                 # End current session, start new one
                 if current_session_shots:
-                    sessions.append(self._create_session_summary(current_session_shots))
+                    sessions.append(self._create_session_summary(current_session_shots, activities_by_screenshot))
                 current_session_shots = [current]
 
         # Add final session
         if current_session_shots:
-            sessions.append(self._create_session_summary(current_session_shots))
+            sessions.append(self._create_session_summary(current_session_shots, activities_by_screenshot))
 
         return sessions
 
-    def _create_session_summary(self, screenshots: List) -> Dict:
+    def _create_session_summary(
+        self,
+        screenshots: List,
+        activities_by_screenshot: Optional[Dict[int, List]] = None
+    ) -> Dict:
         """Create summary for a work session.
 
         Args:
             screenshots: List of screenshots in the session
+            activities_by_screenshot: Prefetched activities keyed by screenshot ID
+                (queried per screenshot if omitted)
 
         Returns:
             Session summary dictionary
@@ -176,7 +277,10 @@ class ActivityAnalyzer:
         # Get activity types
         activity_types = Counter()
         for screenshot in screenshots:
-            activities = db.get_activities_by_screenshot(screenshot.id)
+            if activities_by_screenshot is not None:
+                activities = activities_by_screenshot.get(screenshot.id, [])
+            else:
+                activities = db.get_activities_by_screenshot(screenshot.id)
             for activity in activities:
                 activity_types[activity.activity_type] += 1
 
@@ -285,6 +389,40 @@ class ActivityAnalyzer:
 
         return self.analyze_time_range(start_of_day, end_of_day)
 
+    def get_daily_summary_cached(self, date: datetime) -> Dict:
+        """Get summary for a specific day, memoizing days that are over.
+
+        Past-day summaries are kept in-process, keyed on the day's current
+        screenshot rows, so analyzing or deleting screenshots of that day
+        recomputes it. Today is always recomputed.
+
+        Args:
+            date: Date to analyze
+
+        Returns:
+            Daily summary dictionary
+        """
+        if date.date() >= datetime.now().date():
+            return self.get_daily_summary(date)
+
+        date_iso = date.strftime("%Y-%m-%d")
+        day = parse_ymd(date_iso)
+        fingerprint = db.get_day_fingerprint(day)
+        key = f"{date_iso}:" + ":".join(str(part) for part in fingerprint)
+        summary = _past_daily_summaries.get(key)
+        if summary is None:
+            summary = self.get_daily_summary(day)
+            _past_daily_summaries.set(key, summary, PAST_TTL_SECONDS)
+        return summary
+
+    def forget_daily_summary(self, date: str) -> None:
+        """Drop the memoized summaries of a day.
+
+        Args:
+            date: Date string (YYYY-MM-DD)
+        """
+        _past_daily_summaries.delete_prefix(f"{date}:")
+
     def get_weekly_summary(self, start_date: datetime) -> Dict:
         """Get summary for a week.
 
@@ -333,7 +471,7 @@ class ActivityAnalyzer:
             True if successful
         """
         try:
-            date_obj = datetime.strptime(date, "%Y-%m-%d")
+            date_obj = parse_ymd(date)
             summary = self.get_daily_summary(date_obj)
 
             # Store each activity type
@@ -64,21 +64,15 @@ class ContextResurfacingService:
 
             similar_items = vector_store.search_similar(
                 query_embedding=embedding,
-                top_k=max_results + 1,  # +1 to exclude self
-                min_similarity=min_similarity
+                top_k=max_results,
+                min_similarity=min_similarity,
+                exclude_ids={screenshot_id}
             )
 
-            # Filter out the screenshot itself
-            related = [
-                SimilarScreenshot(**item)
-                for item in similar_items
-                if item['screenshot_id'] != screenshot_id
-            ]
+            related = [SimilarScreenshot(**item) for item in similar_items]
 
             # Apply relevance decay based on time
-            related = self._apply_relevance_decay(related)
-
-            return related[:max_results]
+            return self._apply_relevance_decay(related)
 
         except Exception as e:
             logger.error(f"Error finding related contexts for screenshot {screenshot_id}: {e}")
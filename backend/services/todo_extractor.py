@@ -102,18 +102,19 @@ class TodoExtractorService:
 
             todos = self._parse_todo_response(description)
 
-            # Store in database
+            # Store in database, all TODOs of the screenshot in one transaction
             stored_count = 0
-            for todo in todos:
-                try:
-                    db.create_todo(
-                        screenshot_id=screenshot_id,
-                        todo_text=todo['task'],
-                        priority=todo['priority'].lower()
-                    )
-                    stored_count += 1
-                except Exception as e:
-                    logger.error(f"Error storing TODO: {e}")
+            try:
+                stored_count = len(db.create_todos_bulk([
+                    {
+                        'screenshot_id': screenshot_id,
+                        'todo_text': todo['task'],
+                        'priority': todo['priority'].lower()
+                    }
+                    for todo in todos
+                ]))
+            except Exception as e:
+                logger.error(f"Error storing TODOs: {e}")
 
             return {
                 'success': True,
@@ -270,7 +271,7 @@ class TodoExtractorService:
             True if successful
         """
         try:
-            return db.update_todo_status(todo_id, 'completed')
+            return db.update_todo_status(todo_id, 'completed') is not None
         except Exception as e:
             logger.error(f"Error marking TODO completed: {e}")
             return False
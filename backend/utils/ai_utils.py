@@ -1,6 +1,8 @@
 """AI/LLM integration utilities for MineContext-v2."""
 
+import asyncio
 import base64
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -303,7 +305,7 @@ def get_vision_client():
 async def analyze_screenshot_async(
     image_path: str, prompt: Optional[str] = None
 ) -> Tuple[bool, Optional[Dict[str, str]], Optional[str]]:
-    """Analyze screenshot asynchronously (wrapper for sync function).
+    """Analyze screenshot asynchronously (runs the sync client in a worker thread).
 
     Args:
         image_path: Path to screenshot file
@@ -314,12 +316,31 @@ async def analyze_screenshot_async(
     """
     try:
         client = get_vision_client()
-        return client.analyze_screenshot(image_path, prompt)
     except Exception as e:
         error_msg = f"Failed to get vision client: {str(e)}"
         logger.error(error_msg)
         return False, None, error_msg
 
+    return await asyncio.to_thread(client.analyze_screenshot, image_path, prompt)
+
+
+# Common activity keywords
+_ACTIVITY_KEYWORDS = frozenset({
+    "code", "coding", "programming", "development", "debug", "debugging",
+    "browse", "browsing", "web", "internet", "search", "reading",
+    "design", "designing", "edit", "editing", "create", "creating",
+    "write", "writing", "document", "email", "chat", "messaging",
+    "video", "watch", "watching", "meeting", "conference",
+    "terminal", "command", "shell", "database", "data"
+})
+
+# Common application keywords
+_APP_KEYWORDS = frozenset({
+    "vscode", "chrome", "firefox", "safari", "slack", "zoom",
+    "terminal", "finder", "explorer", "photoshop", "figma",
+    "notion", "github", "gitlab", "jira", "trello"
+})
+
 
 def extract_tags_from_description(description: str, max_tags: int = 5) -> List[str]:
     """Extract potential tags from a description using simple heuristics.
@@ -331,28 +352,25 @@ def extract_tags_from_description(description: str, max_tags: int = 5) -> List[s
     Returns:
         List of tags
     """
-    # Common activity keywords
-    activity_keywords = {
-        "code", "coding", "programming", "development", "debug", "debugging",
-        "browse", "browsing", "web", "internet", "search", "reading",
-        "design", "designing", "edit", "editing", "create", "creating",
-        "write", "writing", "document", "email", "chat", "messaging",
-        "video", "watch", "watching", "meeting", "conference",
-        "terminal", "command", "shell", "database", "data"
-    }
-
-    # Common application keywords
-    app_keywords = {
-        "vscode", "chrome", "firefox", "safari", "slack", "zoom",
-        "terminal", "finder", "explorer", "photoshop", "figma",
-        "notion", "github", "gitlab", "jira", "trello"
-    }
+    return list(_extract_tags_cached(description, max_tags))
+
+
+@lru_cache(maxsize=4096)
+def _extract_tags_cached(description: str, max_tags: int) -> Tuple[str, ...]:
+    """Memoized tag extraction; returns an immutable tuple so cached values can't be mutated.
 
+    Args:
+        description: Description text
+        max_tags: Maximum number of tags to return
+
+    Returns:
+        Tuple of tags
+    """
     description_lower = description.lower()
     found_tags = []
 
     # Find activity keywords
-    for keyword in activity_keywords:
+    for keyword in _ACTIVITY_KEYWORDS:
         if keyword in description_lower and keyword not in found_tags:
             found_tags.append(keyword)
             if len(found_tags) >= max_tags:
@@ -360,15 +378,16 @@ def extract_tags_from_description(description: str, max_tags: int = 5) -> List[s
 
     # Find app keywords
     if len(found_tags) < max_tags:
-        for keyword in app_keywords:
+        for keyword in _APP_KEYWORDS:
             if keyword in description_lower and keyword not in found_tags:
                 found_tags.append(keyword)
                 if len(found_tags) >= max_tags:
                     break
 
-    return found_tags[:max_tags]
+    return tuple(found_tags[:max_tags])
 
 
+@lru_cache(maxsize=4096)
 def categorize_activity(description: str, activity: str) -> str:
     """Categorize activity type from description and activity field.
 
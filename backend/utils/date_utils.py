@@ -0,0 +1,49 @@
+"""Date parsing utilities for MineContext-v2."""
+
+from datetime import date, datetime, time
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def parse_ymd(value: str) -> datetime:
+    """Parse a YYYY-MM-DD date string.
+
+    Uses the C-implemented ``date.fromisoformat`` instead of ``strptime``
+    and memoizes results, since the same handful of dates is requested
+    over and over. Other ISO forms it would accept (``YYYYMMDD``, week
+    dates, times) are rejected, so every accepted input has one spelling.
+
+    Args:
+        value: Date string (YYYY-MM-DD)
+
+    Returns:
+        Datetime at midnight of the given date
+
+    Raises:
+        ValueError: If the string is not a valid date
+    """
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+    return datetime.combine(date.fromisoformat(value), time())
+
+
+@lru_cache(maxsize=1024)
+def parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing ``Z`` for UTC.
+
+    Results are memoized like ``parse_ymd``; failed parses raise and are
+    therefore never cached.
+
+    Args:
+        value: ISO 8601 string (e.g. YYYY-MM-DDTHH:MM:SS or ...Z)
+
+    Returns:
+        Parsed datetime
+
+    Raises:
+        ValueError: If the string is not a valid ISO timestamp
+    """
+    # Only allocate a rewritten string when there actually is a UTC suffix
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
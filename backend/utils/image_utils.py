@@ -2,31 +2,34 @@
 
 import os
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple, Union
 
 import imagehash
+import numpy as np
 from PIL import Image
 from loguru import logger
 
 from backend.config import settings
 
 
-def calculate_perceptual_hash(image_path: str) -> str:
+def calculate_perceptual_hash(image: Union[str, Image.Image]) -> str:
     """Calculate perceptual hash of an image.
 
     Args:
-        image_path: Path to the image file
+        image: Path to the image file, or an image already in memory
 
     Returns:
         Hexadecimal string representation of the perceptual hash
     """
     try:
-        with Image.open(image_path) as img:
-            # Use average hash for faster computation
-            hash_value = imagehash.average_hash(img)
-            return str(hash_value)
+        # Use average hash for faster computation
+        if isinstance(image, Image.Image):
+            return str(imagehash.average_hash(image))
+
+        with Image.open(image) as img:
+            return str(imagehash.average_hash(img))
     except Exception as e:
-        logger.error(f"Error calculating hash for {image_path}: {e}")
+        logger.error(f"Error calculating hash for {image}: {e}")
         return ""
 
 
@@ -68,6 +71,84 @@ def are_images_similar(hash1: str, hash2: str, threshold: Optional[int] = None)
     return difference <= threshold
 
 
+def _popcount_unpacked(values: np.ndarray) -> np.ndarray:
+    """Count set bits per uint64 by unpacking to individual bits (NumPy < 2.0)."""
+    return np.unpackbits(values.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+# NumPy 2.0+ has a native popcount ufunc; older versions unpack the bits
+_popcount = getattr(np, "bitwise_count", _popcount_unpacked)
+
+
+class HashHistory:
+    """Ring buffer of recent 64-bit perceptual hashes for near-duplicate checks.
+
+    Hashes are kept as a ``uint64`` array so the Hamming distance to every
+    entry is computed in one vectorized XOR and popcount pass.
+    """
+
+    def __init__(self, size: int):
+        """Initialize history.
+
+        Args:
+            size: Maximum number of hashes kept before overwriting the oldest
+        """
+        self._hashes = np.zeros(size, dtype=np.uint64)
+        self._count = 0
+        self._next = 0
+
+    @staticmethod
+    def _to_int(image_hash: str) -> Optional[int]:
+        """Convert a 64-bit hex hash to an integer, or None if it is not one."""
+        if len(image_hash) != 16:
+            return None
+        try:
+            return int(image_hash, 16)
+        except ValueError:
+            return None
+
+    def add(self, image_hash: str) -> None:
+        """Record a hash, overwriting the oldest once full.
+
+        Args:
+            image_hash: Hexadecimal perceptual hash
+        """
+        value = self._to_int(image_hash)
+        if value is None:
+            return
+
+        self._hashes[self._next] = value
+        self._next = (self._next + 1) % len(self._hashes)
+        self._count = min(self._count + 1, len(self._hashes))
+
+    def extend(self, image_hashes: Iterable[str]) -> None:
+        """Record several hashes, oldest first.
+
+        Args:
+            image_hashes: Hexadecimal perceptual hashes
+        """
+        for image_hash in image_hashes:
+            self.add(image_hash)
+
+    def has_similar(self, image_hash: str, threshold: Optional[int] = None) -> bool:
+        """Check whether any recorded hash is within the similarity threshold.
+
+        Args:
+            image_hash: Hexadecimal perceptual hash
+            threshold: Maximum hash difference to consider similar (default from config)
+
+        Returns:
+            True if a similar hash is recorded, False otherwise
+        """
+        value = self._to_int(image_hash)
+        if value is None or self._count == 0:
+            return False
+
+        threshold = threshold or settings.capture.hash_threshold
+        distances = _popcount(self._hashes[:self._count] ^ np.uint64(value))
+        return bool(distances.min() <= threshold)
+
+
 def compress_image(
     input_path: str,
     output_path: Optional[str] = None,
@@ -90,21 +171,7 @@ def compress_image(
 
     try:
         with Image.open(input_path) as img:
-            # Convert RGBA to RGB if necessary
-            if img.mode == "RGBA":
-                rgb_img = Image.new("RGB", img.size, (255, 255, 255))
-                rgb_img.paste(img, mask=img.split()[3])
-                img = rgb_img
-            elif img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Resize if max_size is specified
-            if max_size:
-                img.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-            # Save with compression
-            img.save(output_path, "JPEG", quality=quality, optimize=True)
-            logger.debug(f"Compressed image saved to {output_path}")
+            save_compressed_image(img, output_path, quality=quality, max_size=max_size)
 
     except Exception as e:
         logger.error(f"Error compressing image {input_path}: {e}")
@@ -116,6 +183,41 @@ def compress_image(
     return output_path
 
 
+def save_compressed_image(
+    img: Image.Image,
+    output_path: str,
+    quality: Optional[int] = None,
+    max_size: Optional[Tuple[int, int]] = None,
+    optimize: bool = True,
+) -> None:
+    """Save an in-memory image as a compressed JPEG.
+
+    Args:
+        img: Image to save
+        output_path: Path to save compressed image
+        quality: JPEG quality (1-100, default from config)
+        max_size: Maximum dimensions (width, height). If provided, image will be resized.
+        optimize: Run the extra Huffman-table pass for a slightly smaller file
+    """
+    quality = quality or settings.storage.quality
+
+    # Convert RGBA to RGB if necessary
+    if img.mode == "RGBA":
+        rgb_img = Image.new("RGB", img.size, (255, 255, 255))
+        rgb_img.paste(img, mask=img.split()[3])
+        img = rgb_img
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    # Resize if max_size is specified
+    if max_size:
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    # Save with compression
+    img.save(output_path, "JPEG", quality=quality, optimize=optimize)
+    logger.debug(f"Compressed image saved to {output_path}")
+
+
 def get_image_size(image_path: str) -> Tuple[int, int]:
     """Get image dimensions.
 
@@ -155,7 +257,7 @@ def ensure_screenshot_dir() -> Path:
     Returns:
         Path object for screenshot directory
     """
-    screenshot_dir = Path(settings.capture.screenshot_dir)
+    screenshot_dir = settings.capture.screenshot_dir
     screenshot_dir.mkdir(parents=True, exist_ok=True)
     return screenshot_dir
 
@@ -182,7 +284,7 @@ def cleanup_screenshots(keep_count: int) -> int:
     Returns:
         Number of files deleted
     """
-    screenshot_dir = Path(settings.capture.screenshot_dir)
+    screenshot_dir = settings.capture.screenshot_dir
 
     if not screenshot_dir.exists():
         return 0
@@ -1,7 +1,7 @@
 """Vector store operations using ChromaDB for MineContext-v2."""
 
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import chromadb
 import numpy as np
@@ -29,14 +29,13 @@ class VectorStore:
 
         try:
             # Ensure vector DB directory exists
-            from pathlib import Path
-            Path(settings.vector_db.path).mkdir(parents=True, exist_ok=True)
+            settings.vector_db.path.mkdir(parents=True, exist_ok=True)
 
             # Initialize ChromaDB client with persistent storage
             logger.info(f"Initializing ChromaDB at {settings.vector_db.path}")
 
             self.client = chromadb.PersistentClient(
-                path=settings.vector_db.path,
+                path=str(settings.vector_db.path),
                 settings=ChromaSettings(
                     anonymized_telemetry=False,
                     allow_reset=True
@@ -185,7 +184,8 @@ class VectorStore:
         self,
         query_embedding: np.ndarray,
         top_k: Optional[int] = None,
-        min_similarity: Optional[float] = None
+        min_similarity: Optional[float] = None,
+        exclude_ids: Optional[Set[int]] = None
     ) -> List[Dict]:
         """Search for similar screenshots using embedding.
 
@@ -193,6 +193,7 @@ class VectorStore:
             query_embedding: Query embedding vector
             top_k: Number of results to return
             min_similarity: Minimum similarity threshold (0-1)
+            exclude_ids: Screenshot IDs to leave out of the results
 
         Returns:
             List of result dictionaries with screenshot_id, similarity, and metadata
@@ -208,10 +209,13 @@ class VectorStore:
             # Convert numpy array to list
             query_list = query_embedding.tolist() if isinstance(query_embedding, np.ndarray) else query_embedding
 
+            exclude_ids = exclude_ids or set()
+
             # Query collection
             results = self.collection.query(
                 query_embeddings=[query_list],
-                n_results=top_k * 2  # Get more results to filter by threshold
+                # Get more results to filter by threshold and exclusions
+                n_results=top_k * 2 + len(exclude_ids)
             )
 
             # Process results
@@ -220,6 +224,8 @@ class VectorStore:
                 for i, screenshot_id_str in enumerate(results['ids'][0]):
                     # Extract screenshot ID
                     screenshot_id = int(screenshot_id_str.replace("screenshot_", ""))
+                    if screenshot_id in exclude_ids:
+                        continue
 
                     # Get distance and convert to similarity (ChromaDB returns L2 distance)
                     distance = results['distances'][0][i]
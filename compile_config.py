@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+"""Compile config/config.yaml to JSON so the server can skip YAML parsing at startup.
+
+The server reads the JSON only while it is at least as new as the YAML,
+so editing config.yaml without recompiling is always safe.
+"""
+
+import argparse
+
+from backend.config import compile_config
+
+
+def main():
+    """Compile the YAML config given on the command line."""
+    parser = argparse.ArgumentParser(description='Compile config.yaml to config.json')
+    parser.add_argument(
+        'config_path',
+        nargs='?',
+        default='config/config.yaml',
+        help='Path to the YAML configuration file (default: config/config.yaml)'
+    )
+    args = parser.parse_args()
+
+    json_path = compile_config(args.config_path)
+    print(f"Compiled {args.config_path} -> {json_path}")
+
+
+if __name__ == '__main__':
+    main()
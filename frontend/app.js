@@ -8,6 +8,8 @@ const ITEMS_PER_PAGE = 20;
 let state = {
     currentView: 'gallery',
     currentPage: 1,
+    // Keyset cursor for each page: pageCursors[n - 1] fetches page n
+    pageCursors: [null],
     totalScreenshots: 0,
     screenshots: [],
     searchQuery: '',
@@ -27,8 +29,10 @@ let state = {
 
 // API Client
 const API = {
-    async getScreenshots(limit = ITEMS_PER_PAGE, offset = 0) {
-        const response = await fetch(`${API_BASE}/screenshots?limit=${limit}&offset=${offset}`);
+    async getScreenshots(limit = ITEMS_PER_PAGE, after = null) {
+        const params = new URLSearchParams({ limit });
+        if (after) params.set('after', after);
+        const response = await fetch(`${API_BASE}/screenshots?${params}`);
         if (!response.ok) throw new Error('Failed to fetch screenshots');
         return await response.json();
     },
@@ -57,11 +61,11 @@ const API = {
         return await response.json();
     },
 
-    async searchScreenshots(query, limit = ITEMS_PER_PAGE, offset = 0) {
+    async searchScreenshots(query, limit = ITEMS_PER_PAGE, after = null) {
         const response = await fetch(`${API_BASE}/screenshots/search`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ query, limit, offset })
+            body: JSON.stringify({ query, limit, after })
         });
         if (!response.ok) throw new Error('Failed to search screenshots');
         return await response.json();
@@ -111,12 +115,40 @@ const API = {
         return await response.json();
     },
 
-    async analyzeBatch(limit = 10) {
+    async analyzeBatch(limit = 10, onProgress = null) {
         const response = await fetch(`${API_BASE}/screenshots/analyze-batch?limit=${limit}`, {
-            method: 'POST'
+            method: 'POST',
+            headers: { 'Accept': 'text/event-stream' }
         });
         if (!response.ok) throw new Error('Failed to analyze batch');
-        return await response.json();
+
+        // Read Server-Sent Events: one per screenshot, then a summary with done=true
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let summary = null;
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+
+            for (const event of events) {
+                if (!event.startsWith('data: ')) continue;
+                const data = JSON.parse(event.slice(6));
+                if (data.done) {
+                    summary = data;
+                } else if (onProgress) {
+                    onProgress(data);
+                }
+            }
+        }
+
+        if (!summary) throw new Error('Batch analysis ended unexpectedly');
+        return summary;
     },
 
     async extractTodos(screenshotId) {
@@ -495,7 +527,11 @@ async function analyzeBatch() {
         analyzeBtn.textContent = 'Analyzing...';
         showToast('Starting batch AI analysis...', 'info');
 
-        const result = await API.analyzeBatch(10);
+        let completed = 0;
+        const result = await API.analyzeBatch(10, () => {
+            completed += 1;
+            analyzeBtn.textContent = `Analyzing... (${completed})`;
+        });
 
         if (result.success) {
             showToast(
@@ -695,21 +731,29 @@ function updatePagination() {
     pagination.classList.remove('hidden');
     document.getElementById('page-info').textContent = `Page ${state.currentPage} of ${totalPages}`;
     document.getElementById('btn-prev-page').disabled = state.currentPage === 1;
-    document.getElementById('btn-next-page').disabled = state.currentPage >= totalPages;
+    document.getElementById('btn-next-page').disabled =
+        state.currentPage >= totalPages || !state.pageCursors[state.currentPage];
 }
 
 async function goToPage(page) {
+    // Pages are reached through the cursor returned with the page before them
+    if (page > 1 && !state.pageCursors[page - 1]) return;
     state.currentPage = page;
     await loadScreenshots();
 }
 
+function resetPagination() {
+    state.currentPage = 1;
+    state.pageCursors = [null];
+}
+
 // Load Screenshots
 async function loadScreenshots() {
     showLoading();
 
     try {
         let data;
-        const offset = (state.currentPage - 1) * ITEMS_PER_PAGE;
+        const after = state.pageCursors[state.currentPage - 1];
 
         if (state.searchQuery && state.isSemanticSearch) {
             // Semantic search
@@ -730,14 +774,16 @@ async function loadScreenshots() {
             state.totalScreenshots = result.count;
         } else if (state.searchQuery) {
             // Regular text search
-            data = await API.searchScreenshots(state.searchQuery, ITEMS_PER_PAGE, offset);
+            data = await API.searchScreenshots(state.searchQuery, ITEMS_PER_PAGE, after);
             state.screenshots = data.screenshots;
             state.totalScreenshots = data.total;
+            state.pageCursors[state.currentPage] = data.next_cursor;
         } else {
             // No search - load all
-            data = await API.getScreenshots(ITEMS_PER_PAGE, offset);
+            data = await API.getScreenshots(ITEMS_PER_PAGE, after);
             state.screenshots = data.screenshots;
             state.totalScreenshots = data.total;
+            state.pageCursors[state.currentPage] = data.next_cursor;
         }
 
         hideLoading();
@@ -824,7 +870,7 @@ function performSearch() {
 
     state.searchQuery = query;
     state.isSemanticSearch = isSemanticSearch;
-    state.currentPage = 1;
+    resetPagination();
 
     if (query) {
         showToast(
@@ -841,7 +887,7 @@ function clearSearch() {
     document.getElementById('semantic-search-toggle').checked = false;
     state.searchQuery = '';
     state.isSemanticSearch = false;
-    state.currentPage = 1;
+    resetPagination();
     loadScreenshots();
 }
 
@@ -0,0 +1,43 @@
+"""Tests for capture deduplication bookkeeping."""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mss")
+pytest.importorskip("imagehash")
+
+from backend import capture  # noqa: E402
+
+FRAME_HASH = "ffff0000ffff0000"
+
+
+@pytest.fixture
+def service():
+    """Capture service that is never started."""
+    return capture.CaptureService()
+
+
+def test_queued_frame_counts_as_duplicate_until_dropped(service):
+    with service._hash_lock:
+        service._pending_hashes.append(FRAME_HASH)
+    assert service._is_recent_duplicate(FRAME_HASH)
+
+    service._settle_pending_hash(FRAME_HASH, stored=False)
+
+    assert not service._is_recent_duplicate(FRAME_HASH)
+
+
+def test_failed_save_does_not_enter_history(service, monkeypatch):
+    def fail(_):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(service, "_save_image", lambda image, filepath: None)
+    monkeypatch.setattr(capture, "get_file_size", lambda path: 1)
+    monkeypatch.setattr(capture.db, "create_screenshot", fail)
+    service._pending_hashes.append(FRAME_HASH)
+
+    service._save_screenshot(None, Path("/tmp/frame.jpg"), FRAME_HASH)
+
+    assert service._pending_hashes == []
+    assert not service._is_recent_duplicate(FRAME_HASH)
@@ -0,0 +1,40 @@
+"""Tests for configuration loading."""
+
+from pathlib import Path
+
+from backend.config import ServerConfig, StorageConfig, _build_section, _dotenv_cached
+
+
+def test_dotenv_matches_python_dotenv_semantics(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "# MineContext-v2 Environment Configuration\n"
+        "\n"
+        "OPENAI_API_KEY=sk-test  # inline note\n"
+        "export ANTHROPIC_API_KEY='quoted # not a comment'\n"
+        'OPENROUTER_API_KEY="line one\\nline two"\n'
+        "SERVER_PORT=8000\n",
+        encoding="utf-8",
+    )
+
+    values = _dotenv_cached(str(env_file))
+
+    assert values["openai_api_key"] == "sk-test"
+    assert values["anthropic_api_key"] == "quoted # not a comment"
+    assert values["openrouter_api_key"] == "line one\nline two"
+    assert values["server_port"] == "8000"
+
+
+def test_missing_dotenv_is_empty(tmp_path):
+    assert _dotenv_cached(str(tmp_path / "missing.env")) == {}
+
+
+def test_skip_validation_keeps_server_env_overrides(monkeypatch):
+    monkeypatch.setenv("CONFIG_SKIP_VALIDATION", "1")
+    monkeypatch.setenv("SERVER_PORT", "9000")
+
+    server = _build_section(ServerConfig, {"host": "0.0.0.0"})
+    storage = _build_section(StorageConfig, {"database_path": "data/test.db"})
+
+    assert server.port == 9000
+    assert storage.database_path == Path("data/test.db")
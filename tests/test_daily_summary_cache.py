@@ -0,0 +1,41 @@
+"""Tests for memoized past-day summaries."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.database import Database
+from backend.services import activity_analyzer as analyzer_module
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Fresh database used by the activity analyzer."""
+    database = Database(tmp_path / "context.db")
+    monkeypatch.setattr(analyzer_module, "db", database)
+    yield database
+    database.close()
+
+
+def _insert_screenshot(database: Database, timestamp: datetime) -> int:
+    with database.transaction() as conn:
+        cursor = conn.execute(
+            "INSERT INTO screenshots (filepath, timestamp) VALUES (?, ?)",
+            ("/tmp/shot.png", timestamp.strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        return cursor.lastrowid
+
+
+def test_past_day_summary_follows_analysis(database):
+    day = (datetime.now() - timedelta(days=3)).replace(hour=0, minute=0, second=0, microsecond=0)
+    screenshot_id = _insert_screenshot(database, day + timedelta(hours=10))
+    analyzer = analyzer_module.activity_analyzer
+
+    before = analyzer.get_daily_summary_cached(day)
+    fingerprint = database.get_day_fingerprint(day)
+    database.save_analysis_results([(screenshot_id, "Editing code", "code", "coding")])
+
+    assert database.get_day_fingerprint(day) != fingerprint
+    after = analyzer.get_daily_summary_cached(day)
+    assert before["statistics"]["analyzed_screenshots"] == 0
+    assert after["statistics"]["analyzed_screenshots"] == 1
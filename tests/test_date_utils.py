@@ -0,0 +1,17 @@
+"""Tests for date parsing helpers."""
+
+from datetime import datetime
+
+import pytest
+
+from backend.utils.date_utils import parse_ymd
+
+
+def test_parse_ymd_returns_midnight():
+    assert parse_ymd("2024-01-15") == datetime(2024, 1, 15)
+
+
+@pytest.mark.parametrize("value", ["20240115", "2024-01-15T00:00", "2024-W03-1", "2024-02-30"])
+def test_parse_ymd_rejects_other_forms(value):
+    with pytest.raises(ValueError):
+        parse_ymd(value)
@@ -0,0 +1,90 @@
+"""Tests for work session aggregate recomputation."""
+
+from datetime import datetime
+
+import pytest
+
+from backend.database import Database
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Fresh database in a temporary directory."""
+    database = Database(tmp_path / "context.db")
+    yield database
+    database.close()
+
+
+def _link_activities(database: Database, session_id: int, activities):
+    with database.transaction() as conn:
+        for activity_type, duration, score in activities:
+            cursor = conn.execute(
+                "INSERT INTO screenshots (filepath, timestamp, session_id, productivity_score) "
+                "VALUES (?, ?, ?, ?)",
+                ("/tmp/shot.png", datetime.now(), session_id, score),
+            )
+            conn.execute(
+                "INSERT INTO activities (screenshot_id, activity_type, duration_seconds) "
+                "VALUES (?, ?, ?)",
+                (cursor.lastrowid, activity_type, duration),
+            )
+
+
+def _session(database: Database, session_id: int) -> dict:
+    return next(s for s in database.get_work_sessions() if s["id"] == session_id)
+
+
+def test_recompute_work_session_from_linked_activities(database):
+    session_id = database.create_work_session(datetime.now())
+    _link_activities(
+        database, session_id, [("coding", 60, 0.8), ("coding", 30, 0.6), ("browsing", 100, None)]
+    )
+
+    assert database.recompute_work_session(session_id)
+
+    session = _session(database, session_id)
+    assert session["activity_count"] == 3
+    assert session["duration_seconds"] == 190
+    assert session["dominant_activity"] == "coding"
+    assert session["productivity_score"] == pytest.approx(0.7)
+
+
+def test_recompute_without_linked_rows_keeps_stored_values_except_count(database):
+    session_id = database.create_work_session(datetime.now())
+    database.update_work_session(
+        session_id, activity_count=5, duration_seconds=300, dominant_activity="reading"
+    )
+
+    assert database.recompute_open_work_sessions() == 1
+
+    session = _session(database, session_id)
+    assert session["activity_count"] == 0
+    assert session["duration_seconds"] == 300
+    assert session["dominant_activity"] == "reading"
+
+
+def test_closing_session_recomputes_aggregates(database):
+    session_id = database.create_work_session(datetime.now())
+    _link_activities(database, session_id, [("writing", 45, 0.9)])
+
+    assert database.update_work_session(session_id, end_time=datetime.now())
+
+    session = _session(database, session_id)
+    assert session["activity_count"] == 1
+    assert session["dominant_activity"] == "writing"
+    assert database.update_work_session(999, end_time=datetime.now()) is False
+
+
+def test_closing_session_keeps_passed_aggregates(database):
+    session_id = database.create_work_session(datetime.now())
+    _link_activities(database, session_id, [("writing", 45, 0.9), ("reading", 10, 0.5)])
+
+    assert database.update_work_session(
+        session_id, end_time=datetime.now(), duration_seconds=600, dominant_activity="meeting"
+    )
+
+    session = _session(database, session_id)
+    assert session["duration_seconds"] == 600
+    assert session["dominant_activity"] == "meeting"
+    assert session["activity_count"] == 2
+    assert session["productivity_score"] == pytest.approx(0.7)
@@ -0,0 +1,177 @@
+"""Tests for writes routed through the database writer thread."""
+
+import threading
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.database import Database
+from backend.models import ScreenshotCreate, ScreenshotUpdate
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Fresh database in a temporary directory."""
+    database = Database(tmp_path / "context.db")
+    yield database
+    database.close()
+
+
+def _create_screenshot(database: Database) -> int:
+    screenshot = database.create_screenshot(
+        ScreenshotCreate(filepath="/tmp/shot.png", timestamp=datetime.now(), image_hash="abc")
+    )
+    return screenshot.id
+
+
+def test_update_screenshot_returns_updated_row(database):
+    screenshot_id = _create_screenshot(database)
+
+    updated = database.update_screenshot(
+        screenshot_id, ScreenshotUpdate(description="edited", tags="a, b")
+    )
+
+    assert updated is not None
+    assert updated.id == screenshot_id
+    assert updated.description == "edited"
+    assert database.get_screenshot(screenshot_id).description == "edited"
+
+
+def test_update_missing_screenshot_returns_none(database):
+    assert database.update_screenshot(999, ScreenshotUpdate(description="edited")) is None
+
+
+def test_patch_screenshot_route(database, monkeypatch):
+    for module in ("mss", "imagehash", "chromadb", "sentence_transformers"):
+        pytest.importorskip(module)
+    from backend.api import routes
+
+    monkeypatch.setattr(routes, "db", database)
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api")
+    client = TestClient(app)
+
+    screenshot_id = _create_screenshot(database)
+    response = client.patch(f"/api/screenshots/{screenshot_id}", json={"description": "edited"})
+
+    assert response.status_code == 200
+    assert response.json()["description"] == "edited"
+
+
+def test_patch_todo_with_no_fields_returns_current_row(database, monkeypatch):
+    from backend.api import todos_routes
+
+    monkeypatch.setattr(todos_routes, "db", database)
+    app = FastAPI()
+    app.include_router(todos_routes.router, prefix="/api")
+    client = TestClient(app)
+
+    todo_id = database.create_todo(None, "write tests", title="Tests")
+    response = client.patch(f"/api/todos/{todo_id}", json={})
+
+    assert response.status_code == 200
+    assert response.json()["id"] == todo_id
+    assert response.json()["title"] == "Tests"
+    assert client.patch("/api/todos/999", json={}).status_code == 404
+
+
+def test_patch_todo_updates_fields(database, monkeypatch):
+    from backend.api import todos_routes
+
+    monkeypatch.setattr(todos_routes, "db", database)
+    app = FastAPI()
+    app.include_router(todos_routes.router, prefix="/api")
+    client = TestClient(app)
+
+    todo_id = database.create_todo(None, "write tests")
+    response = client.patch(f"/api/todos/{todo_id}", json={"priority": "high", "notes": "soon"})
+
+    assert response.status_code == 200
+    assert response.json()["priority"] == "high"
+    assert response.json()["notes"] == "soon"
+
+
+def test_screenshots_version_is_persisted(tmp_path, database):
+    version = database.get_screenshots_version()
+    screenshot_id = _create_screenshot(database)
+    database.update_screenshot(screenshot_id, ScreenshotUpdate(description="edited"))
+
+    assert database.get_screenshots_version() == version + 2
+
+    reopened = Database(tmp_path / "context.db")
+    try:
+        assert reopened.get_screenshots_version() == version + 2
+    finally:
+        reopened.close()
+
+
+def test_cached_count_changes_only_after_commit(database):
+    assert database.get_total_screenshots() == 0
+
+    with database.transaction():
+        _create_screenshot(database)
+        assert database.get_total_screenshots() == 0
+
+    assert database.get_total_screenshots() == 1
+
+    with pytest.raises(RuntimeError):
+        with database.transaction():
+            _create_screenshot(database)
+            raise RuntimeError("abort")
+
+    assert database.get_total_screenshots() == 1
+
+
+def test_run_write_runs_on_writer_thread(database):
+    from todolist.backend import database as todo_db
+
+    threads = []
+
+    def create(conn, title):
+        threads.append(threading.current_thread().name)
+        return todo_db.create_user_todo(conn, title=title)
+
+    todo_id = database.run_write(create, "queued")
+
+    assert threads == ["db-writer"]
+    with database._read_connection() as conn:
+        assert todo_db.get_user_todo(conn, todo_id)["title"] == "queued"
+
+
+def test_queued_write_waits_for_open_transaction(database):
+    # An explicit transaction() on another thread is the one write path
+    # outside the writer thread; it holds the write lock until it commits
+    done = threading.Event()
+
+    def write():
+        _create_screenshot(database)
+        done.set()
+
+    with database.transaction():
+        _create_screenshot(database)
+        worker = threading.Thread(target=write)
+        worker.start()
+        assert not done.wait(0.2)
+
+    worker.join(timeout=5)
+    assert done.is_set()
+    assert database.get_total_screenshots() == 2
+
+
+def test_get_and_delete_report_by_id(database):
+    report_id = database.save_report("daily", "2024-01-15", "2024-01-15", "# Report")
+
+    assert database.get_report_by_id(report_id)["content"] == "# Report"
+    assert database.delete_report(report_id) is True
+    assert database.get_report_by_id(report_id) is None
+    assert database.delete_report(report_id) is False
+
+
+def test_first_count_inside_transaction_does_not_seed_counter(database):
+    with database.transaction():
+        _create_screenshot(database)
+        assert database.get_total_screenshots() == 1
+
+    assert database.get_total_screenshots() == 1
@@ -1,4 +1,9 @@
-"""Database operations for TodoList module."""
+"""Database operations for TodoList module.
+
+Functions that write do not commit. Run them through
+``Database.run_write``, which calls them on the writer thread inside its
+write transaction.
+"""
 
 import json
 import sqlite3
@@ -90,7 +95,6 @@ def create_user_todo(
             tags, due_date_str, estimated_hours, embedding_blob
         )
     )
-    conn.commit()
 
     return cursor.lastrowid
 
@@ -254,7 +258,6 @@ def update_user_todo(
         f"UPDATE user_todos SET {set_clause} WHERE id = ?",
         values
     )
-    conn.commit()
 
     return cursor.rowcount > 0
 
@@ -271,7 +274,6 @@ def delete_user_todo(conn: sqlite3.Connection, todo_id: int) -> bool:
     """
     cursor = conn.cursor()
     cursor.execute("DELETE FROM user_todos WHERE id = ?", (todo_id,))
-    conn.commit()
 
     return cursor.rowcount > 0
 
@@ -336,7 +338,6 @@ def create_todo_activity(
             match_confidence, match_method, duration_minutes, activity_type
         )
     )
-    conn.commit()
 
     return cursor.lastrowid
 
@@ -417,7 +418,6 @@ def delete_todo_activity(conn: sqlite3.Connection, activity_id: int) -> bool:
     """
     cursor = conn.cursor()
     cursor.execute("DELETE FROM todo_activities WHERE id = ?", (activity_id,))
-    conn.commit()
 
     return cursor.rowcount > 0
 
@@ -490,7 +490,6 @@ def create_progress_snapshot(
             json.dumps(next_steps)
         )
     )
-    conn.commit()
 
     return cursor.lastrowid
 
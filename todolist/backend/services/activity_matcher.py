@@ -213,8 +213,8 @@ class ActivityMatcher:
             activity_type = self.classify_activity_type(screenshot.description or "")
 
             # Create activity link
-            activity_id = todo_db.create_todo_activity(
-                conn=self.conn,
+            activity_id = db.run_write(
+                todo_db.create_todo_activity,
                 todo_id=todo_id,
                 screenshot_id=screenshot_id,
                 activity_description=screenshot.description,
@@ -367,7 +367,7 @@ def trigger_async_match(screenshot_id: int):
                     f"{[m['todo_id'] for m in matches]}"
                 )
 
-            conn.close()
+            # The connection belongs to the database's per-thread pool, so it is not closed here
 
         except Exception as e:
             logger.error(f"Activity matching failed for screenshot {sid}: {e}", exc_info=True)
@@ -94,8 +94,9 @@ class ProgressAnalyzer:
             total_time = self.calculate_total_time(todo_id)
 
             # 9. Save progress snapshot
-            snapshot_id = todo_db.create_progress_snapshot(
-                conn=self.conn,
+            from backend.database import db
+            snapshot_id = db.run_write(
+                todo_db.create_progress_snapshot,
                 todo_id=todo_id,
                 completed_aspects=analysis.get('completed_aspects', []),
                 remaining_aspects=analysis.get('remaining_aspects', []),
@@ -108,8 +109,8 @@ class ProgressAnalyzer:
             logger.info(f"Saved progress snapshot {snapshot_id} for TODO {todo_id}")
 
             # 10. Update TODO completion percentage
-            todo_db.update_user_todo(
-                self.conn,
+            db.run_write(
+                todo_db.update_user_todo,
                 todo_id,
                 completion_percentage=analysis.get('completion_percentage', 0)
             )
@@ -102,8 +102,9 @@ class TodoManager:
         embedding = self._generate_embedding(title, description)
 
         # Create TODO
-        todo_id = todo_db.create_user_todo(
-            conn=self.conn,
+        from backend.database import db
+        todo_id = db.run_write(
+            todo_db.create_user_todo,
             title=title,
             description=description,
             parent_id=parent_id,
@@ -208,7 +209,8 @@ class TodoManager:
                 kwargs['embedding'] = embedding
 
         # Update TODO
-        success = todo_db.update_user_todo(self.conn, todo_id, **kwargs)
+        from backend.database import db
+        success = db.run_write(todo_db.update_user_todo, todo_id, **kwargs)
 
         if success:
             logger.info(f"Updated TODO {todo_id}")
@@ -233,7 +235,8 @@ class TodoManager:
         if not todo:
             raise ValueError(f"TODO with ID {todo_id} not found")
 
-        success = todo_db.delete_user_todo(self.conn, todo_id)
+        from backend.database import db
+        success = db.run_write(todo_db.delete_user_todo, todo_id)
 
         if success:
             logger.info(f"Deleted TODO {todo_id}: {todo['title']}")
@@ -317,8 +320,9 @@ class TodoManager:
             raise ValueError(f"TODO with ID {todo_id} not found")
 
         # Create activity link
-        activity_id = todo_db.create_todo_activity(
-            conn=self.conn,
+        from backend.database import db
+        activity_id = db.run_write(
+            todo_db.create_todo_activity,
             todo_id=todo_id,
             screenshot_id=screenshot_id,
             activity_description=activity_description,
@@ -340,7 +344,8 @@ class TodoManager:
         Returns:
             True if successful
         """
-        success = todo_db.delete_todo_activity(self.conn, activity_id)
+        from backend.database import db
+        success = db.run_write(todo_db.delete_todo_activity, activity_id)
 
         if success:
             logger.info(f"Deleted activity {activity_id}")
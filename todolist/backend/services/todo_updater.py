@@ -144,13 +144,14 @@ class TodoAutoUpdater:
         try:
             logger.info(f"Applying {len(approved_suggestions)} suggestions to TODO {todo_id}")
 
+            from backend.database import db
             for suggestion in approved_suggestions:
                 suggestion_type = suggestion.get('type')
 
                 if suggestion_type == 'mark_complete':
                     # Mark TODO as completed
-                    todo_db.update_user_todo(
-                        self.conn,
+                    db.run_write(
+                        todo_db.update_user_todo,
                         todo_id,
                         status='completed',
                         completion_percentage=100
@@ -160,8 +161,8 @@ class TodoAutoUpdater:
                 elif suggestion_type == 'update_progress':
                     # Update progress percentage
                     percentage = suggestion['data']['percentage']
-                    todo_db.update_user_todo(
-                        self.conn,
+                    db.run_write(
+                        todo_db.update_user_todo,
                         todo_id,
                         completion_percentage=percentage
                     )
@@ -170,8 +171,8 @@ class TodoAutoUpdater:
                 elif suggestion_type == 'update_status':
                     # Update TODO status
                     new_status = suggestion['data']['status']
-                    todo_db.update_user_todo(
-                        self.conn,
+                    db.run_write(
+                        todo_db.update_user_todo,
                         todo_id,
                         status=new_status
                     )